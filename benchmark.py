@@ -0,0 +1,500 @@
+#!/usr/bin/env python3
+"""
+Benchmarks de performance pour le bot de surveillance universel
+
+Les pages de test sont générées localement : aucun accès réseau n'est nécessaire.
+
+Usage:
+    python benchmark.py parse [--pages 16] [--products 3000] [--workers 0,1,2,4]
+    python benchmark.py extract [--elements 1000] [--rounds 5]
+    python benchmark.py startup [--runs 10]
+    python benchmark.py memory [--cycles 1000] [--max-detected 5000]
+    python benchmark.py queue [--sites 48] [--workers 1,2,4] [--latency 0.25]
+    python benchmark.py export [--sites 200] [--products 100]
+    python benchmark.py matching [--titles 5000] [--rounds 5]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from product_export import ProductExporter
+from title_matching import normalize_tokens
+from universal_monitor import UniversalWebMonitor
+from work_queue import WorkQueue, run_worker
+
+def load_base_config() -> Dict[str, Any]:
+    """Charge config.json comme base de configuration des benchmarks"""
+    config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.json')
+    with open(config_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def build_listing_page(products: int, match_every: int = 10, start: int = 0) -> bytes:
+    """Génère une page de liste de produits (un produit sur match_every correspond)"""
+    items = []
+    for i in range(start, start + products):
+        name = f"Digitakt {i}" if i % match_every == 0 else f"Article {i}"
+        items.append(
+            f'<div class="product-item" data-id="{i}">'
+            f'<h2 class="title">{name}</h2>'
+            f'<span class="price">{i % 900 + 99},00 €</span>'
+            f'<a href="/produit/{i}">Voir</a>'
+            f'<img src="/img/{i}.jpg" alt="{name}">'
+            f'<p class="description">Description détaillée du produit {i}, '
+            f'état excellent, livraison possible.</p>'
+            f'</div>'
+        )
+    return (
+        '<html><head><title>Résultats</title></head><body><div class="listing">'
+        + ''.join(items)
+        + '</div></body></html>'
+    ).encode('utf-8')
+
+def benchmark_site(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Site de test utilisant les sélecteurs de config.json"""
+    website = dict(config['websites'][0])
+    website['url'] = 'https://example.com/recherche'
+    website['search_terms'] = ['digitakt']
+    return website
+
+def run_parse_benchmark(args: argparse.Namespace):
+    """Mesure le débit de parsing selon le nombre de processus du pool"""
+    config = load_base_config()
+    website = benchmark_site(config)
+    page = build_listing_page(args.products)
+    worker_counts = [int(w) for w in args.workers.split(',')]
+    # La même page est parsée à chaque itération : le cache fausserait la mesure
+    config['advanced_settings']['parse_cache'] = {'enabled': False}
+
+    print("⚙️ BENCHMARK PARSING / EXTRACTION")
+    print("=" * 60)
+    print(f"Pages: {args.pages} × {len(page) / 1024 / 1024:.1f} Mo ({args.products} produits)")
+    print(f"Coeurs disponibles: {os.cpu_count()}")
+    print("-" * 60)
+    print(f"{'Processus':>10} | {'Durée (s)':>10} | {'Pages/s':>8} | {'Accélération':>12}")
+
+    baseline = None
+    for workers in worker_counts:
+        config['advanced_settings']['parse_workers'] = workers
+        monitor = UniversalWebMonitor.lightweight(config)
+        monitor.logger.setLevel('WARNING')
+
+        # Démarrage du pool hors mesure
+        pool = monitor.get_parse_pool()
+        if pool is not None:
+            list(pool.map(abs, range(workers)))
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            results = list(executor.map(lambda _: monitor.parse_products(page, website), range(args.pages)))
+        elapsed = time.perf_counter() - start
+
+        if pool is not None:
+            pool.shutdown()
+        baseline = baseline or elapsed
+        label = workers if workers else 'aucun'
+        print(f"{label:>10} | {elapsed:>10.2f} | {args.pages / elapsed:>8.2f} | {baseline / elapsed:>11.2f}x")
+        assert all(len(products) == len(results[0]) for products in results)
+
+    print("-" * 60)
+    print(f"Produits correspondants par page: {len(results[0])}")
+
+def legacy_extract_product_info(element, selectors: Dict[str, List[str]], base_url: str) -> Optional[Dict[str, str]]:
+    """Extraction telle qu'implémentée avant ProductRecord (référence de comparaison)"""
+    product_info = {'title': '', 'price': '', 'link': '', 'description': '', 'image': ''}
+    for selector in selectors['title']:
+        title_elem = element.select_one(selector)
+        if title_elem:
+            product_info['title'] = title_elem.get_text().strip()
+            break
+    if not product_info['title']:
+        full_text = element.get_text().strip()
+        product_info['title'] = full_text[:100] + "..." if len(full_text) > 100 else full_text
+    for selector in selectors['price']:
+        price_elem = element.select_one(selector)
+        if price_elem:
+            product_info['price'] = price_elem.get_text().strip()
+            break
+    for selector in selectors['link']:
+        link_elem = element.select_one(selector)
+        if link_elem and link_elem.get('href'):
+            product_info['link'] = urljoin(base_url, link_elem['href'])
+            break
+    for selector in selectors.get('description', []):
+        desc_elem = element.select_one(selector)
+        if desc_elem:
+            product_info['description'] = desc_elem.get_text().strip()[:200]
+            break
+    if not product_info['description']:
+        product_info['description'] = element.get_text().strip()[:200]
+    img_elem = element.select_one('img')
+    if img_elem and img_elem.get('src'):
+        product_info['image'] = urljoin(base_url, img_elem['src'])
+    return product_info if product_info['title'] else None
+
+def measure(label: str, func, rounds: int, elements: int) -> float:
+    """Mesure durée et mémoire allouée d'une boucle d'extraction"""
+    durations = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    best = min(durations)
+    per_thousand = best / elements * 1000
+    print(f"{label:>20} | {per_thousand * 1000:>12.1f} | {peak / elements * 1000 / 1024:>15.1f}")
+    return per_thousand
+
+def run_extract_benchmark(args: argparse.Namespace):
+    """Compare l'extraction historique (dict par élément) et ProductRecord"""
+    config = load_base_config()
+    website = benchmark_site(config)
+    selectors = website['selectors']
+    search_terms = [term.lower() for term in website['search_terms']]
+    monitor = UniversalWebMonitor.lightweight(config)
+    monitor.logger.setLevel('WARNING')
+
+    soup = BeautifulSoup(build_listing_page(args.elements), 'html.parser')
+    elements = soup.select('.product-item')
+
+    def legacy():
+        found = []
+        for element in elements:
+            element.get_text().lower()
+            info = legacy_extract_product_info(element, selectors, website['url'])
+            if info and any(term in info['title'].lower() for term in search_terms):
+                found.append(info)
+        return found
+
+    def accept_title(title: str) -> bool:
+        return monitor.title_matches(title, search_terms, [])
+
+    def current():
+        found = []
+        for element in elements:
+            record = monitor.extract_product_record(element, selectors, website['url'], accept_title)
+            if record is not None:
+                found.append(record.as_dict())
+        return found
+
+    assert legacy() == current(), "Les deux implémentations doivent produire les mêmes produits"
+
+    print("⚙️ BENCHMARK EXTRACTION (par 1000 éléments)")
+    print("=" * 60)
+    print(f"Éléments: {len(elements)}, correspondants: {len(current())}, meilleur de {args.rounds} passes")
+    print("-" * 60)
+    print(f"{'Implémentation':>20} | {'Durée (ms)':>12} | {'Pic mémoire (Ko)':>15}")
+    before = measure('dict historique', legacy, args.rounds, len(elements))
+    after = measure('ProductRecord', current, args.rounds, len(elements))
+    print("-" * 60)
+    print(f"Gain: {before / after:.1f}x plus rapide")
+
+# Modules importés au chargement de universal_monitor avant les imports différés
+EAGER_IMPORTS = (
+    "import requests, smtplib, schedule; from bs4 import BeautifulSoup; "
+    "from email.mime.text import MIMEText; from email.mime.multipart import MIMEMultipart\n"
+    "try:\n"
+    "    from selenium import webdriver\n"
+    "    from selenium.webdriver.chrome.options import Options\n"
+    "    from selenium.webdriver.support.ui import WebDriverWait\n"
+    "except ImportError:\n"
+    "    pass\n"
+)
+
+STARTUP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+{prelude}
+sys.path.insert(0, {package_dir!r})
+import universal_monitor
+monitor = universal_monitor.UniversalWebMonitor({config!r})
+print(json.dumps({{'seconds': time.perf_counter() - start, 'rss': universal_monitor.get_rss_mb()}}))
+"""
+
+def measure_startup(prelude: str, runs: int, workdir: str, config_path: str) -> Dict[str, float]:
+    """Lance plusieurs processus à froid et retourne la durée et la mémoire médianes"""
+    script = STARTUP_SCRIPT.format(
+        prelude=prelude,
+        package_dir=os.path.dirname(os.path.abspath(__file__)),
+        config=config_path
+    )
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', script], cwd=workdir, capture_output=True, text=True, check=True
+        ).stdout.strip().splitlines()[-1]
+        samples.append(json.loads(output))
+    samples.sort(key=lambda sample: sample['seconds'])
+    median = samples[len(samples) // 2]
+    return {'seconds': median['seconds'], 'rss': sorted(sample['rss'] for sample in samples)[len(samples) // 2]}
+
+def run_startup_benchmark(args: argparse.Namespace):
+    """Compare le démarrage à froid (requests seul) avec et sans imports différés"""
+    config = load_base_config()
+    config['advanced_settings']['use_selenium'] = False
+    config['email_settings']['sender_email'] = ''
+
+    with tempfile.TemporaryDirectory() as workdir:
+        config_path = os.path.join(workdir, 'config.json')
+        with open(config_path, 'w', encoding='utf-8') as f:
+            json.dump(config, f)
+
+        print("⚙️ BENCHMARK DÉMARRAGE (import + initialisation, mode requests)")
+        print("=" * 60)
+        print(f"Médiane sur {args.runs} démarrages à froid")
+        print("-" * 60)
+        print(f"{'Imports':>20} | {'Durée (ms)':>10} | {'RSS (Mo)':>9}")
+        eager = measure_startup(EAGER_IMPORTS, args.runs, workdir, config_path)
+        print(f"{'tous au chargement':>20} | {eager['seconds'] * 1000:>10.1f} | {eager['rss']:>9.1f}")
+        lazy = measure_startup('', args.runs, workdir, config_path)
+        print(f"{'différés':>20} | {lazy['seconds'] * 1000:>10.1f} | {lazy['rss']:>9.1f}")
+        print("-" * 60)
+        print(f"Gain: {(eager['seconds'] - lazy['seconds']) * 1000:.1f} ms, "
+              f"{eager['rss'] - lazy['rss']:.1f} Mo")
+
+def run_memory_benchmark(args: argparse.Namespace):
+    """Simule des milliers de cycles et affiche les échantillons mémoire"""
+    config = load_base_config()
+    config['advanced_settings']['parse_cache'] = {'enabled': False}
+    config['advanced_settings']['memory'] = {'max_detected_per_site': args.max_detected, 'sample_every': 0}
+    website = benchmark_site(config)
+    monitor = UniversalWebMonitor.lightweight(config)
+    monitor.logger.setLevel('WARNING')
+    site_key = monitor.get_site_key(website)
+
+    print("⚙️ BENCHMARK MÉMOIRE (cycles simulés)")
+    print("=" * 60)
+    print(f"Cycles: {args.cycles}, produits par page: {args.products}, "
+          f"max_detected_per_site: {args.max_detected or 'illimité'}")
+    print("-" * 60)
+    print(f"{'Cycle':>8} | {'RSS (Mo)':>9} | {'Dérive (Mo)':>11} | {'Hashes':>7} | {'Objets':>8}")
+
+    for cycle in range(args.cycles):
+        # Chaque cycle décale la liste : de nouveaux produits apparaissent
+        page = build_listing_page(args.products, start=cycle * 10)
+        known = monitor.detected_products.setdefault(site_key, [])
+        products = monitor.parse_products(page, website)
+        monitor.seen_hashes = {}
+        monitor.mark_seen_products(site_key, products)
+        for product in products:
+            product_hash = monitor.generate_product_hash(product)
+            if product_hash not in known:
+                known.append(product_hash)
+        monitor.run_cycle_maintenance()
+        if monitor.cycle_count == 1 or monitor.cycle_count % args.sample_every == 0:
+            sample = monitor.sample_memory()
+            print(f"{sample['cycle']:>8} | {sample['rss_mb']:>9.1f} | {sample['rss_drift_mb']:>+11.1f} | "
+                  f"{sample['detected_hashes']:>7} | {sample['gc_objects']:>8}")
+
+def start_latency_server(latency: float, products: int) -> ThreadingHTTPServer:
+    """Serveur local qui répond après `latency` secondes (simule un site distant)"""
+    page = build_listing_page(products)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(page)))
+            self.end_headers()
+            self.wfile.write(page)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def run_queue_benchmark(args: argparse.Namespace):
+    """Débit de la file de travaux selon le nombre de workers (processus locaux)"""
+    server = start_latency_server(args.latency, args.products)
+    config = load_base_config()
+    website = benchmark_site(config)
+    config['websites'] = [
+        dict(website, name=f"Site {i}", url=f"http://127.0.0.1:{server.server_address[1]}/recherche/{i}")
+        for i in range(args.sites)
+    ]
+    config['monitoring_settings'].update({'retry_attempts': 1, 'log_level': 'WARNING'})
+    config['advanced_settings'].update({
+        'respect_robots_txt': False,
+        'rotate_user_agents': False,
+        'parse_cache': {'enabled': False}
+    })
+
+    print("⚙️ BENCHMARK FILE DE TRAVAUX (workers locaux)")
+    print("=" * 60)
+    print(f"Sites: {args.sites}, latence simulée: {args.latency * 1000:.0f} ms, produits par page: {args.products}, "
+          f"CPU: {os.cpu_count()}")
+    print("-" * 60)
+    print(f"{'Workers':>8} | {'Durée (s)':>9} | {'Sites/s':>8} | {'Accélération':>12} | {'Efficacité':>10}")
+
+    baseline = None
+    workdir = tempfile.mkdtemp(prefix='botalerte-queue-')
+    previous_dir = os.getcwd()
+    os.chdir(workdir)
+    try:
+        for workers in [int(w) for w in args.workers.split(',')]:
+            queue_path = os.path.join(workdir, f"queue-{workers}.sqlite")
+            config['advanced_settings']['work_queue'] = {'enabled': True, 'path': queue_path}
+            config_path = os.path.join(workdir, f"config-{workers}.json")
+            with open(config_path, 'w', encoding='utf-8') as f:
+                json.dump(config, f)
+
+            queue = WorkQueue(queue_path)
+            queue.enqueue_cycle('benchmark', [{'website': site} for site in config['websites']])
+            start = time.perf_counter()
+            processes = [
+                multiprocessing.Process(target=run_worker, args=(config_path, True)) for _ in range(workers)
+            ]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+            elapsed = time.perf_counter() - start
+
+            done = queue.counts().get('done', 0)
+            queue.close()
+            rate = done / elapsed
+            baseline = baseline or rate
+            print(f"{workers:>8} | {elapsed:>9.2f} | {rate:>8.1f} | {rate / baseline:>11.2f}x | "
+                  f"{rate / baseline / workers:>9.0%}" + ("" if done == args.sites else f"  ⚠️ {done}/{args.sites} terminés"))
+    finally:
+        os.chdir(previous_dir)
+        server.shutdown()
+
+def run_export_benchmark(args: argparse.Namespace):
+    """Temps ajouté à la boucle de vérification par l'export, comparé à une écriture directe"""
+    config = load_base_config()
+    config['advanced_settings']['parse_cache'] = {'enabled': False}
+    monitor = UniversalWebMonitor.lightweight(config)
+    monitor.logger.setLevel('WARNING')
+    products = monitor.parse_products(build_listing_page(args.products * 10), dict(benchmark_site(config), search_terms=['digitakt']))
+
+    print("⚙️ BENCHMARK EXPORT DES PRODUITS")
+    print("=" * 60)
+    print(f"Sites: {args.sites}, produits par site: {len(products)}")
+    print("-" * 60)
+    print(f"{'Format':>7} | {'Écriture directe (µs/site)':>27} | {'submit() (µs/site)':>19}")
+
+    workdir = tempfile.mkdtemp(prefix='botalerte-export-')
+    for export_format in ('jsonl', 'csv', 'sqlite'):
+        settings = {'format': export_format, 'max_file_mb': 0}
+        direct = ProductExporter(dict(settings, path=os.path.join(workdir, f"direct.{export_format}")), monitor.logger)
+        rows = [dict(product, timestamp='', site='bench', price_value=None) for product in products]
+        start = time.perf_counter()
+        for _ in range(args.sites):
+            direct.write_rows(rows)
+        direct_seconds = (time.perf_counter() - start) / args.sites
+        direct.close()
+
+        exporter = ProductExporter(dict(settings, path=os.path.join(workdir, f"queued.{export_format}")), monitor.logger)
+        start = time.perf_counter()
+        for index in range(args.sites):
+            exporter.submit(f"Site {index}", products)
+        submit_seconds = (time.perf_counter() - start) / args.sites
+        exporter.close()
+        print(f"{export_format:>7} | {direct_seconds * 1e6:>27.0f} | {submit_seconds * 1e6:>19.1f}")
+
+MATCHING_TITLE_PATTERNS = (
+    "Elektron Digitakt II {i}", "ELEKTRON DIGITAKT 2 - occasion", "Digitackt mk2 n°{i}",
+    "Roland TR-8S Rhythm Performer", "Câble jack stéréo {i} m", "Électro-Harmonix Big Muff Pi",
+    "Korg Minilogue XD {i}", "Support clavier en X renforcé", "Casque fermé studio {i}",
+    "Pédale d'effet distorsion vintage"
+)
+
+def run_matching_benchmark(args: argparse.Namespace):
+    """Compare la recherche par sous-chaîne et les correspondances normalisées sur des milliers de titres"""
+    config = load_base_config()
+    monitor = UniversalWebMonitor.lightweight(config)
+    monitor.logger.setLevel('WARNING')
+    titles = [MATCHING_TITLE_PATTERNS[i % len(MATCHING_TITLE_PATTERNS)].format(i=i) for i in range(args.titles)]
+    search_terms = ['digitakt ii', 'tr 8', 'big muff']
+    exclude_terms = ['occasion']
+
+    print("🔤 BENCHMARK CORRESPONDANCE DES TITRES")
+    print("=" * 60)
+    print(f"Titres: {len(titles)}, termes: {search_terms}, exclus: {exclude_terms}, meilleur de {args.rounds} passes")
+    print("-" * 60)
+    print(f"{'Mode':>10} | {'Correspondances':>15} | {'µs par titre':>12}")
+    for mode in ('substring', 'tokens', 'fuzzy'):
+        monitor.config = dict(config, advanced_settings=dict(config['advanced_settings'], matching={'mode': mode}))
+        durations = []
+        for _ in range(args.rounds):
+            # Un matcher par passe, comme pour une page : l'index des mots repart de zéro
+            normalize_tokens.cache_clear()
+            start = time.perf_counter()
+            matcher = monitor.get_title_matcher(search_terms, exclude_terms)
+            matches = sum(monitor.title_matches(title, search_terms, exclude_terms, matcher) for title in titles)
+            durations.append(time.perf_counter() - start)
+        print(f"{mode:>10} | {matches:>15} | {min(durations) / len(titles) * 1e6:>12.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks du bot de surveillance universel")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    parse_parser = subparsers.add_parser('parse', help="Débit du parsing selon le pool de processus")
+    parse_parser.add_argument('--pages', type=int, default=16, help="Nombre de pages à parser")
+    parse_parser.add_argument('--products', type=int, default=3000, help="Produits par page")
+    parse_parser.add_argument('--workers', default=f"0,1,2,{os.cpu_count() or 4}",
+                              help="Nombres de processus à comparer (0 = sans pool)")
+    parse_parser.set_defaults(func=run_parse_benchmark)
+
+    extract_parser = subparsers.add_parser('extract', help="Coût de l'extraction par 1000 éléments")
+    extract_parser.add_argument('--elements', type=int, default=1000, help="Nombre d'éléments produits")
+    extract_parser.add_argument('--rounds', type=int, default=5, help="Nombre de passes mesurées")
+    extract_parser.set_defaults(func=run_extract_benchmark)
+
+    startup_parser = subparsers.add_parser('startup', help="Démarrage à froid avec et sans imports différés")
+    startup_parser.add_argument('--runs', type=int, default=10, help="Nombre de démarrages par variante")
+    startup_parser.set_defaults(func=run_startup_benchmark)
+
+    memory_parser = subparsers.add_parser('memory', help="Stabilité de la mémoire sur de nombreux cycles")
+    memory_parser.add_argument('--cycles', type=int, default=1000, help="Nombre de cycles simulés")
+    memory_parser.add_argument('--products', type=int, default=300, help="Produits par page")
+    memory_parser.add_argument('--max-detected', type=int, default=5000,
+                               help="Hashes conservés par site (0 = illimité)")
+    memory_parser.add_argument('--sample-every', type=int, default=100, help="Cycles entre deux échantillons")
+    memory_parser.set_defaults(func=run_memory_benchmark)
+
+    queue_parser = subparsers.add_parser('queue', help="Passage à l'échelle de la file de travaux")
+    queue_parser.add_argument('--sites', type=int, default=48, help="Nombre de sites (travaux) à traiter")
+    queue_parser.add_argument('--workers', default="1,2,4", help="Nombres de workers à comparer")
+    queue_parser.add_argument('--latency', type=float, default=0.25, help="Latence simulée par requête (s)")
+    queue_parser.add_argument('--products', type=int, default=30, help="Produits par page")
+    queue_parser.set_defaults(func=run_queue_benchmark)
+
+    export_parser = subparsers.add_parser('export', help="Coût de l'export des produits dans la boucle")
+    export_parser.add_argument('--sites', type=int, default=200, help="Nombre de lots (sites) exportés")
+    export_parser.add_argument('--products', type=int, default=100, help="Produits par site")
+    export_parser.set_defaults(func=run_export_benchmark)
+
+    matching_parser = subparsers.add_parser('matching', help="Coût de la correspondance des titres par mode")
+    matching_parser.add_argument('--titles', type=int, default=5000, help="Nombre de titres")
+    matching_parser.add_argument('--rounds', type=int, default=5, help="Nombre de passes mesurées")
+    matching_parser.set_defaults(func=run_matching_benchmark)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
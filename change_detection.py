@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Détection de changements entre deux cycles (`change_detection`)
+
+Chaque site garde un instantané de ses produits (identifiant, titre, prix).
+La comparaison avec la liste du cycle courant donne les produits ajoutés,
+retirés, de retour en vente et les changements de prix ; une liste dont
+l'empreinte n'a pas changé n'est pas comparée du tout. Les instantanés sont
+lus et validés par le moniteur (`site_snapshots.json`).
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from monitor_utils import normalize_price
+
+# Libellés des changements détectés entre deux cycles
+CHANGE_LABELS = {
+    'added': 'Nouveau produit',
+    'reappeared': 'De retour en vente',
+    'removed': 'Retiré (vendu ou épuisé)',
+    'price_drop': 'Baisse de prix',
+    'price_increase': 'Hausse de prix',
+    'price_change': 'Prix modifié'
+}
+
+def product_identity(product: Dict[str, str]) -> str:
+    """Identifiant stable d'un produit d'un cycle à l'autre (lien, sinon titre)"""
+    return product.get('link') or product.get('title', '').strip().lower()
+
+def snapshot_fingerprint(entries: Dict[str, Dict[str, Any]]) -> str:
+    """Empreinte d'une liste de produits (identifiants, titres et prix)"""
+    digest = hashlib.sha256()
+    for identity in sorted(entries):
+        entry = entries[identity]
+        digest.update(f"{identity}\x1f{entry.get('title', '')}\x1f{entry.get('price', '')}\x1e".encode())
+    return digest.hexdigest()
+
+def classify_price_change(old_price: str, new_price: str, settings: Dict[str, Any]) -> Optional[str]:
+    """Type de changement de prix (None si seul le format du libellé a changé)"""
+    old_value, new_value = normalize_price(old_price), normalize_price(new_price)
+    if old_value is None or new_value is None:
+        return 'price_change'
+    if new_value == old_value:
+        return None
+    if new_value > old_value:
+        return 'price_increase'
+    drop_percent = (old_value - new_value) / old_value * 100 if old_value else 100.0
+    return 'price_drop' if drop_percent >= settings.get('min_price_drop_percent', 0) else 'price_change'
+
+def compare_snapshot(previous: Dict[str, Any], found_products: List[Dict[str, str]], settings: Dict[str, Any],
+                     baseline_hashes: set, product_hash: Callable[[Dict[str, str]], str],
+                     max_alerts: Optional[int] = None
+                     ) -> Optional[Tuple[Dict[str, Any], List[Dict[str, str]], int, Dict[str, int]]]:
+    """Compare les produits extraits avec l'instantané précédent d'un site
+
+    Retourne None si l'empreinte de la liste est inchangée, sinon le nouvel
+    instantané, les produits à signaler annotés du type de changement
+    (`alert_on`), le nombre de changements reportés au-delà de `max_alerts`
+    et le décompte des changements par type. Un produit n'est considéré
+    retiré qu'après `removed_after_missing` cycles consécutifs sans le voir ;
+    sur un premier instantané, les produits dont le hash figure dans
+    `baseline_hashes` (déjà signalés) ne sont pas nouveaux.
+    """
+    old_entries = previous.get('products', {})
+    current = {}
+    for product in found_products:
+        current.setdefault(product_identity(product), product)
+    if previous and previous.get('fingerprint') == snapshot_fingerprint(current):
+        return None
+
+    removed_after = max(1, settings.get('removed_after_missing', 2))
+    removed_history = dict(previous.get('removed', {}))
+    entries = {}
+    changes = []
+
+    for identity, product in current.items():
+        entries[identity] = {'title': product['title'], 'price': product.get('price', ''),
+                             'link': product.get('link', ''), 'missing': 0}
+        old = old_entries.get(identity)
+        if old is None:
+            if product_hash(product) in baseline_hashes:
+                continue
+            kind = 'reappeared' if identity in removed_history else 'added'
+            changes.append((kind, identity, product, None))
+        elif old['price'] != entries[identity]['price']:
+            kind = classify_price_change(old['price'], entries[identity]['price'], settings)
+            if kind is not None:
+                changes.append((kind, identity, product, old))
+
+    for identity, old in old_entries.items():
+        if identity in current:
+            continue
+        if old.get('missing', 0) + 1 >= removed_after:
+            changes.append(('removed', identity, {'title': old['title'], 'price': old['price'], 'link': old['link']}, old))
+        else:
+            entries[identity] = dict(old, missing=old.get('missing', 0) + 1)
+
+    alert_on = set(settings.get('alert_on', ['added', 'reappeared', 'price_drop']))
+    alerts = []
+    deferred = 0
+    for kind, identity, product, old in changes:
+        if kind in alert_on and max_alerts and len(alerts) >= max_alerts:
+            # Changement reporté : l'instantané garde l'ancien état pour le resignaler
+            deferred += 1
+            if old is None:
+                entries.pop(identity, None)
+            else:
+                entries[identity] = dict(old, missing=removed_after - 1) if kind == 'removed' else dict(old)
+            continue
+
+        if kind == 'removed':
+            removed_history[identity] = {'title': old['title'], 'removed_at': datetime.now().isoformat(timespec='seconds')}
+        elif kind == 'reappeared':
+            removed_history.pop(identity, None)
+        if kind in alert_on:
+            alert = dict(product, change=kind)
+            if old is not None and kind != 'removed':
+                alert['previous_price'] = old['price']
+            alerts.append(alert)
+
+    # Historique des retraits borné (les plus anciens sont oubliés)
+    max_removed = settings.get('max_removed_history', 500)
+    removed_history = dict(list(removed_history.items())[-max_removed:])
+    pending_missing = any(entry['missing'] for entry in entries.values())
+    snapshot = {
+        'fingerprint': '' if pending_missing else snapshot_fingerprint(entries),
+        'updated_at': datetime.now().isoformat(timespec='seconds'),
+        'products': entries,
+        'removed': removed_history
+    }
+
+    counts = {}
+    for kind, *_ in changes:
+        counts[kind] = counts.get(kind, 0) + 1
+    return snapshot, alerts, deferred, counts
+
+def describe_change(product: Dict[str, str]) -> str:
+    """Ligne décrivant le changement détecté pour un produit (vide sinon)"""
+    if not product.get('change'):
+        return ''
+    line = f"\n🔔 {CHANGE_LABELS.get(product['change'], product['change'])}"
+    if product.get('previous_price'):
+        line += f" (avant: {product['previous_price']})"
+    return line
@@ -1,11 +1,287 @@
 #!/usr/bin/env python3
 """
 Générateur de configuration pour le bot de surveillance universel
+
+Usage:
+    python config_generator.py                      # menu interactif
+    python config_generator.py --validate config.json
+    python config_generator.py --compile config.json
 """
 
+import copy
+import hashlib
 import json
 import os
-from typing import Dict, List, Optional
+import re
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+from title_matching import MATCHING_MODES
+
+# Version du format compilé : l'incrémenter invalide les caches existants
+COMPILED_CONFIG_VERSION = 5
+
+# Valeur obligatoire (pas de défaut possible)
+REQUIRED = object()
+
+# Schéma des sections de réglages : clé -> (type(s) attendu(s), valeur par défaut).
+# Une clé lue avec `.get()` par le moniteur a le même défaut que lui (None : la
+# clé reste absente) ; les autres n'ont pas de repli dans le moniteur et
+# reçoivent les valeurs écrites par le générateur.
+SETTINGS_SCHEMA = {
+    'email_settings': {
+        'sender_email': (str, ''),
+        'sender_password': (str, ''),
+        'recipient_emails': (list, []),
+        'smtp_server': (str, 'smtp.gmail.com'),
+        'smtp_port': (int, 587)
+    },
+    'monitoring_settings': {
+        'check_interval_hours': ((int, float), 24),
+        'max_products_per_alert': ((int, type(None)), None),
+        'avoid_duplicates': (bool, True),
+        'log_level': (str, 'INFO'),
+        'timeout_seconds': ((int, float), 30),
+        'retry_attempts': (int, 3),
+        'retry_delay_seconds': ((int, float), 5)
+    },
+    'advanced_settings': {
+        'use_proxy': (bool, False),
+        'proxy_url': (str, ''),
+        'rotate_user_agents': (bool, True),
+        'respect_robots_txt': (bool, False),
+        'min_delay_between_sites': ((int, float), 10),
+        'exclude_terms': (list, []),
+        'use_selenium': (bool, False)
+    }
+}
+
+# Schéma d'un site surveillé
+WEBSITE_SCHEMA = {
+    'name': (str, REQUIRED),
+    'url': (str, REQUIRED),
+    'enabled': (bool, True),
+    'search_terms': (list, REQUIRED),
+    'selectors': (dict, None),
+    'extraction_mode': (str, 'html')
+}
+
+EXTRACTION_MODES = ('html', 'json', 'sitemap', 'feed')
+LOG_LEVELS = ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
+REQUIRED_SELECTORS = ('product_containers', 'title', 'price', 'link')
+
+# Sélecteurs coûteux : motif -> explication
+EXPENSIVE_SELECTOR_PATTERNS = [
+    (re.compile(r"\[[^\]]*\*="), "sous-chaîne d'attribut [attr*='…'] : testée sur chaque élément de la page"),
+    (re.compile(r"(^|[\s>+~,])\*(?![=\w-])"), "sélecteur universel * : parcourt tout le document"),
+    (re.compile(r":has\("), ":has() : examine les descendants de chaque candidat"),
+    (re.compile(r":(-soup-)?contains"), ":contains : compare le texte complet de chaque élément")
+]
+
+# Sélecteurs de conteneurs trop génériques (toute la page correspond)
+GENERIC_CONTAINER_SELECTORS = {'div', 'li', 'span', 'section', 'article', 'a', 'p'}
+
+class ConfigValidationError(ValueError):
+    """Configuration invalide : liste des erreurs bloquantes"""
+    
+    def __init__(self, errors: List[str]):
+        self.errors = errors
+        super().__init__(f"{len(errors)} erreur(s) de configuration: " + "; ".join(errors))
+
+def type_name(expected) -> str:
+    """Nom lisible d'un type attendu"""
+    types = expected if isinstance(expected, tuple) else (expected,)
+    names = {str: 'texte', int: 'entier', float: 'nombre', bool: 'booléen', list: 'liste', dict: 'objet',
+             type(None): 'null'}
+    return ' ou '.join(names.get(t, t.__name__) for t in types)
+
+def check_type(value: Any, expected, path: str, errors: List[str]) -> bool:
+    """Vérifie le type d'une valeur (un booléen n'est pas accepté comme nombre)"""
+    types = expected if isinstance(expected, tuple) else (expected,)
+    if isinstance(value, bool) and bool not in types:
+        errors.append(f"{path}: {type_name(expected)} attendu, booléen trouvé")
+        return False
+    if not isinstance(value, types):
+        errors.append(f"{path}: {type_name(expected)} attendu, {type(value).__name__} trouvé")
+        return False
+    return True
+
+def apply_schema(section: Dict[str, Any], schema: Dict[str, Tuple[Any, Any]], path: str, errors: List[str]):
+    """Vérifie les types d'une section et complète les clés absentes par leur défaut"""
+    for key, (expected, default) in schema.items():
+        if key not in section:
+            if default is REQUIRED:
+                errors.append(f"{path}.{key}: clé obligatoire absente")
+            elif default is not None:
+                section[key] = copy.deepcopy(default)
+            continue
+        check_type(section[key], expected, f"{path}.{key}", errors)
+
+def selector_cost_warnings(selector: str) -> List[str]:
+    """Raisons pour lesquelles un sélecteur CSS est coûteux à évaluer"""
+    return [reason for pattern, reason in EXPENSIVE_SELECTOR_PATTERNS if pattern.search(selector)]
+
+def normalize_terms(terms: List[str]) -> List[str]:
+    """Termes en minuscules, sans espaces superflus ni doublons (ordre conservé)"""
+    normalized = []
+    for term in terms:
+        term = ' '.join(str(term).split()).lower()
+        if term and term not in normalized:
+            normalized.append(term)
+    return normalized
+
+def validate_config(config: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+    """Valide une configuration et retourne sa version compilée et les avertissements
+    
+    La version compilée est une copie complétée des valeurs par défaut, avec
+    les termes de recherche normalisés (`normalized_search_terms` par site,
+    `normalized_exclude_terms`). Lève ConfigValidationError si la
+    configuration ne peut pas être utilisée par le moniteur.
+    """
+    import soupsieve
+    
+    compiled = copy.deepcopy(config)
+    errors = []
+    warnings = []
+    
+    if not isinstance(compiled, dict):
+        raise ConfigValidationError(["la configuration doit être un objet JSON"])
+    
+    for section_name, schema in SETTINGS_SCHEMA.items():
+        section = compiled.setdefault(section_name, {})
+        if check_type(section, dict, section_name, errors):
+            apply_schema(section, schema, section_name, errors)
+    
+    monitoring = compiled['monitoring_settings']
+    if isinstance(monitoring, dict):
+        if monitoring.get('log_level') not in LOG_LEVELS:
+            errors.append(f"monitoring_settings.log_level: une valeur parmi {', '.join(LOG_LEVELS)} attendue")
+        if isinstance(monitoring.get('retry_attempts'), int) and monitoring['retry_attempts'] < 1:
+            errors.append("monitoring_settings.retry_attempts: au moins 1 tentative attendue")
+        if isinstance(monitoring.get('check_interval_hours'), (int, float)) and monitoring['check_interval_hours'] <= 0:
+            errors.append("monitoring_settings.check_interval_hours: valeur positive attendue")
+    
+    advanced = compiled['advanced_settings']
+    if isinstance(advanced, dict) and isinstance(advanced.get('exclude_terms'), list):
+        advanced['normalized_exclude_terms'] = normalize_terms(advanced['exclude_terms'])
+    matching_mode = 'substring'
+    if isinstance(advanced, dict) and check_type(advanced.get('matching', {}), dict, 'advanced_settings.matching', errors):
+        matching_mode = advanced.get('matching', {}).get('mode', 'substring')
+        if matching_mode not in MATCHING_MODES:
+            errors.append(f"advanced_settings.matching.mode: une valeur parmi {', '.join(MATCHING_MODES)} attendue")
+    
+    control_api = advanced.get('control_api', {}) if isinstance(advanced, dict) else {}
+    if check_type(control_api, dict, 'advanced_settings.control_api', errors):
+        if control_api.get('enabled') and not control_api.get('token'):
+            errors.append("advanced_settings.control_api.token: jeton obligatoire quand l'API est activée")
+    
+    websites = compiled.get('websites')
+    if not isinstance(websites, list) or not websites:
+        errors.append("websites: liste d'au moins un site attendue")
+        websites = []
+    
+    default_selectors = ConfigGenerator().get_default_selectors()
+    for index, website in enumerate(websites):
+        path = f"websites[{index}]"
+        if not isinstance(website, dict):
+            errors.append(f"{path}: objet attendu")
+            continue
+        path = f"websites[{index}] ({website.get('name', 'sans nom')})"
+        apply_schema(website, WEBSITE_SCHEMA, path, errors)
+        
+        if isinstance(website.get('url'), str) and not website['url'].startswith(('http://', 'https://')):
+            errors.append(f"{path}.url: URL http(s) attendue")
+        if website.get('extraction_mode') not in EXTRACTION_MODES:
+            errors.append(f"{path}.extraction_mode: une valeur parmi {', '.join(EXTRACTION_MODES)} attendue")
+        if isinstance(website.get('search_terms'), list):
+            website['normalized_search_terms'] = normalize_terms(website['search_terms'])
+            if not website['normalized_search_terms']:
+                errors.append(f"{path}.search_terms: au moins un terme attendu")
+            if matching_mode == 'substring':
+                for term in website['normalized_search_terms']:
+                    if len(term) < 3:
+                        warnings.append(f"{path}.search_terms: {term!r} très court, trouvé dans de nombreux mots "
+                                        "(advanced_settings.matching.mode 'tokens' recommandé)")
+        
+        # Un état inline (__NEXT_DATA__, window.__INITIAL_STATE__) est un objet :
+        # sans items_path, aucun produit n'en est extrait
+        json_settings = website.get('json_extraction')
+        if (website.get('extraction_mode') == 'json' and isinstance(json_settings, dict)
+                and json_settings.get('source') == 'script' and not json_settings.get('items_path')):
+            warnings.append(f"{path}.json_extraction.items_path: absent avec source 'script', "
+                            "seul un bloc qui est directement une liste de produits sera exploité")
+        
+        # Sélecteurs : clés manquantes complétées, syntaxe et coût vérifiés
+        selectors = website.setdefault('selectors', copy.deepcopy(default_selectors))
+        if not check_type(selectors, dict, f"{path}.selectors", errors):
+            continue
+        for key in REQUIRED_SELECTORS:
+            if key not in selectors:
+                selectors[key] = list(default_selectors[key])
+                if website['extraction_mode'] == 'html':
+                    warnings.append(f"{path}.selectors.{key}: absent, sélecteurs par défaut utilisés")
+        for key, selector_list in selectors.items():
+            if not check_type(selector_list, list, f"{path}.selectors.{key}", errors):
+                continue
+            for selector in selector_list:
+                try:
+                    soupsieve.compile(selector)
+                except (soupsieve.SelectorSyntaxError, TypeError) as e:
+                    errors.append(f"{path}.selectors.{key}: sélecteur invalide {selector!r} ({str(e).splitlines()[0]})")
+                    continue
+                for reason in selector_cost_warnings(selector):
+                    warnings.append(f"{path}.selectors.{key}: {selector!r} coûteux, {reason}")
+                if key == 'product_containers' and selector.strip() in GENERIC_CONTAINER_SELECTORS:
+                    warnings.append(f"{path}.selectors.{key}: {selector!r} trop générique pour un conteneur de produit")
+    
+    if errors:
+        raise ConfigValidationError(errors)
+    return compiled, warnings
+
+def compiled_cache_path(config_file: str) -> str:
+    """Chemin du cache compilé d'un fichier de configuration (.nom.compiled.json)"""
+    directory, filename = os.path.split(os.path.abspath(config_file))
+    return os.path.join(directory, f".{os.path.splitext(filename)[0]}.compiled.json")
+
+def compile_config_file(config_file: str) -> Tuple[Dict[str, Any], List[str]]:
+    """Valide un fichier de configuration et écrit son cache compilé"""
+    with open(config_file, 'rb') as f:
+        raw = f.read()
+    compiled, warnings = validate_config(json.loads(raw))
+    cache = {
+        'version': COMPILED_CONFIG_VERSION,
+        'source_sha256': hashlib.sha256(raw).hexdigest(),
+        'warnings': warnings,
+        'config': compiled
+    }
+    cache_path = compiled_cache_path(config_file)
+    tmp_path = f"{cache_path}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # Répertoire en lecture seule : la configuration reste utilisable
+        pass
+    return compiled, warnings
+
+def load_config_file(config_file: str) -> Tuple[Dict[str, Any], List[str], bool]:
+    """Charge une configuration validée, depuis le cache compilé s'il est à jour
+    
+    Retourne (configuration, avertissements, chargée depuis le cache). Le cache
+    est reconstruit quand le fichier source a changé.
+    """
+    with open(config_file, 'rb') as f:
+        raw = f.read()
+    try:
+        with open(compiled_cache_path(config_file), 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get('version') == COMPILED_CONFIG_VERSION and cache.get('source_sha256') == hashlib.sha256(raw).hexdigest():
+            return cache['config'], cache.get('warnings', []), True
+    except (OSError, ValueError):
+        pass
+    compiled, warnings = compile_config_file(config_file)
+    return compiled, warnings, False
 
 class ConfigGenerator:
     def __init__(self):
@@ -234,7 +510,44 @@ class ConfigGenerator:
             return True
         return False
 
+def run_validation(config_file: str, write_cache: bool) -> int:
+    """Valide (et compile) un fichier de configuration, retourne le code de sortie"""
+    action = "Compilation" if write_cache else "Validation"
+    print(f"🔎 {action} de {config_file}")
+    try:
+        if write_cache:
+            compiled, warnings = compile_config_file(config_file)
+        else:
+            with open(config_file, 'r', encoding='utf-8') as f:
+                compiled, warnings = validate_config(json.load(f))
+    except FileNotFoundError:
+        print(f"❌ Fichier {config_file} non trouvé")
+        return 1
+    except json.JSONDecodeError as e:
+        print(f"❌ Erreur de format JSON: {e}")
+        return 1
+    except ConfigValidationError as e:
+        for error in e.errors:
+            print(f"❌ {error}")
+        return 1
+    
+    for warning in warnings:
+        print(f"⚠️ {warning}")
+    print(f"✅ Configuration valide ({len(compiled['websites'])} site(s), {len(warnings)} avertissement(s))")
+    if write_cache:
+        print(f"💾 Cache compilé: {compiled_cache_path(config_file)}")
+    return 0
+
 def main():
+    if len(sys.argv) > 1:
+        import argparse
+        parser = argparse.ArgumentParser(description="Générateur et validateur de configuration")
+        group = parser.add_mutually_exclusive_group(required=True)
+        group.add_argument('--validate', metavar='CONFIG', help="Vérifie une configuration sans l'écrire")
+        group.add_argument('--compile', metavar='CONFIG', help="Valide et écrit le cache compilé chargé par le moniteur")
+        args = parser.parse_args()
+        sys.exit(run_validation(args.validate or args.compile, write_cache=bool(args.compile)))
+    
     generator = ConfigGenerator()
     
     print("🔧 GÉNÉRATEUR DE CONFIGURATION")
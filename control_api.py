@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+API de contrôle locale du moniteur (HTTP, écoute sur localhost par défaut)
+
+Le serveur tourne dans un thread du planificateur et ne fait que lire l'état
+du moniteur ou déposer des demandes : les vérifications à la demande sont
+exécutées par la boucle principale, entre deux cycles, pour ne jamais
+partager l'état des produits détectés avec un cycle en cours.
+
+Endpoints:
+    GET  /status                  état du bot et de chaque site
+    GET  /detections?limit=20     dernières détections
+    POST /sites/<nom>/check       vérification immédiate d'un site
+    POST /sites/<nom>/pause       suspend un site
+    POST /sites/<nom>/resume      réactive un site
+
+Chaque requête doit porter l'en-tête `Authorization: Bearer <token>` : un jeton est
+obligatoire, un navigateur ne pouvant pas l'ajouter à une requête inter-origines simple.
+"""
+
+import hmac
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, unquote, urlsplit
+
+class ControlRequestHandler(BaseHTTPRequestHandler):
+    """Traduit les requêtes HTTP en appels au moniteur"""
+
+    server_version = 'BotAlerte'
+
+    def send_json(self, status: int, data: Any):
+        body = json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def authorized(self) -> bool:
+        token = self.server.settings.get('token')
+        if not token:
+            # Jamais d'accès anonyme : une page web peut émettre un POST simple vers localhost
+            self.send_json(403, {'error': 'API sans jeton configuré'})
+            return False
+        provided = self.headers.get('Authorization', '')
+        if hmac.compare_digest(provided, f"Bearer {token}"):
+            return True
+        self.send_json(401, {'error': 'jeton invalide'})
+        return False
+
+    def do_GET(self):
+        if not self.authorized():
+            return
+        monitor = self.server.monitor
+        url = urlsplit(self.path)
+        if url.path == '/status':
+            self.send_json(200, monitor.get_control_status())
+        elif url.path == '/detections':
+            try:
+                limit = int(parse_qs(url.query).get('limit', ['20'])[0])
+            except ValueError:
+                self.send_json(400, {'error': 'limit doit être un entier'})
+                return
+            self.send_json(200, monitor.get_recent_detections(limit))
+        else:
+            self.send_json(404, {'error': f"chemin inconnu: {url.path}"})
+
+    def do_POST(self):
+        if not self.authorized():
+            return
+        monitor = self.server.monitor
+        parts = urlsplit(self.path).path.strip('/').split('/')
+        if len(parts) != 3 or parts[0] != 'sites' or parts[2] not in ('check', 'pause', 'resume'):
+            self.send_json(404, {'error': f"chemin inconnu: {self.path}"})
+            return
+        website = monitor.find_website(unquote(parts[1]))
+        if website is None:
+            self.send_json(404, {'error': f"site inconnu: {unquote(parts[1])}"})
+            return
+        if parts[2] == 'check':
+            self.send_json(202, monitor.request_site_check(website))
+        else:
+            self.send_json(200, monitor.set_site_paused(website, parts[2] == 'pause'))
+
+    def log_message(self, format: str, *args):
+        self.server.monitor.logger.debug(f"🎛️ API {self.address_string()} - {format % args}")
+
+class ControlServer(ThreadingHTTPServer):
+    """Serveur HTTP de contrôle lié à une instance du moniteur"""
+
+    daemon_threads = True
+
+    def __init__(self, monitor, settings: Dict[str, Any]):
+        self.monitor = monitor
+        self.settings = settings
+        self.thread: Optional[threading.Thread] = None
+        super().__init__((settings['host'], settings['port']), ControlRequestHandler)
+
+    def start(self):
+        """Sert les requêtes dans un thread dédié"""
+        self.thread = threading.Thread(target=self.serve_forever, kwargs={'poll_interval': 0.5},
+                                       name='botalerte-control', daemon=True)
+        self.thread.start()
+
+    def close(self):
+        """Arrête le serveur et libère le port"""
+        self.shutdown()
+        self.server_close()
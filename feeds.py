@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Lecture des sitemaps XML et flux RSS/Atom (modes `sitemap` et `feed`)
+
+Les documents sont convertis en entrées homogènes (id, titre, lien,
+description, image, date ISO UTC). Le curseur d'un site (date la plus
+récente et identifiants déjà vus) ne laisse passer que les nouvelles
+entrées. Le téléchargement (GET conditionnel, index de sitemaps) reste dans
+UniversalWebMonitor.fetch_feed_entries.
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Tuple, TYPE_CHECKING
+from urllib.parse import urlparse
+
+if TYPE_CHECKING:
+    import xml.etree.ElementTree as ET
+
+def local_name(tag: str) -> str:
+    """Nom d'une balise sans son espace de noms"""
+    return tag.rsplit('}', 1)[-1]
+
+def child_text(node: ET.Element, *names: str) -> str:
+    """Texte du premier enfant portant l'un des noms donnés"""
+    for child in node:
+        if local_name(child.tag) in names and child.text:
+            return child.text.strip()
+    return ''
+
+def normalize_feed_date(value: str) -> str:
+    """Convertit une date de flux (W3C, ISO 8601 ou RFC 822) en ISO UTC comparable"""
+    if not value:
+        return ''
+    value = value.strip()
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError):
+            return ''
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.strftime('%Y-%m-%dT%H:%M:%S')
+
+def parse_feed_entries(root: ET.Element) -> List[Dict[str, str]]:
+    """Convertit un document sitemap, RSS ou Atom en entrées homogènes"""
+    entries = []
+    root_name = local_name(root.tag)
+    if root_name == 'urlset':
+        for node in root:
+            loc = child_text(node, 'loc')
+            if not loc:
+                continue
+            # Titre : <image:title> si présent, sinon le slug de l'URL
+            image_title = ''
+            image_loc = ''
+            for child in node:
+                if local_name(child.tag) == 'image':
+                    image_title = child_text(child, 'title')
+                    image_loc = child_text(child, 'loc')
+                    break
+            slug = urlparse(loc).path.rstrip('/').rsplit('/', 1)[-1]
+            slug = re.sub(r'\.[a-z0-9]+$', '', slug, flags=re.IGNORECASE)
+            entries.append({
+                'id': loc,
+                'title': image_title or re.sub(r'[-_+]+', ' ', slug).strip(),
+                'link': loc,
+                'description': '',
+                'image': image_loc,
+                'date': normalize_feed_date(child_text(node, 'lastmod'))
+            })
+    elif root_name == 'feed':
+        for node in root:
+            if local_name(node.tag) != 'entry':
+                continue
+            link = ''
+            for child in node:
+                if local_name(child.tag) == 'link' and child.get('rel', 'alternate') == 'alternate':
+                    link = child.get('href', '')
+                    break
+            entries.append({
+                'id': child_text(node, 'id') or link,
+                'title': child_text(node, 'title'),
+                'link': link,
+                'description': child_text(node, 'summary', 'content')[:200],
+                'image': '',
+                'date': normalize_feed_date(child_text(node, 'updated', 'published'))
+            })
+    else:
+        # RSS 2.0 (rss/channel/item) et RSS 1.0 (rdf:RDF/item)
+        for node in root.iter():
+            if local_name(node.tag) != 'item':
+                continue
+            link = child_text(node, 'link')
+            entries.append({
+                'id': child_text(node, 'guid') or link,
+                'title': child_text(node, 'title'),
+                'link': link,
+                'description': re.sub(r'<[^>]+>', ' ', child_text(node, 'description'))[:200].strip(),
+                'image': '',
+                'date': normalize_feed_date(child_text(node, 'pubDate', 'date'))
+            })
+    return entries
+
+def sitemap_index_children(root: ET.Element) -> List[Tuple[str, str]]:
+    """(URL, date ISO de modification) des sitemaps listés par un index de sitemaps"""
+    children = []
+    for node in root:
+        loc = child_text(node, 'loc')
+        if loc:
+            children.append((loc, normalize_feed_date(child_text(node, 'lastmod'))))
+    return children
+
+def advance_cursor(entries: List[Dict[str, str]], cursor: Dict[str, Any], new_cursor: Dict[str, Any],
+                   max_seen_ids: int = 2000) -> List[Dict[str, str]]:
+    """Retourne les entrées postérieures au curseur et complète le nouveau curseur
+
+    Une entrée est nouvelle si son identifiant n'a pas déjà été vu et si sa
+    date (quand elle en a une) n'est pas antérieure à la dernière date vue.
+    Le nouveau curseur garde la date la plus récente et les identifiants
+    récents (bornés à `max_seen_ids`).
+    """
+    last_modified = cursor.get('last_modified', '')
+    seen_ids = set(cursor.get('seen_ids', []))
+    new_entries = [
+        entry for entry in entries
+        if entry['id'] not in seen_ids and (not entry['date'] or entry['date'] >= last_modified)
+    ]
+    dates = [entry['date'] for entry in entries if entry['date']]
+    new_cursor['last_modified'] = max(dates + [last_modified])
+    new_cursor['seen_ids'] = ([entry['id'] for entry in new_entries] + cursor.get('seen_ids', []))[:max_seen_ids]
+    return new_entries
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Utilitaires partagés par le moniteur et ses sous-systèmes
+
+Imports différés mesurés (rapport de démarrage), écriture atomique des
+fichiers d'état, mémoire résidente du processus et conversion des libellés
+de prix en nombres.
+"""
+
+import importlib
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from typing import Any, Optional
+
+# Durée du premier import de chaque module chargé à la demande (secondes)
+IMPORT_TIMINGS = {}
+
+def lazy_import(module_name: str):
+    """Importe un module à la première utilisation en mesurant sa durée de chargement"""
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    IMPORT_TIMINGS[module_name] = time.perf_counter() - start
+    return module
+
+# Nombre dans un libellé de prix ("1 299,00 €", "$1,299.99", "89.-")
+PRICE_NUMBER_PATTERN = re.compile(r"\d[\d\s.,'\u00a0\u202f]*")
+
+def get_rss_mb() -> float:
+    """Mémoire résidente actuelle du processus en Mo (pic sur les systèmes sans /proc)"""
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss est en octets sur macOS, en Ko ailleurs
+        return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        return 0.0
+
+def atomic_write_json(path: str, data: Any, indent: Optional[int] = 2):
+    """Écrit un fichier JSON de façon atomique (fichier temporaire puis renommage)
+    
+    Un arrêt brutal pendant l'écriture laisse l'ancien fichier intact.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.tmp_', suffix='.json', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=indent)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def normalize_price(text: str) -> Optional[float]:
+    """Convertit un libellé de prix en nombre (None si aucun nombre n'est trouvé)
+    
+    Avec deux séparateurs différents, le dernier est décimal ; un séparateur
+    unique suivi de exactement trois chiffres est un séparateur de milliers.
+    """
+    match = PRICE_NUMBER_PATTERN.search(text or '')
+    if not match:
+        return None
+    number = re.sub(r"[\s'\u00a0\u202f]", '', match.group()).rstrip('.,')
+    separators = [char for char in number if char in ',.']
+    decimal_separator = None
+    if len(set(separators)) == 2:
+        decimal_separator = separators[-1]
+    elif len(separators) == 1 and len(number) - number.rfind(separators[0]) - 1 != 3:
+        decimal_separator = separators[0]
+    
+    if decimal_separator:
+        integer_part, decimal_part = number.rsplit(decimal_separator, 1)
+    else:
+        integer_part, decimal_part = number, '0'
+    try:
+        return float(f"{integer_part.replace(',', '').replace('.', '')}.{decimal_part}")
+    except ValueError:
+        return None
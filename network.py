@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Réutilisation réseau de la session HTTP du moniteur (`advanced_settings.network`)
+
+Mesure des résolutions DNS et poignées de main TLS de chaque requête, cache
+DNS avec durée de vie et reprise de session TLS par hôte. Le cache DNS et le
+contexte TLS ne s'appliquent qu'à l'adaptateur de la session du bot :
+requests, urllib3 et ssl ne sont importés qu'au premier usage.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, TYPE_CHECKING
+
+from monitor_utils import lazy_import
+
+if TYPE_CHECKING:
+    import ssl
+    from requests.adapters import HTTPAdapter
+
+class NetworkTimings:
+    """Mesures réseau (résolution DNS, poignée de main TLS) de la requête en cours
+    
+    Les mesures sont collectées par thread pendant une requête ; les moyennes
+    des résolutions et poignées de main complètes servent à estimer le temps
+    économisé par le cache DNS, la reprise de session TLS et le keep-alive.
+    """
+    
+    def __init__(self):
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.totals = {'dns': [0.0, 0], 'tls_full': [0.0, 0], 'tls_resumed': [0.0, 0]}
+        
+    def begin(self):
+        """Démarre la collecte pour la requête du thread courant"""
+        self.local.current = {'dns_ms': 0.0, 'dns_lookups': 0, 'dns_cached': 0,
+                              'tls_ms': 0.0, 'tls_handshakes': 0, 'tls_resumed': 0}
+        
+    def add_sample(self, kind: str, milliseconds: float):
+        """Ajoute une mesure à la moyenne d'une catégorie"""
+        with self.lock:
+            self.totals[kind][0] += milliseconds
+            self.totals[kind][1] += 1
+            
+    def average(self, kind: str) -> float:
+        """Durée moyenne (ms) d'une catégorie de mesures"""
+        total, count = self.totals[kind]
+        return total / count if count else 0.0
+        
+    def record_dns(self, seconds: float, cached: bool):
+        """Enregistre une résolution DNS (depuis le cache ou non)"""
+        current = getattr(self.local, 'current', None)
+        if not cached:
+            self.add_sample('dns', seconds * 1000)
+        if current is not None:
+            current['dns_ms'] += seconds * 1000
+            current['dns_lookups'] += 1
+            current['dns_cached'] += cached
+            
+    def record_handshake(self, seconds: float, resumed: bool):
+        """Enregistre une poignée de main TLS (complète ou reprise)"""
+        current = getattr(self.local, 'current', None)
+        self.add_sample('tls_resumed' if resumed else 'tls_full', seconds * 1000)
+        if current is not None:
+            current['tls_ms'] += seconds * 1000
+            current['tls_handshakes'] += 1
+            current['tls_resumed'] += resumed
+            
+    def end(self, url: str) -> Dict[str, Any]:
+        """Termine la collecte et estime le temps économisé pour cette requête"""
+        current = getattr(self.local, 'current', None) or {}
+        self.local.current = None
+        timing = dict(current, reused_connection=not current.get('dns_lookups'))
+        saved = current.get('dns_cached', 0) * self.average('dns')
+        if current.get('tls_resumed'):
+            resumed_ms = current['tls_ms'] / current['tls_handshakes']
+            saved += current['tls_resumed'] * max(0.0, self.average('tls_full') - resumed_ms)
+        if timing['reused_connection']:
+            # Connexion keep-alive : ni résolution, ni poignée de main
+            saved += self.average('dns') + (self.average('tls_full') if url.startswith('https') else 0.0)
+        timing['saved_ms'] = saved
+        return timing
+        
+    def describe(self, timing: Dict[str, Any]) -> str:
+        """Résumé lisible des mesures d'une requête"""
+        if timing.get('reused_connection'):
+            connection = "connexion réutilisée"
+        else:
+            dns = "DNS en cache" if timing['dns_cached'] == timing['dns_lookups'] else f"DNS {timing['dns_ms']:.1f} ms"
+            connection = dns
+            if timing['tls_handshakes']:
+                kind = "TLS repris" if timing['tls_resumed'] == timing['tls_handshakes'] else "TLS complet"
+                connection += f", {kind} {timing['tls_ms']:.1f} ms"
+        return f"{connection}, ~{timing['saved_ms']:.0f} ms économisés"
+
+network_timings = NetworkTimings()
+
+class DnsCache:
+    """Cache des résolutions DNS de socket.getaddrinfo, avec durée de vie
+    
+    La bibliothèque standard n'expose pas le TTL des enregistrements : la
+    durée de vie est celle configurée (`network.dns_ttl_seconds`). Les échecs
+    de résolution ne sont pas mis en cache.
+    """
+    
+    def __init__(self, resolve: Callable, ttl_seconds: float = 300):
+        self.resolve = resolve
+        self.ttl_seconds = ttl_seconds
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0}
+        
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        """Remplaçant de socket.getaddrinfo servi depuis le cache"""
+        key = (host, port, family, type, proto, flags)
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] > now:
+                self.stats['hits'] += 1
+                network_timings.record_dns(0.0, True)
+                return list(entry[1])
+        
+        start = time.perf_counter()
+        result = self.resolve(*key)
+        network_timings.record_dns(time.perf_counter() - start, False)
+        with self.lock:
+            self.stats['misses'] += 1
+            # Purge des entrées expirées avant insertion
+            for expired in [k for k, (expires_at, _) in self.entries.items() if expires_at <= now]:
+                del self.entries[expired]
+            self.entries[key] = (now + self.ttl_seconds, list(result))
+        return result
+
+    def addresses(self, host: str, port: int) -> List[str]:
+        """Adresses IP d'un hôte (ordre de résolution conservé, sans doublons)"""
+        socket = lazy_import('socket')
+        addresses = []
+        for _, _, _, _, sockaddr in self.getaddrinfo(host, port, 0, socket.SOCK_STREAM):
+            if sockaddr[0] not in addresses:
+                addresses.append(sockaddr[0])
+        return addresses
+
+# Adaptateur HTTP à cache DNS, défini au premier usage (import de requests différé)
+_caching_adapter_class = None
+
+def create_http_adapter(pool_size: int, dns_cache: Optional[DnsCache] = None,
+                        ssl_context: Optional[ssl.SSLContext] = None) -> HTTPAdapter:
+    """Crée l'adaptateur HTTP d'une session, avec cache DNS et contexte TLS optionnels
+    
+    Le cache DNS ne s'applique qu'aux connexions de cet adaptateur : l'hôte
+    est résolu via le cache, puis urllib3 se connecte à l'adresse obtenue
+    (le nom reste utilisé pour SNI et la vérification du certificat). Ni
+    socket.getaddrinfo ni les autres bibliothèques du processus ne sont modifiés.
+    """
+    global _caching_adapter_class
+    adapters = lazy_import('requests.adapters')
+    
+    if _caching_adapter_class is None:
+        urllib3_connection = lazy_import('urllib3.connection')
+        urllib3_pool = lazy_import('urllib3.connectionpool')
+        urllib3_exceptions = lazy_import('urllib3.exceptions')
+        socket = lazy_import('socket')
+        
+        def cached_connection(connection_class):
+            class CachedDnsConnection(connection_class):
+                dns_cache = None
+                
+                def _new_conn(self):
+                    host = self._dns_host
+                    try:
+                        addresses = self.dns_cache.addresses(host, self.port)
+                    except (socket.gaierror, UnicodeError):
+                        # Échec de résolution : urllib3 produit son erreur habituelle
+                        return super()._new_conn()
+                    error = None
+                    for address in addresses:
+                        self._dns_host = address
+                        try:
+                            return super()._new_conn()
+                        except urllib3_exceptions.ConnectTimeoutError as e:
+                            error = e
+                        finally:
+                            self._dns_host = host
+                    raise error
+            return CachedDnsConnection
+        
+        class CachingHTTPAdapter(adapters.HTTPAdapter):
+            dns_cache = None
+            
+            def __init__(self, *args, dns_cache=None, **kwargs):
+                self.dns_cache = dns_cache
+                super().__init__(*args, **kwargs)
+                
+            def init_poolmanager(self, *args, **kwargs):
+                super().init_poolmanager(*args, **kwargs)
+                if self.dns_cache is None:
+                    return
+                pool_classes = {}
+                for scheme, pool_class, connection_class in (
+                        ('http', urllib3_pool.HTTPConnectionPool, urllib3_connection.HTTPConnection),
+                        ('https', urllib3_pool.HTTPSConnectionPool, urllib3_connection.HTTPSConnection)):
+                    connection = type(connection_class.__name__, (cached_connection(connection_class),),
+                                      {'dns_cache': self.dns_cache})
+                    pool_classes[scheme] = type(pool_class.__name__, (pool_class,), {'ConnectionCls': connection})
+                self.poolmanager.pool_classes_by_scheme = pool_classes
+        
+        _caching_adapter_class = CachingHTTPAdapter
+    
+    adapter = _caching_adapter_class(pool_maxsize=pool_size, dns_cache=dns_cache)
+    if ssl_context is not None:
+        adapter.poolmanager.connection_pool_kw['ssl_context'] = ssl_context
+    return adapter
+
+# Contexte TLS à reprise de session, défini au premier usage (import de ssl différé)
+_resumable_context_class = None
+
+def create_resumable_tls_context() -> ssl.SSLContext:
+    """Crée un contexte TLS client qui reprend les sessions TLS par hôte
+    
+    La session de chaque hôte est mémorisée après la poignée de main et à la
+    fermeture de la connexion ; une nouvelle connexion vers cet hôte la
+    présente au serveur (reprise abrégée au lieu d'une poignée de main complète).
+    Contrairement au contexte par défaut d'urllib3, les tickets de session
+    ne sont pas désactivés.
+    """
+    global _resumable_context_class
+    ssl = lazy_import('ssl')
+    
+    if _resumable_context_class is None:
+        class ResumableSSLSocket(ssl.SSLSocket):
+            def close(self):
+                # La session (et son ticket TLS 1.3) n'est lisible qu'avant la fermeture
+                self.context.remember_session(self)
+                super().close()
+        
+        class ResumableSSLContext(ssl.SSLContext):
+            sslsocket_class = ResumableSSLSocket
+            
+            def wrap_socket(self, sock, *args, server_hostname=None, session=None, **kwargs):
+                if session is None and server_hostname:
+                    session = self.tls_sessions.get(server_hostname)
+                start = time.perf_counter()
+                ssl_sock = super().wrap_socket(sock, *args, server_hostname=server_hostname, session=session, **kwargs)
+                network_timings.record_handshake(time.perf_counter() - start, ssl_sock.session_reused)
+                self.remember_session(ssl_sock)
+                return ssl_sock
+                
+            def remember_session(self, ssl_sock):
+                try:
+                    session = ssl_sock.session
+                except (ValueError, OSError):
+                    return
+                # Sans ticket, une session TLS 1.3 ne peut pas être reprise
+                if session is None or not ssl_sock.server_hostname:
+                    return
+                if not session.has_ticket and ssl_sock.version() == 'TLSv1.3':
+                    return
+                self.tls_sessions[ssl_sock.server_hostname] = session
+                
+            def load_verify_locations(self, cafile=None, capath=None, cadata=None):
+                # urllib3 recharge le magasin de certificats à chaque connexion
+                key = (cafile, capath, cadata)
+                if key not in self.loaded_locations:
+                    super().load_verify_locations(cafile, capath, cadata)
+                    self.loaded_locations.add(key)
+        
+        _resumable_context_class = ResumableSSLContext
+    
+    context = _resumable_context_class(ssl.PROTOCOL_TLS_CLIENT)
+    context.tls_sessions = {}
+    context.loaded_locations = set()
+    context.minimum_version = ssl.TLSVersion.TLSv1_2
+    return context
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Parcours des pages de résultats d'un site (`pagination`)
+
+Les pages suivantes sont trouvées via `next_selector` (séquentiel) ou
+générées par `url_template` (récupérées en parallèle par vagues bornées).
+Chaque page, la première comprise, passe par
+UniversalWebMonitor.fetch_results_page : pool de parsing, cache et budgets
+de parcours s'appliquent partout de la même façon.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from urllib.parse import urljoin
+
+if TYPE_CHECKING:
+    from universal_monitor import UniversalWebMonitor
+
+def next_page_href(soup, next_selector: Optional[str]) -> Optional[str]:
+    """Lien de la page suivante d'une page de résultats (None sans sélecteur ou sans lien)"""
+    if not next_selector:
+        return None
+    next_link = soup.select_one(next_selector)
+    return next_link.get('href') if next_link else None
+
+def crawl_paginated(monitor: UniversalWebMonitor, website: Dict[str, Any]) -> Optional[List[Dict[str, str]]]:
+    """Parcourt les pages de résultats d'un site et fusionne leurs produits
+
+    Avec `avoid_duplicates`, le parcours s'arrête dès qu'une page ne contient
+    que des produits déjà détectés ; il s'arrête aussi à `max_pages` ou à la
+    première page absente (404). Retourne None si la première page n'a pas
+    pu être récupérée.
+    """
+    pagination = website['pagination']
+    max_pages = pagination.get('max_pages', 5)
+    wait_seconds = website.get('wait_between_requests', 0)
+    next_selector = pagination.get('next_selector') if not pagination.get('url_template') else None
+    stop_when_all_known = (pagination.get('stop_when_all_known', True)
+                           and monitor.config['monitoring_settings']['avoid_duplicates'])
+    known_hashes = set(monitor.detected_products.get(monitor.get_site_key(website), [])) if stop_when_all_known else set()
+    merged = []
+    merged_hashes = set()
+
+    def merge(products: List[Dict[str, str]]) -> bool:
+        """Ajoute les produits d'une page, retourne True s'ils étaient tous déjà connus"""
+        all_known = bool(products)
+        for product in products:
+            product_hash = monitor.generate_product_hash(product)
+            if product_hash not in known_hashes:
+                all_known = False
+            if product_hash not in merged_hashes:
+                merged_hashes.add(product_hash)
+                merged.append(product)
+        return all_known and stop_when_all_known
+
+    # Première page : URL du site, dont on garde le lien suivant
+    first_page = monitor.fetch_results_page(website, website['url'], next_selector)
+    if first_page is None:
+        return None
+    products, next_href = first_page
+    if merge(products):
+        monitor.logger.info(f"⏹️ Page 1 de {website['name']} déjà connue, pagination arrêtée")
+        return merged
+
+    pages_fetched = 1
+    if pagination.get('url_template'):
+        # Pages générées : récupération parallèle par vagues de max_parallel pages
+        page_numbers = list(range(pagination.get('start_page', 2), pagination.get('start_page', 2) + max_pages - 1))
+        wave_size = max(1, pagination.get('max_parallel', monitor.config['advanced_settings'].get('max_parallel_per_host', 2)))
+        with ThreadPoolExecutor(max_workers=wave_size) as executor:
+            for start in range(0, len(page_numbers), wave_size):
+                wave = page_numbers[start:start + wave_size]
+                urls = [pagination['url_template'].format(page=number) for number in wave]
+                results = list(executor.map(
+                    lambda url: monitor.fetch_results_page(website, url, missing_ok=True), urls))
+                stop = False
+                for number, result in zip(wave, results):
+                    if result is None:
+                        # Page inexistante ou en erreur : fin de la liste
+                        stop = True
+                        break
+                    pages_fetched += 1
+                    if merge(result[0]):
+                        monitor.logger.info(f"⏹️ Page {number} de {website['name']} déjà connue, pagination arrêtée")
+                        stop = True
+                        break
+                if stop:
+                    break
+                if wait_seconds and monitor.stop_event.wait(wait_seconds):
+                    break
+    elif next_selector:
+        # Lien "page suivante" : parcours séquentiel
+        current_url = website['url']
+        visited = {current_url}
+        while pages_fetched < max_pages and next_href:
+            current_url = urljoin(current_url, next_href)
+            if current_url in visited:
+                break
+            visited.add(current_url)
+            if wait_seconds and monitor.stop_event.wait(wait_seconds):
+                break
+            result = monitor.fetch_results_page(website, current_url, next_selector, missing_ok=True)
+            if result is None:
+                break
+            pages_fetched += 1
+            products, next_href = result
+            if merge(products):
+                monitor.logger.info(f"⏹️ Page {pages_fetched} de {website['name']} déjà connue, pagination arrêtée")
+                break
+
+    monitor.logger.info(f"📚 {pages_fetched} page(s) parcourue(s) sur {website['name']}: {len(merged)} produit(s) fusionné(s)")
+    return merged
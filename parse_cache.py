@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Cache des produits extraits d'une page (`advanced_settings.parse_cache`)
+
+Une page identique (même URL, même contenu, même configuration de site)
+n'est ni reparsée ni réextraite : ses produits et son lien de page suivante
+sont repris du cache, en mémoire ou sur disque.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from monitor_utils import atomic_write_json
+
+class ParsedPageCache:
+    """Cache LRU des produits extraits, indexé par URL, contenu et configuration du site
+    
+    Un niveau mémoire borné (OrderedDict) est complété par un niveau disque
+    optionnel (un fichier JSON par entrée). Une page identique analysée avec
+    la même configuration de site ne repasse ni par le parsing ni par
+    l'extraction ; son lien de page suivante (pagination) est gardé avec ses produits.
+    """
+    
+    def __init__(self, max_entries: int = 256, disk_dir: str = '', max_disk_entries: int = 1000):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.max_disk_entries = max_disk_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0}
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            
+    @staticmethod
+    def make_key(url: str, content: bytes, site_fingerprint: str) -> str:
+        """Construit la clé d'une page (URL + hash du contenu + configuration)"""
+        body_hash = hashlib.sha256(content).hexdigest()
+        return hashlib.sha256(f"{url}\n{body_hash}\n{site_fingerprint}".encode()).hexdigest()
+        
+    def get(self, key: str) -> Optional[Tuple[List[Dict[str, str]], Optional[str]]]:
+        """Retourne (produits, lien suivant) en cache ou None"""
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.stats['hits'] += 1
+                products, next_href = self.entries[key]
+                return [dict(product) for product in products], next_href
+        
+        if self.disk_dir:
+            path = os.path.join(self.disk_dir, f"{key}.json")
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+                products, next_href = entry['products'], entry.get('next_href')
+                os.utime(path)
+                self.put(key, products, next_href, persist=False)
+                with self.lock:
+                    self.stats['disk_hits'] += 1
+                return [dict(product) for product in products], next_href
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+        
+        with self.lock:
+            self.stats['misses'] += 1
+        return None
+        
+    def put(self, key: str, products: List[Dict[str, str]], next_href: Optional[str] = None, persist: bool = True):
+        """Stocke les produits extraits d'une page et son lien suivant"""
+        with self.lock:
+            self.entries[key] = ([dict(product) for product in products], next_href)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            if persist:
+                self.stats['stores'] += 1
+        
+        if persist and self.disk_dir:
+            try:
+                atomic_write_json(os.path.join(self.disk_dir, f"{key}.json"),
+                                  {'products': products, 'next_href': next_href}, indent=None)
+                self.prune_disk()
+            except OSError:
+                pass
+                
+    def prune_disk(self):
+        """Supprime les entrées disque les moins récemment utilisées au-delà de la limite"""
+        files = [
+            os.path.join(self.disk_dir, name) for name in os.listdir(self.disk_dir)
+            if name.endswith('.json') and not name.startswith('.tmp_')
+        ]
+        if len(files) <= self.max_disk_entries:
+            return
+        files.sort(key=os.path.getmtime)
+        for path in files[:len(files) - self.max_disk_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+                
+    def summary(self) -> str:
+        """Résumé lisible des compteurs"""
+        lookups = self.stats['hits'] + self.stats['disk_hits'] + self.stats['misses']
+        hit_rate = (self.stats['hits'] + self.stats['disk_hits']) / lookups * 100 if lookups else 0.0
+        return (f"{self.stats['hits']} hit(s) mémoire, {self.stats['disk_hits']} hit(s) disque, "
+                f"{self.stats['misses']} miss ({hit_rate:.0f}% de réussite, {len(self.entries)} entrée(s))")
+
+# Caches partagés par toutes les instances du processus (un par paramétrage)
+_parse_caches = {}
+_parse_caches_lock = threading.Lock()
+
+def get_parse_cache(settings: Dict[str, Any]) -> Optional[ParsedPageCache]:
+    """Retourne le cache de parsing partagé correspondant aux paramètres (None si désactivé, le défaut)"""
+    if not settings.get('enabled', False):
+        return None
+    params = (settings.get('max_entries', 256), settings.get('disk_dir', ''), settings.get('max_disk_entries', 1000))
+    with _parse_caches_lock:
+        if params not in _parse_caches:
+            _parse_caches[params] = ParsedPageCache(*params)
+        return _parse_caches[params]
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Pool de processus de parsing (`parse_workers`)
+
+Chaque processus du pool crée un moniteur allégé à partir de la
+configuration. Il reçoit les octets bruts d'une page et la configuration du
+site, et ne renvoie que les dictionnaires produits et le lien de page
+suivante : aucun soup n'est sérialisé.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from monitor_utils import lazy_import
+from pagination import next_page_href
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+    from universal_monitor import UniversalWebMonitor
+
+# Moniteur du processus de parsing (initialisé par init_parse_worker)
+_worker_monitor = None
+
+def create_parse_pool(workers: int, monitor_class: type, config: Dict[str, Any]) -> ProcessPoolExecutor:
+    """Démarre un pool de `workers` processus de parsing pour cette configuration"""
+    return lazy_import('concurrent.futures').ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_parse_worker,
+        initargs=(monitor_class, config)
+    )
+
+def init_parse_worker(monitor_class: type, config: Dict[str, Any]):
+    """Initialise un processus du pool de parsing"""
+    global _worker_monitor
+    # Ctrl+C est géré par le processus principal, qui arrête le pool
+    signal = lazy_import('signal')
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _worker_monitor = monitor_class.lightweight(config)
+    _worker_monitor.logger.setLevel(logging.WARNING)
+
+def parse_and_search(content: bytes, website: Dict[str, Any], known_hashes: Optional[set] = None,
+                     next_selector: Optional[str] = None,
+                     monitor: Optional[UniversalWebMonitor] = None) -> Tuple[List[Dict[str, str]], Optional[str]]:
+    """Parse une page et extrait ses produits et son lien suivant (processus du pool par défaut)"""
+    soup = lazy_import('bs4').BeautifulSoup(content, 'html.parser')
+    try:
+        products = (monitor or _worker_monitor).search_products(soup, website, known_hashes)
+        return products, next_page_href(soup, next_selector)
+    finally:
+        soup.decompose()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Export des produits extraits (`advanced_settings.export`)
+
+Chargé par le moniteur seulement quand l'export est activé.
+"""
+
+import csv
+import io
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from monitor_utils import normalize_price
+
+# Colonnes des produits exportés (CSV, SQLite) ; l'ordre est celui du CSV
+EXPORT_FIELDS = ('timestamp', 'site', 'title', 'price', 'price_value', 'link', 'description', 'image')
+
+DEFAULT_EXPORT_SETTINGS = {
+    'enabled': False,
+    'format': 'jsonl',
+    'path': '',
+    'max_file_mb': 50,
+    'keep_files': 5,
+    'max_pending_batches': 1000
+}
+
+class ProductExporter:
+    """Export des produits extraits vers des fichiers JSONL/CSV tournants ou une table SQLite
+    
+    `submit` se contente de déposer le lot d'un site dans une file : un
+    thread dédié écrit et vide le lot d'un bloc, si bien que la boucle de
+    vérification n'attend jamais le disque. Les fichiers ne contiennent que
+    des lignes complètes et peuvent être lus pendant l'écriture (SQLite en WAL).
+    """
+    
+    def __init__(self, settings: Dict[str, Any], logger: logging.Logger):
+        self.settings = {**DEFAULT_EXPORT_SETTINGS, **settings}
+        self.format = self.settings['format']
+        if self.format not in ('jsonl', 'csv', 'sqlite'):
+            raise ValueError(f"Format d'export inconnu: {self.format}")
+        self.path = self.settings['path'] or os.path.join('exports', f"products.{self.format}")
+        self.logger = logger
+        self.queue = queue.Queue(maxsize=self.settings['max_pending_batches'])
+        self.stats = {'batches': 0, 'rows': 0, 'dropped': 0, 'write_seconds': 0.0}
+        self.handle = None
+        self.db = None
+        self.thread = threading.Thread(target=self.run, name='botalerte-export', daemon=True)
+        self.thread.start()
+        
+    def submit(self, site_name: str, products: List[Dict[str, str]]):
+        """Dépose les produits d'un site (sans attente ; lot abandonné si la file est pleine)"""
+        timestamp = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        try:
+            self.queue.put_nowait((timestamp, site_name, products))
+        except queue.Full:
+            self.stats['dropped'] += len(products)
+            self.logger.warning(f"⚠️ File d'export pleine, {len(products)} produit(s) de {site_name} non exportés")
+            
+    def run(self):
+        """Boucle du thread d'écriture (None arrête le thread)"""
+        while True:
+            batch = self.queue.get()
+            if batch is None:
+                break
+            timestamp, site_name, products = batch
+            rows = [
+                {
+                    'timestamp': timestamp,
+                    'site': site_name,
+                    **{field: product.get(field, '') for field in ('title', 'price', 'link', 'description', 'image')},
+                    'price_value': normalize_price(product.get('price', ''))
+                }
+                for product in products
+            ]
+            start = time.perf_counter()
+            try:
+                self.write_rows(rows)
+                self.stats['batches'] += 1
+                self.stats['rows'] += len(rows)
+            except Exception as e:
+                self.stats['dropped'] += len(rows)
+                self.logger.error(f"❌ Erreur d'export ({self.path}): {e}")
+            self.stats['write_seconds'] += time.perf_counter() - start
+        self.close_outputs()
+        
+    def write_rows(self, rows: List[Dict[str, Any]]):
+        """Écrit un lot et le vide sur disque"""
+        if self.format == 'sqlite':
+            self.write_sqlite(rows)
+            return
+        if self.format == 'csv':
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS, lineterminator='\n')
+            writer.writerows(rows)
+            text = buffer.getvalue()
+        else:
+            text = ''.join(json.dumps({field: row[field] for field in EXPORT_FIELDS}, ensure_ascii=False) + '\n'
+                           for row in rows)
+        self.open_file(len(text.encode('utf-8')))
+        self.handle.write(text)
+        self.handle.flush()
+        
+    def open_file(self, incoming_bytes: int):
+        """Ouvre le fichier courant, après rotation s'il dépasse `max_file_mb`"""
+        max_bytes = self.settings['max_file_mb'] * 1024 * 1024
+        if self.handle is not None and max_bytes and self.handle.tell() + incoming_bytes > max_bytes and self.handle.tell():
+            self.handle.close()
+            self.handle = None
+            keep = max(1, self.settings['keep_files'])
+            for index in range(keep - 1, 0, -1):
+                if os.path.exists(f"{self.path}.{index}"):
+                    os.replace(f"{self.path}.{index}", f"{self.path}.{index + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        if self.handle is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.handle = open(self.path, 'a', encoding='utf-8', newline='')
+            if self.format == 'csv' and self.handle.tell() == 0:
+                self.handle.write(','.join(EXPORT_FIELDS) + '\n')
+                
+    def write_sqlite(self, rows: List[Dict[str, Any]]):
+        """Ajoute un lot à la table `products` (une transaction par lot)"""
+        if self.db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self.db.execute('PRAGMA journal_mode=WAL')
+            self.db.execute(
+                f"CREATE TABLE IF NOT EXISTS products ({', '.join(field + (' REAL' if field == 'price_value' else ' TEXT') for field in EXPORT_FIELDS)})"
+            )
+            self.db.execute('CREATE INDEX IF NOT EXISTS products_site_time ON products (site, timestamp)')
+        with self.db:
+            self.db.executemany(
+                f"INSERT INTO products ({', '.join(EXPORT_FIELDS)}) VALUES ({', '.join('?' * len(EXPORT_FIELDS))})",
+                [tuple(row[field] for field in EXPORT_FIELDS) for row in rows]
+            )
+            
+    def close_outputs(self):
+        if self.handle is not None:
+            self.handle.close()
+            self.handle = None
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+            
+    def close(self, timeout: float = 30):
+        """Écrit les lots en attente puis arrête le thread"""
+        self.queue.put(None)
+        self.thread.join(timeout)
+        
+    def summary(self) -> str:
+        return (f"{self.stats['rows']} produit(s) en {self.stats['batches']} lot(s) vers {self.path}, "
+                f"écriture {self.stats['write_seconds'] * 1000:.0f} ms (hors boucle), {self.stats['dropped']} perdu(s)")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Cache des règles robots.txt (`advanced_settings.robots`)
+
+Le téléchargement, le respect de `Crawl-delay` et les décisions d'accès
+restent dans le moniteur ; ce module conserve et analyse les règles.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, TYPE_CHECKING
+
+from monitor_utils import atomic_write_json, lazy_import
+
+if TYPE_CHECKING:
+    from urllib.robotparser import RobotFileParser
+
+class RobotsCache:
+    """Cache des règles robots.txt par origine (schéma + hôte), avec TTL et persistance
+    
+    Les règles sont partagées par tous les sites d'une même origine et
+    conservées sur disque : un redémarrage ne refait pas les requêtes.
+    Chaque entrée garde le statut HTTP et le texte brut du fichier.
+    """
+    
+    # Taille maximale analysée d'un robots.txt (RFC 9309 : au moins 500 Kio)
+    MAX_SIZE = 512000
+    
+    def __init__(self, path: str = 'robots_cache.json'):
+        self.path = path
+        self.entries = self.load()
+        self.parsers = {}
+        self.lock = threading.Lock()
+        self.origin_locks = {}
+        
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Charge les entrées persistées (fichier absent ou illisible : cache vide)"""
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except (OSError, ValueError):
+            pass
+        return {}
+        
+    def origin_lock(self, origin: str) -> threading.Lock:
+        """Verrou par origine : un seul téléchargement de robots.txt à la fois"""
+        with self.lock:
+            return self.origin_locks.setdefault(origin, threading.Lock())
+            
+    def get_fresh(self, origin: str) -> Optional[Dict[str, Any]]:
+        """Retourne l'entrée d'une origine si elle n'a pas expiré"""
+        entry = self.entries.get(origin)
+        if entry is not None and entry['expires_at'] > time.time():
+            return entry
+        return None
+        
+    def store(self, origin: str, status: int, text: str, ttl_seconds: float):
+        """Enregistre les règles d'une origine et persiste le cache"""
+        with self.lock:
+            self.entries[origin] = {'status': status, 'text': text[:self.MAX_SIZE], 'expires_at': time.time() + ttl_seconds}
+            self.parsers.pop(origin, None)
+            try:
+                atomic_write_json(self.path, self.entries)
+            except OSError:
+                # Le cache reste utilisable en mémoire
+                pass
+            
+    def parser(self, origin: str) -> RobotFileParser:
+        """Construit (une fois) l'analyseur des règles d'une origine
+        
+        2xx : règles du fichier ; 4xx : tout est autorisé ;
+        5xx ou hôte injoignable : tout est interdit jusqu'à expiration.
+        """
+        with self.lock:
+            if origin not in self.parsers:
+                entry = self.entries[origin]
+                rules = lazy_import('urllib.robotparser').RobotFileParser(f"{origin}/robots.txt")
+                if 200 <= entry['status'] < 300:
+                    rules.parse(entry['text'].splitlines())
+                elif 400 <= entry['status'] < 500:
+                    rules.allow_all = True
+                else:
+                    rules.disallow_all = True
+                self.parsers[origin] = rules
+            return self.parsers[origin]
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Réglage automatique des sélecteurs CSS d'un site sur des pages enregistrées
+
+Chaque sélecteur candidat de la configuration est évalué sur les pages :
+nombre de correspondances, précision (produits correspondant aux termes de
+recherche pour les conteneurs, valeurs identiques à l'extraction actuelle
+pour les champs) et temps d'évaluation. Le plus petit ensemble de sélecteurs
+qui reproduit exactement les produits actuels est retenu, le plus rapide en
+premier.
+
+Usage:
+    python selector_tuner.py config.json --pages pages/*.html [--site "Nom du site"]
+    python selector_tuner.py config.json --pages pages/*.html --terms digitakt
+    python selector_tuner.py config.json --pages pages/*.html --output config_optimisee.json
+    python selector_tuner.py config.json --pages pages/*.html --write
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config_generator import ConfigValidationError, selector_cost_warnings, validate_config
+from universal_monitor import UniversalWebMonitor
+
+FIELDS = ('title', 'price', 'link', 'description')
+
+class SelectorStats:
+    """Mesures d'un sélecteur candidat"""
+
+    def __init__(self, selector: str):
+        self.selector = selector
+        self.matches = 0
+        self.agreeing = 0
+        self.seconds = 0.0
+        self.unit = ''
+        self.covered = set()
+        self.eligible = True
+        self.status = ''
+
+    @property
+    def precision(self) -> float:
+        return self.agreeing / self.matches if self.matches else 0.0
+
+def time_min(func: Callable[[], Any], rounds: int) -> float:
+    """Meilleur temps d'exécution sur plusieurs tours"""
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def field_value(element, field: str, selector: str, base_url: str) -> Optional[str]:
+    """Valeur d'un champ pour un sélecteur, None si le sélecteur ne s'applique pas
+
+    Reprend les règles de `extract_product_record` : un élément trouvé arrête
+    la chaîne même si son texte est vide, sauf pour un lien sans href.
+    """
+    found = element.select_one(selector)
+    if field == 'link':
+        return urljoin(base_url, found['href']) if found and found.get('href') else None
+    if not found:
+        return None
+    text = found.get_text().strip()
+    return text[:200] if field == 'description' else text
+
+def chain_value(element, field: str, selectors: List[str], base_url: str) -> Optional[str]:
+    """Valeur d'un champ pour une chaîne de sélecteurs (le premier qui s'applique)"""
+    for selector in selectors:
+        value = field_value(element, field, selector, base_url)
+        if value is not None:
+            return value
+    return None
+
+def greedy_cover(candidates: List[SelectorStats], universe: set) -> Optional[List[SelectorStats]]:
+    """Plus petit ensemble de candidats couvrant l'univers (glouton), None si impossible"""
+    chosen = []
+    uncovered = set(universe)
+    pool = [stats for stats in candidates if stats.eligible and stats.covered]
+    while uncovered:
+        # À couverture égale, un sélecteur signalé coûteux par la validation passe après
+        best = max(pool, key=lambda stats: (len(stats.covered & uncovered), not selector_cost_warnings(stats.selector),
+                                            -stats.seconds), default=None)
+        if best is None or not best.covered & uncovered:
+            return None
+        chosen.append(best)
+        uncovered -= best.covered
+        pool.remove(best)
+    return sorted(chosen, key=lambda stats: stats.seconds)
+
+class SelectorTuner:
+    """Évalue et réduit les sélecteurs d'un site sur un ensemble de pages"""
+
+    def __init__(self, config: Dict[str, Any], website: Dict[str, Any], pages: List[bytes], rounds: int = 5):
+        self.monitor = UniversalWebMonitor.lightweight(config)
+        self.website = website
+        self.rounds = rounds
+        self.soups = [BeautifulSoup(content, 'html.parser') for content in pages]
+        self.search_terms = self.monitor.get_search_terms(website)
+        self.exclude_terms = self.monitor.get_exclude_terms()
+        self.matcher = self.monitor.get_title_matcher(self.search_terms, self.exclude_terms)
+        self.report = {}
+
+    def accept_title(self, title: str) -> bool:
+        return self.monitor.title_matches(title, self.search_terms, self.exclude_terms, self.matcher)
+
+    def extract(self, selectors: Dict[str, List[str]], containers_only: bool = False) -> List[List[Dict[str, str]]]:
+        """Produits extraits de chaque page avec un jeu de sélecteurs (pipeline du moniteur)"""
+        pages = []
+        for soup in self.soups:
+            if containers_only:
+                elements = self.monitor.select_product_containers(soup, selectors['product_containers'])
+            else:
+                elements = self.monitor.iter_product_elements(soup, selectors, self.search_terms, self.matcher)
+            products = []
+            for element in elements:
+                record = self.monitor.extract_product_record(element, selectors, self.website['url'], self.accept_title)
+                if record is not None:
+                    products.append(record.as_dict())
+            pages.append(products)
+        return pages
+
+    def tune_containers(self, selectors: Dict[str, List[str]], reference: List[List[Dict[str, str]]]) -> List[str]:
+        """Conteneurs retenus : ceux qui retrouvent les produits de référence sans en ajouter"""
+        universe = {(page, json.dumps(product, sort_keys=True)) for page, products in enumerate(reference) for product in products}
+        candidates = []
+        for selector in selectors['product_containers']:
+            stats = SelectorStats(selector)
+            try:
+                stats.matches = sum(len(soup.select(selector)) for soup in self.soups)
+            except Exception:
+                stats.eligible = False
+                stats.status = '❌ invalide'
+                candidates.append(stats)
+                continue
+            stats.seconds = time_min(lambda: [soup.select(selector) for soup in self.soups], self.rounds)
+            stats.unit = f"{stats.seconds * 1000 / len(self.soups):8.2f} ms/page"
+            found = self.extract(dict(selectors, product_containers=[selector]), containers_only=True)
+            keys = {(page, json.dumps(product, sort_keys=True)) for page, products in enumerate(found) for product in products}
+            stats.agreeing = sum(len(products) for products in found)
+            stats.covered = keys & universe
+            if keys - universe:
+                stats.eligible = False
+                stats.status = '❌ produits en trop'
+            candidates.append(stats)
+
+        chosen = greedy_cover(candidates, universe) if universe else None
+        return self.finish('product_containers', candidates, chosen, selectors['product_containers'])
+
+    def tune_field(self, field: str, selectors: Dict[str, List[str]], elements: List[Any]) -> List[str]:
+        """Sélecteurs retenus pour un champ : valeurs identiques à la chaîne actuelle"""
+        chain = selectors.get(field, [])
+        base_url = self.website['url']
+        reference = [chain_value(element, field, chain, base_url) for element in elements]
+        universe = {index for index, value in enumerate(reference) if value is not None}
+        candidates = []
+        for selector in chain:
+            stats = SelectorStats(selector)
+            try:
+                values = [field_value(element, field, selector, base_url) for element in elements]
+            except Exception:
+                stats.eligible = False
+                stats.status = '❌ invalide'
+                candidates.append(stats)
+                continue
+            stats.seconds = time_min(lambda: [element.select_one(selector) for element in elements], self.rounds)
+            stats.unit = f"{stats.seconds * 1e6 / max(1, len(elements)):8.1f} µs/élément"
+            for index, value in enumerate(values):
+                if value is None:
+                    continue
+                stats.matches += 1
+                if value == reference[index]:
+                    stats.agreeing += 1
+                    stats.covered.add(index)
+            if stats.agreeing < stats.matches:
+                stats.eligible = False
+                stats.status = '❌ valeurs différentes'
+            candidates.append(stats)
+
+        chosen = greedy_cover(candidates, universe) if universe else None
+        return self.finish(field, candidates, chosen, chain)
+
+    def finish(self, key: str, candidates: List[SelectorStats], chosen: Optional[List[SelectorStats]],
+               original: List[str]) -> List[str]:
+        """Enregistre le rapport d'une clé et retourne la liste retenue (inchangée si irréductible)"""
+        if chosen is None:
+            for stats in candidates:
+                stats.status = stats.status or ('∅ aucune correspondance' if not stats.matches else '➖ conservé')
+            self.report[key] = (candidates, False)
+            return list(original)
+        for stats in candidates:
+            if stats in chosen:
+                stats.status = f'✅ retenu ({chosen.index(stats) + 1})'
+            elif not stats.status:
+                stats.status = '∅ aucune correspondance' if not stats.matches else '➖ redondant'
+        self.report[key] = (candidates, True)
+        return [stats.selector for stats in chosen]
+
+    def tune(self) -> Tuple[Dict[str, List[str]], bool]:
+        """Calcule les sélecteurs réduits, retourne (sélecteurs, identiques à la référence)"""
+        selectors = self.website['selectors']
+        reference = self.extract(selectors)
+
+        tuned = dict(selectors)
+        tuned['product_containers'] = self.tune_containers(selectors, reference)
+
+        # Le titre est évalué sur tous les conteneurs (il décide du filtrage),
+        # les autres champs sur les conteneurs retenus
+        containers = [element for soup in self.soups
+                      for element in self.monitor.select_product_containers(soup, selectors['product_containers'])]
+        accepted = [element for element in containers
+                    if self.monitor.extract_product_record(element, selectors, self.website['url'], self.accept_title)]
+        for field in FIELDS:
+            if field in selectors:
+                tuned[field] = self.tune_field(field, selectors, containers if field == 'title' else accepted)
+
+        if self.extract(tuned) != reference:
+            # Cas limite (conteneurs imbriqués réduits différemment) : aucun changement
+            return dict(selectors), False
+        self.reference = reference
+        return tuned, True
+
+    def page_seconds(self, selectors: Dict[str, List[str]]) -> float:
+        """Temps d'extraction de toutes les pages (hors parsing HTML)"""
+        return time_min(lambda: self.extract(selectors), self.rounds)
+
+    def print_report(self):
+        """Affiche les mesures de chaque sélecteur"""
+        for key, (candidates, reduced) in self.report.items():
+            suffix = '' if reduced else ' (inchangé)'
+            print(f"\n🎯 {key}{suffix}")
+            for stats in candidates:
+                print(f"   {stats.status:24} {stats.selector!r:28} {stats.matches:6} corr.  "
+                      f"précision {stats.precision:6.1%}  {stats.unit}")
+
+def load_pages(paths: List[str]) -> List[bytes]:
+    """Lit les pages HTML enregistrées"""
+    pages = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            pages.append(f.read())
+    return pages
+
+def find_website(config: Dict[str, Any], name: Optional[str]) -> Optional[int]:
+    """Index du site à régler (seul site HTML activé si aucun nom n'est donné)"""
+    html_sites = [index for index, site in enumerate(config['websites'])
+                  if site.get('enabled', True) and site.get('extraction_mode', 'html') == 'html']
+    if name:
+        matching = [index for index, site in enumerate(config['websites']) if site['name'] == name]
+        return matching[0] if matching else None
+    return html_sites[0] if len(html_sites) == 1 else None
+
+def main():
+    parser = argparse.ArgumentParser(description="Réglage des sélecteurs CSS sur des pages enregistrées")
+    parser.add_argument('config_file', help="Fichier de configuration JSON")
+    parser.add_argument('--pages', nargs='+', required=True, help="Pages HTML enregistrées du site")
+    parser.add_argument('--site', help="Nom du site à régler (obligatoire si plusieurs sites HTML)")
+    parser.add_argument('--terms', nargs='+', help="Termes de recherche des pages enregistrées (défaut: ceux du site)")
+    parser.add_argument('--rounds', type=int, default=5, help="Tours de mesure par sélecteur")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument('--write', action='store_true', help="Réécrit la configuration (copie .bak conservée)")
+    output.add_argument('--output', help="Écrit la configuration réglée dans un autre fichier")
+    args = parser.parse_args()
+
+    with open(args.config_file, 'r', encoding='utf-8') as f:
+        raw_config = json.load(f)
+    try:
+        config, _ = validate_config(raw_config)
+    except ConfigValidationError as e:
+        for error in e.errors:
+            print(f"❌ {error}")
+        sys.exit(1)
+
+    index = find_website(config, args.site)
+    if index is None:
+        print("❌ Site introuvable : précisez --site avec le nom d'un site HTML de la configuration")
+        sys.exit(1)
+    website = config['websites'][index]
+    if args.terms:
+        website = dict(website, normalized_search_terms=[term.lower() for term in args.terms])
+
+    print(f"🔧 Réglage des sélecteurs de {website['name']} sur {len(args.pages)} page(s)")
+    tuner = SelectorTuner(config, website, load_pages(args.pages), args.rounds)
+    tuned, identical = tuner.tune()
+    tuner.print_report()
+
+    if not identical:
+        print("\n⚠️ L'ensemble réduit ne reproduit pas les produits actuels, sélecteurs inchangés")
+        sys.exit(1)
+
+    before = tuner.page_seconds(website['selectors'])
+    after = tuner.page_seconds(tuned)
+    total_before = sum(len(website['selectors'].get(key, [])) for key in tuned)
+    total_after = sum(len(tuned[key]) for key in tuned)
+    print(f"\n📊 {sum(len(products) for products in tuner.reference)} produit(s) identique(s), "
+          f"{total_before} → {total_after} sélecteur(s)")
+    print(f"⏱️ Extraction: {before * 1000:.1f} ms → {after * 1000:.1f} ms ({before / max(after, 1e-9):.1f}x)")
+
+    if not args.write and not args.output:
+        print("\n💡 Ajoutez --write ou --output FICHIER pour enregistrer les sélecteurs réglés")
+        return
+
+    raw_config['websites'][index]['selectors'] = tuned
+    target = args.output or args.config_file
+    if args.write:
+        shutil.copyfile(args.config_file, f"{args.config_file}.bak")
+    with open(target, 'w', encoding='utf-8') as f:
+        json.dump(raw_config, f, indent=2, ensure_ascii=False)
+    print(f"💾 Configuration réglée enregistrée dans {target}")
+
+if __name__ == "__main__":
+    main()
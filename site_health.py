@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Santé des sites et planification adaptative (`advanced_settings.adaptive_schedule`)
+
+Les statistiques ne sont enregistrées que lorsque la planification
+adaptative est activée ; elles fixent alors l'échéance de chaque site.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from monitor_utils import atomic_write_json
+
+DEFAULT_ADAPTIVE_SETTINGS = {
+    'enabled': False,
+    'min_interval_hours': 0.25,
+    'max_interval_hours': 24,
+    'tick_minutes': 5,
+    'failure_backoff': 2,
+    'stats_file': 'site_stats.json'
+}
+
+class SiteHealthTracker:
+    """Statistiques de santé par site et intervalle de vérification adaptatif
+    
+    Pour chaque site : taux de succès, latence moyenne (moyenne mobile),
+    intervalle moyen entre deux nouveautés et date du dernier nouveau produit.
+    L'intervalle suivant en découle, borné par `min_interval_hours` et
+    `max_interval_hours` :
+    
+    - échecs consécutifs : intervalle de base × `failure_backoff` ** échecs ;
+    - site qui change : la moitié de l'intervalle moyen entre deux nouveautés ;
+    - site inactif : la moitié du temps écoulé depuis la dernière nouveauté.
+    """
+    
+    # Poids des nouvelles mesures dans les moyennes mobiles
+    SMOOTHING = 0.3
+    
+    def __init__(self, settings: Dict[str, Any], base_interval_hours: float):
+        self.settings = settings
+        self.base_interval_hours = base_interval_hours
+        self.path = settings['stats_file']
+        self.stats = self.load()
+        self.lock = threading.Lock()
+        
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Charge les statistiques persistées (fichier absent ou illisible : aucune)"""
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except (OSError, ValueError):
+            pass
+        return {}
+        
+    def save(self):
+        """Sauvegarde atomiquement les statistiques"""
+        with self.lock:
+            atomic_write_json(self.path, self.stats)
+            
+    def smooth(self, previous: Optional[float], value: float) -> float:
+        """Moyenne mobile exponentielle"""
+        if previous is None:
+            return value
+        return previous + self.SMOOTHING * (value - previous)
+        
+    def record(self, site_key: str, success: bool, seconds: Optional[float], new_products: int,
+               error: Optional[str] = None, now: Optional[float] = None) -> Dict[str, Any]:
+        """Enregistre le résultat d'une vérification et planifie la suivante"""
+        now = time.time() if now is None else now
+        with self.lock:
+            entry = self.stats.setdefault(site_key, {
+                'checks': 0, 'successes': 0, 'consecutive_failures': 0,
+                'first_check': now, 'latency_ms': None, 'last_new_product': None,
+                'change_interval_hours': None, 'new_product_checks': 0
+            })
+            entry['checks'] += 1
+            entry['last_check'] = now
+            if seconds is not None:
+                entry['last_latency_ms'] = round(seconds * 1000, 1)
+                entry['latency_ms'] = round(self.smooth(entry['latency_ms'], seconds * 1000), 1)
+            if success:
+                entry['successes'] += 1
+                entry['consecutive_failures'] = 0
+            else:
+                entry['consecutive_failures'] += 1
+                entry['last_error'] = error or 'page non récupérée'
+                entry['last_error_at'] = now
+            if new_products:
+                if entry['last_new_product'] is not None:
+                    hours = (now - entry['last_new_product']) / 3600
+                    entry['change_interval_hours'] = round(self.smooth(entry['change_interval_hours'], hours), 3)
+                entry['last_new_product'] = now
+                entry['new_product_checks'] += 1
+            entry['interval_hours'] = round(self.next_interval_hours(entry, now), 3)
+            entry['next_due'] = now + entry['interval_hours'] * 3600
+            return entry
+            
+    def next_interval_hours(self, entry: Dict[str, Any], now: float) -> float:
+        """Intervalle jusqu'à la prochaine vérification d'un site"""
+        if entry['consecutive_failures']:
+            interval = self.base_interval_hours * self.settings['failure_backoff'] ** entry['consecutive_failures']
+        else:
+            interval = self.base_interval_hours
+            if entry['change_interval_hours'] is not None:
+                interval = entry['change_interval_hours'] / 2
+            # Sans nouveauté depuis longtemps, l'intervalle s'allonge avec l'inactivité
+            idle_hours = (now - (entry['last_new_product'] or entry['first_check'])) / 3600
+            interval = max(interval, idle_hours / 2)
+        return min(max(interval, self.settings['min_interval_hours']), self.settings['max_interval_hours'])
+        
+    def snapshot(self, site_key: str) -> Optional[Dict[str, Any]]:
+        """Copie des statistiques d'un site (lecture depuis un autre thread)"""
+        with self.lock:
+            entry = self.stats.get(site_key)
+            return dict(entry) if entry is not None else None
+            
+    def is_due(self, site_key: str, now: Optional[float] = None) -> bool:
+        """Un site jamais vérifié est toujours à échéance"""
+        entry = self.stats.get(site_key)
+        return entry is None or entry.get('next_due', 0) <= (time.time() if now is None else now)
+        
+    def describe(self, entry: Dict[str, Any], now: Optional[float] = None) -> str:
+        """Résumé lisible de la santé d'un site"""
+        now = time.time() if now is None else now
+        parts = [f"{100 * entry['successes'] / max(1, entry['checks']):.0f}% de succès sur {entry['checks']}"]
+        if entry['latency_ms'] is not None:
+            parts.append(f"{entry['latency_ms']:.0f} ms")
+        if entry['change_interval_hours'] is not None:
+            parts.append(f"nouveautés toutes les ~{entry['change_interval_hours']:.1f}h")
+        if entry['last_new_product'] is not None:
+            parts.append(f"dernière nouveauté il y a {(now - entry['last_new_product']) / 3600:.1f}h")
+        else:
+            parts.append("aucune nouveauté")
+        parts.append(f"prochaine vérification dans {max(0, entry.get('next_due', now) - now) / 3600:.1f}h")
+        return ', '.join(parts)
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Arrêt coopératif sur SIGTERM, SIGHUP et SIGINT
+
+Le gestionnaire ne fait que demander l'arrêt au moniteur : les vérifications
+en cours se terminent, puis les ressources sont libérées
+(UniversalWebMonitor.request_shutdown). Un second signal force l'arrêt, sauf
+dans le processus d'un cycle isolé, que son parent surveille.
+"""
+
+from __future__ import annotations
+
+import signal
+import threading
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from universal_monitor import UniversalWebMonitor
+
+STOP_SIGNALS = ('SIGTERM', 'SIGHUP', 'SIGINT')
+
+class StopSignalHandler:
+    """Traduit les signaux d'arrêt en demandes d'arrêt du moniteur"""
+
+    def __init__(self, monitor: UniversalWebMonitor, force_on_repeat: bool = True):
+        self.monitor = monitor
+        self.force_on_repeat = force_on_repeat
+
+    def install(self) -> bool:
+        """Installe le gestionnaire (thread principal uniquement, sinon ne fait rien)
+
+        Sans `force_on_repeat`, SIGINT est ignoré : le processus d'un cycle
+        isolé reçoit le Ctrl+C du terminal en même temps que son parent.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return False
+        for name in STOP_SIGNALS:
+            if hasattr(signal, name):
+                signal.signal(getattr(signal, name), self)
+        if not self.force_on_repeat:
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+        return True
+
+    def __call__(self, signum, frame):
+        name = signal.Signals(signum).name
+        if not self.monitor.stop_event.is_set():
+            self.monitor.request_shutdown(f"signal {name}")
+        elif self.force_on_repeat:
+            self.monitor.logger.warning(f"🛑 {name} reçu à nouveau, arrêt immédiat")
+            self.monitor.force_shutdown()
@@ -6,9 +6,17 @@ Script de test pour le bot de surveillance universel
 import sys
 import os
 import json
+import tempfile
+import time
+from contextlib import contextmanager
+import requests
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from universal_monitor import UniversalWebMonitor
+from parse_cache import ParsedPageCache, get_parse_cache
+from work_queue import WorkQueue
+from config_generator import ConfigValidationError, validate_config
+from bs4 import BeautifulSoup
 import logging
 
 # Configuration du logging pour les tests
@@ -27,7 +35,10 @@ def test_config_loading(config_file: str = 'config.json'):
         with open(config_file, 'r', encoding='utf-8') as f:
             config = json.load(f)
         
+        config, warnings = validate_config(config)
         print("✅ Configuration chargée avec succès")
+        for warning in warnings:
+            print(f"   ⚠️ {warning}")
         print(f"   Nom: {config.get('monitor_name', 'Sans nom')}")
         print(f"   Sites activés: {len([s for s in config['websites'] if s.get('enabled', True)])}")
         print(f"   Total sites: {len(config['websites'])}")
@@ -43,6 +54,10 @@ def test_config_loading(config_file: str = 'config.json'):
     except json.JSONDecodeError as e:
         print(f"❌ Erreur de format JSON: {e}")
         return False
+    except ConfigValidationError as e:
+        for error in e.errors:
+            print(f"❌ {error}")
+        return False
     except Exception as e:
         print(f"❌ Erreur lors du chargement: {e}")
         return False
@@ -89,12 +104,11 @@ def test_search_functionality(config_file: str = 'config.json'):
             print(f"\n🎯 Test de recherche sur {site['name']}...")
             print(f"   Termes: {', '.join(site['search_terms'])}")
             
-            soup = monitor.fetch_page(site)
-            if not soup:
+            products = monitor.collect_site_products(site)
+            if products is None:
                 print("   ⚠️ Site inaccessible, test ignoré")
                 continue
             
-            products = monitor.search_products(soup, site)
             print(f"   📦 Produits trouvés: {len(products)}")
             
             if products:
@@ -107,6 +121,7 @@ def test_search_functionality(config_file: str = 'config.json'):
                     if product.get('link'):
                         print(f"      🔗 Lien: {product['link'][:60]}...")
         
+        print_parse_cache_stats(monitor)
         return True
         
     except Exception as e:
@@ -180,6 +195,363 @@ def test_file_permissions():
         print(f"❌ Erreur de permissions: {e}")
         return False
 
+def offline_website(**overrides):
+    """Site de test (aucune requête réseau) complété par les défauts de la configuration"""
+    website = {
+        'name': 'Boutique test',
+        'url': 'https://shop.test/search',
+        'search_terms': ['digitakt'],
+        'selectors': {
+            'product_containers': ['.product-grid', '.product-card'],
+            'title': ['h3'],
+            'price': ['.price'],
+            'link': ['a'],
+            'description': ['p']
+        }
+    }
+    website.update(overrides)
+    return website
+
+def offline_monitor(**website_overrides):
+    """Moniteur minimal sur une configuration validée, sans fichier ni session HTTP"""
+    config, _ = validate_config({'websites': [offline_website(**website_overrides)]})
+    return UniversalWebMonitor.lightweight(config)
+
+# Grilles dont chaque carte est un produit : classes différentes, lien porté par data-href
+CONTAINER_FIXTURES = {
+    'classes différentes': """
+        <div class="product-grid">
+          <div class="product-card featured"><h3>Digitakt A</h3><a href="/a">Voir</a></div>
+          <div class="product-card"><h3>Digitakt B</h3><a href="/b">Voir</a></div>
+        </div>""",
+    'lien data-href': """
+        <div class="product-grid">
+          <div class="product-card" data-href="/a"><h3>Digitakt A</h3></div>
+          <div class="product-card" data-href="/b"><h3>Digitakt B</h3></div>
+        </div>""",
+}
+
+def test_container_dedup():
+    """Test la réduction des conteneurs imbriqués (aucun produit perdu ni doublé)"""
+    print(f"\n🧩 Test du dédoublonnage des conteneurs")
+    monitor = offline_monitor()
+    website = monitor.config['websites'][0]
+    for name, html in CONTAINER_FIXTURES.items():
+        products = monitor.search_products(BeautifulSoup(html, 'html.parser'), website)
+        titles = [product['title'] for product in products]
+        assert titles == ['Digitakt A', 'Digitakt B'], f"{name}: {titles}"
+        print(f"✅ {name}: {titles}")
+    
+    # Fragment sans lien dans une carte : la carte reste le produit
+    html = '<div class="product-card"><h3>Digitakt A</h3><span class="product-card-badge">-10%</span><a href="/a">Voir</a></div>'
+    website = dict(website, selectors=dict(website['selectors'], product_containers=['.product-card', '.product-card-badge']))
+    products = monitor.search_products(BeautifulSoup(html, 'html.parser'), website)
+    assert [product['link'] for product in products] == ['https://shop.test/a'], products
+    print("✅ Fragment imbriqué ignoré")
+    
+    # Sélection paresseuse : la liste est reconnue dès sa deuxième carte, les
+    # cartes retirées ensuite de la page ne sont jamais évaluées
+    html = '<div class="product-grid">' + ''.join(
+        f'<div class="product-card"><h3>Digitakt {name}</h3><a href="/{name}">Voir</a></div>' for name in 'ABCD') + '</div>'
+    soup = BeautifulSoup(html, 'html.parser')
+    containers = monitor.select_product_containers(soup, ['.product-grid', '.product-card'])
+    first = next(containers)
+    for card in soup.select('.product-card')[2:]:
+        card.extract()
+    rest = [element.h3.get_text() for element in containers]
+    assert first.h3.get_text() == 'Digitakt A' and rest == ['Digitakt B'], rest
+    print("✅ Conteneurs produits au fil du document")
+    return True
+
+@contextmanager
+def offline_cycle_monitor(website, advanced_settings=None, **monitoring_settings):
+    """Moniteur complet dans un dossier temporaire, alertes email enregistrées au lieu d'être envoyées
+    
+    `website` peut être une liste de sites ; `restart_monitor` recrée ensuite
+    le moniteur dans le même dossier (redémarrage du bot).
+    """
+    previous_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            with open('config.json', 'w', encoding='utf-8') as f:
+                json.dump({'websites': website if isinstance(website, list) else [website],
+                           'monitoring_settings': monitoring_settings,
+                           'advanced_settings': advanced_settings or {}}, f)
+            yield restart_monitor()
+        finally:
+            os.chdir(previous_dir)
+
+def restart_monitor() -> UniversalWebMonitor:
+    """Nouveau moniteur sur la configuration du dossier courant, alertes enregistrées"""
+    monitor = UniversalWebMonitor('config.json')
+    monitor.sent_alerts = []
+    monitor.send_email_alert = lambda products_by_site: monitor.sent_alerts.append(products_by_site) or True
+    return monitor
+
+def alerted_titles(monitor: UniversalWebMonitor):
+    """Titres de la dernière alerte (liste vide si le cycle n'a rien signalé)"""
+    if not monitor.sent_alerts:
+        return []
+    titles = [product['title'] for products in monitor.sent_alerts.pop().values() for product in products]
+    assert not monitor.sent_alerts, "une seule alerte attendue par cycle"
+    return titles
+
+class FixtureResponse:
+    """Réponse HTTP minimale servie depuis une fixture"""
+    
+    def __init__(self, content: str, status_code: int = 200, url: str = ''):
+        self.content = content.encode('utf-8')
+        self.status_code = status_code
+        self.headers = {}
+        self.url = url
+    
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} pour {self.url}", response=self)
+
+def serve_fixture_pages(monitor: UniversalWebMonitor, pages):
+    """Remplace la session HTTP par des pages en mémoire (404 ailleurs) et retourne les URL demandées"""
+    requested = []
+    
+    def get(url, **kwargs):
+        requested.append(url)
+        return FixtureResponse(pages[url], url=url) if url in pages else FixtureResponse('', 404, url)
+    monitor.session.get = get
+    return requested
+
+class ErrorCounter(logging.Handler):
+    """Compte les messages de niveau ERROR et plus"""
+    
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.count = 0
+    
+    def emit(self, record):
+        self.count += 1
+
+RSS_FIXTURE = """<?xml version="1.0"?>
+<rss version="2.0"><channel>
+  <item><guid>1</guid><title>Digitakt A</title><link>https://shop.test/a</link></item>
+  <item><guid>2</guid><title>Digitakt B</title><link>https://shop.test/b</link></item>
+  <item><guid>3</guid><title>Digitakt C</title><link>https://shop.test/c</link></item>
+</channel></rss>"""
+
+def test_alert_deferral():
+    """Test le report au-delà de max_products_per_alert sur plusieurs cycles"""
+    print(f"\n⏭️ Test du report des produits au-delà de la limite d'alerte")
+    
+    # Page HTML : un produit par cycle, aucun perdu
+    html = ''.join(f'<div class="product-card"><h3>Digitakt {name}</h3><a href="/{name}">Voir</a></div>' for name in 'ABC')
+    with offline_cycle_monitor(offline_website(), max_products_per_alert=1) as monitor:
+        serve_fixture_pages(monitor, {monitor.config['websites'][0]['url']: html})
+        cycles = []
+        for _ in range(4):
+            monitor.check_all_websites()
+            cycles.append(alerted_titles(monitor))
+    assert cycles == [['Digitakt A'], ['Digitakt B'], ['Digitakt C'], []], cycles
+    print(f"✅ HTML: {cycles}")
+    
+    # Flux RSS à curseur : les entrées ne sont lues qu'une fois, toutes signalées
+    with offline_cycle_monitor(offline_website(extraction_mode='feed'), max_products_per_alert=1) as monitor:
+        monitor.fetch_response = lambda url, website, extra_headers=None: FixtureResponse(RSS_FIXTURE)
+        cycles = []
+        for _ in range(2):
+            monitor.check_all_websites()
+            cycles.append(alerted_titles(monitor))
+    assert cycles == [['Digitakt A', 'Digitakt B', 'Digitakt C'], []], cycles
+    print(f"✅ Flux: {cycles}")
+    return True
+
+def listing_page(names, next_href=None):
+    """Page de résultats de test : une carte par nom, lien suivant optionnel"""
+    cards = ''.join(f'<div class="product-card"><h3>Digitakt {name}</h3><a href="/{name}">Voir</a></div>' for name in names)
+    link = f'<a rel="next" href="{next_href}">Suivant</a>' if next_href else ''
+    return f'<div class="product-grid">{cards}</div>{link}'
+
+def test_pagination():
+    """Test les conditions d'arrêt de la pagination et le chemin de parsing commun"""
+    print(f"\n📚 Test de la pagination")
+    base = 'https://shop.test/search'
+    template = offline_website(pagination={'url_template': base + '?page={page}', 'max_pages': 10, 'max_parallel': 2})
+    pages = {base: listing_page('AB'), f'{base}?page=2': listing_page('CD'), f'{base}?page=3': listing_page('E')}
+    errors = ErrorCounter()
+    logging.getLogger('universal_monitor').addHandler(errors)
+    try:
+        # Un 404 après la dernière page termine la liste, sans erreur ni nouvelle tentative
+        with offline_cycle_monitor(template) as monitor:
+            requested = serve_fixture_pages(monitor, pages)
+            website = monitor.config['websites'][0]
+            titles = [product['title'] for product in monitor.collect_site_products(website)]
+            assert titles == [f'Digitakt {name}' for name in 'ABCDE'], titles
+            assert errors.count == 0, f"{errors.count} erreur(s) journalisée(s)"
+            assert requested.count(f'{base}?page=4') == 1, requested
+            print(f"✅ Fin de liste sur 404: {len(titles)} produits, aucune erreur")
+            
+            # Page 1 déjà connue : arrêt du parcours
+            monitor.detected_products[monitor.get_site_key(website)] = [
+                monitor.generate_product_hash(product) for product in monitor.collect_site_products(website)]
+            requested.clear()
+            monitor.collect_site_products(website)
+            assert requested == [base], requested
+            print("✅ Arrêt sur page déjà connue")
+        
+        # Sans avoid_duplicates, les produits connus n'arrêtent pas le parcours
+        with offline_cycle_monitor(template, avoid_duplicates=False) as monitor:
+            requested = serve_fixture_pages(monitor, pages)
+            website = monitor.config['websites'][0]
+            monitor.detected_products[monitor.get_site_key(website)] = [
+                monitor.generate_product_hash(product) for product in monitor.collect_site_products(website)]
+            requested.clear()
+            assert len(monitor.collect_site_products(website)) == 5 and len(requested) > 1, requested
+            print("✅ avoid_duplicates désactivé: parcours complet")
+        
+        # Lien suivant : la première page passe par le cache comme les suivantes
+        linked = offline_website(pagination={'next_selector': 'a[rel=next]', 'max_pages': 5})
+        pages = {base: listing_page('AB', '/search?p=2'), f'{base}?p=2': listing_page('C')}
+        parse_cache = {'parse_cache': {'enabled': True, 'max_entries': 7}}
+        with offline_cycle_monitor(linked, parse_cache, avoid_duplicates=False) as monitor:
+            serve_fixture_pages(monitor, pages)
+            website = monitor.config['websites'][0]
+            cache = get_parse_cache(parse_cache['parse_cache'])
+            first = [product['title'] for product in monitor.collect_site_products(website)]
+            hits = cache.stats['hits']
+            second = [product['title'] for product in monitor.collect_site_products(website)]
+            assert first == second == ['Digitakt A', 'Digitakt B', 'Digitakt C'], (first, second)
+            assert cache.stats['hits'] - hits == 2, cache.stats
+            print("✅ Lien suivant: pages 1 et 2 reprises du cache")
+        assert errors.count == 0, f"{errors.count} erreur(s) journalisée(s)"
+    finally:
+        logging.getLogger('universal_monitor').removeHandler(errors)
+    return True
+
+def test_parse_cache():
+    """Test le cache de parsing : clé, copies, éviction LRU et niveau disque"""
+    print(f"\n♻️ Test du cache de parsing")
+    products = [{'title': 'Digitakt A', 'price': '100 €', 'link': 'https://shop.test/a', 'description': '', 'image': ''}]
+    key = ParsedPageCache.make_key('https://shop.test/search', b'<html>A</html>', 'site')
+    assert key != ParsedPageCache.make_key('https://shop.test/search', b'<html>B</html>', 'site')
+    assert key != ParsedPageCache.make_key('https://shop.test/search', b'<html>A</html>', 'autre site')
+    
+    with tempfile.TemporaryDirectory() as disk_dir:
+        cache = ParsedPageCache(max_entries=2, disk_dir=disk_dir)
+        cache.put(key, products, '/search?page=2')
+        cached, next_href = cache.get(key)
+        cached[0]['title'] = 'modifié'
+        assert cache.get(key) == (products, '/search?page=2'), "le cache doit renvoyer des copies"
+        
+        # Au-delà de max_entries, la page la moins récemment lue quitte la mémoire
+        cache.put('b', products)
+        cache.get(key)
+        cache.put('c', products)
+        assert list(cache.entries) == [key, 'c'], list(cache.entries)
+        assert cache.get('b') == (products, None) and cache.stats['disk_hits'] == 1, cache.stats
+        print(f"✅ Mémoire LRU: {cache.summary()}")
+        
+        # Un nouveau processus relit les pages depuis le disque
+        restarted = ParsedPageCache(max_entries=2, disk_dir=disk_dir)
+        assert restarted.get(key) == (products, '/search?page=2') and restarted.stats['disk_hits'] == 1
+        assert restarted.get('inconnue') is None and restarted.stats['misses'] == 1
+        print(f"✅ Disque: {restarted.summary()}")
+    
+    # Moniteur : une page identique est reprise, un changement de contenu la reparse
+    settings = {'parse_cache': {'enabled': True, 'max_entries': 5}}
+    with offline_cycle_monitor(offline_website(), settings, avoid_duplicates=False) as monitor:
+        website = monitor.config['websites'][0]
+        cache = get_parse_cache(settings['parse_cache'])
+        serve_fixture_pages(monitor, {website['url']: listing_page('AB')})
+        monitor.collect_site_products(website)
+        monitor.collect_site_products(website)
+        serve_fixture_pages(monitor, {website['url']: listing_page('ABC')})
+        titles = [product['title'] for product in monitor.collect_site_products(website)]
+        assert titles == ['Digitakt A', 'Digitakt B', 'Digitakt C'], titles
+        assert (cache.stats['hits'], cache.stats['misses']) == (1, 2), cache.stats
+        print("✅ Moniteur: page inchangée reprise, page modifiée reparsée")
+    return True
+
+def test_checkpoint_resume():
+    """Test la reprise d'un cycle interrompu depuis le point de reprise"""
+    print(f"\n🔁 Test de la reprise de cycle")
+    sites = [offline_website(name=f'Boutique {name}', url=f'https://{name.lower()}.test/search') for name in 'ABC']
+    pages = {site['url']: listing_page(site['name'][-1]) for site in sites}
+    with offline_cycle_monitor(sites, {'min_delay_between_sites': 0}) as monitor:
+        requested = serve_fixture_pages(monitor, pages)
+        fixture_get = monitor.session.get
+        
+        def interrupted_get(url, **kwargs):
+            # Arrêt demandé pendant la requête du site B
+            if url == sites[1]['url']:
+                monitor.stop_event.set()
+                raise requests.ConnectionError("arrêt")
+            return fixture_get(url, **kwargs)
+        monitor.session.get = interrupted_get
+        monitor.check_all_websites()
+        assert alerted_titles(monitor) == [], "aucune alerte avant la fin du cycle"
+        with open('run_checkpoint.json', 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+        assert checkpoint['pending'] == [monitor.get_site_key(site) for site in sites[1:]], checkpoint['pending']
+        assert not [name for name in os.listdir('.') if name.startswith('.tmp_')], "fichier temporaire restant"
+        print(f"✅ Interruption: {len(checkpoint['pending'])} site(s) en attente")
+        
+        # Redémarrage : seuls B et C sont vérifiés, l'alerte regroupe tout le cycle
+        monitor = restart_monitor()
+        requested = serve_fixture_pages(monitor, pages)
+        monitor.check_all_websites()
+        assert requested == [site['url'] for site in sites[1:]], requested
+        assert alerted_titles(monitor) == ['Digitakt A', 'Digitakt B', 'Digitakt C']
+        assert not os.path.exists('run_checkpoint.json')
+        print("✅ Reprise: sites restants vérifiés, une seule alerte")
+        
+        # Point de reprise illisible (écrit par un autre outil) : cycle complet
+        with open('run_checkpoint.json', 'w', encoding='utf-8') as f:
+            f.write('{"pending": [')
+        requested.clear()
+        monitor.check_all_websites()
+        assert requested == [site['url'] for site in sites] and alerted_titles(monitor) == [], requested
+        print("✅ Point de reprise illisible: cycle complet")
+    return True
+
+def test_work_queue_leases():
+    """Test les baux de la file de travaux : expiration, reprise et abandon"""
+    print(f"\n📬 Test des baux de la file de travaux")
+    with tempfile.TemporaryDirectory() as workdir:
+        queue = WorkQueue(os.path.join(workdir, 'queue.sqlite'), lease_seconds=0.2, max_attempts=2)
+        try:
+            queue.enqueue_cycle('cycle-1', [{'site': 'A'}])
+            first = queue.lease('worker-1')
+            assert first.attempt == 1 and queue.lease('worker-2') is None, "bail en cours"
+            assert queue.extend_lease(first)
+            
+            # Bail expiré : le travail est repris, l'ancien worker ne peut plus le rendre
+            time.sleep(0.3)
+            second = queue.lease('worker-2')
+            assert (second.id, second.attempt) == (first.id, 2), (second.id, second.attempt)
+            assert not queue.complete(first, {'products': []}), "résultat d'un bail perdu accepté"
+            assert queue.complete(second, {'products': ['A']})
+            assert queue.take_results('cycle-1') == [({'site': 'A'}, {'products': ['A']}, None)]
+            assert queue.take_results('cycle-1') == [], "résultat collecté deux fois"
+            print("✅ Bail expiré repris par un autre worker")
+            
+            # Dernière tentative expirée : le travail est abandonné avec une erreur
+            queue.enqueue_cycle('cycle-2', [{'site': 'B'}])
+            for worker in ('worker-1', 'worker-2'):
+                assert queue.lease(worker) is not None
+                time.sleep(0.3)
+            assert queue.lease('worker-3') is None
+            (payload, result, error), = queue.take_results('cycle-2')
+            assert payload == {'site': 'B'} and result is None and 'bail expiré' in error, error
+            assert queue.counts() == {'failed': 1}, queue.counts()
+            print(f"✅ Abandon après {queue.max_attempts} tentatives: {error}")
+        finally:
+            queue.close()
+    return True
+
+def print_parse_cache_stats(monitor: UniversalWebMonitor):
+    """Affiche les compteurs du cache de parsing"""
+    cache = get_parse_cache(monitor.config['advanced_settings'].get('parse_cache', {}))
+    if cache is not None:
+        print(f"\n♻️ Cache de parsing: {cache.summary()}")
+
 def run_demo_search(config_file: str = 'config.json'):
     """Exécute une recherche de démonstration"""
     print(f"\n🎬 DÉMONSTRATION DE RECHERCHE")
@@ -189,6 +561,7 @@ def run_demo_search(config_file: str = 'config.json'):
         monitor = UniversalWebMonitor(config_file)
         print(f"🚀 Lancement de la surveillance avec: {config_file}")
         monitor.check_all_websites()
+        print_parse_cache_stats(monitor)
         print("✅ Démonstration terminée")
         return True
         
@@ -225,7 +598,13 @@ def main():
         ("Accès aux sites web", lambda: test_website_access(config_file)),
         ("Fonctionnalité de recherche", lambda: test_search_functionality(config_file)),
         ("Configuration email", lambda: test_email_config(config_file)),
-        ("Permissions de fichiers", test_file_permissions)
+        ("Permissions de fichiers", test_file_permissions),
+        ("Dédoublonnage des conteneurs", test_container_dedup),
+        ("Cache de parsing", test_parse_cache),
+        ("Report des alertes", test_alert_deferral),
+        ("Pagination", test_pagination),
+        ("Reprise de cycle", test_checkpoint_resume),
+        ("Baux de la file de travaux", test_work_queue_leases)
     ]
     
     results = []
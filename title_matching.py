@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Correspondance normalisée et approximative entre titres et termes recherchés
+
+Les titres et les termes sont normalisés de la même façon : accents retirés,
+casse repliée, découpage en mots (lettres et chiffres séparés : « mk2 » donne
+« mk » et « 2 »), zéros de tête retirés et chiffres romains II à XX convertis
+(« Digitakt II » correspond à « digitakt 2 »).
+
+Un terme correspond à un titre si la proportion de ses mots présents dans le
+titre atteint `token_threshold`. En mode `fuzzy`, un mot d'au moins
+`min_fuzzy_length` lettres accepte aussi `max_edits` fautes de frappe ; les
+nombres restent exacts (« digitakt 2 » ne correspond pas à « digitakt 3 »).
+
+Le matcher est créé pour une page : chaque mot distinct de la page n'est
+comparé qu'une fois aux termes (index mot -> termes correspondants).
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+DEFAULT_MATCHING_SETTINGS = {
+    'mode': 'substring',
+    'token_threshold': 1.0,
+    'max_edits': 1,
+    'min_fuzzy_length': 5
+}
+
+MATCHING_MODES = ('substring', 'tokens', 'fuzzy')
+
+TOKEN_PATTERN = re.compile(r"[^\W\d_]+|\d+")
+
+def int_to_roman(value: int) -> str:
+    """Chiffre romain canonique d'un entier de 1 à 39"""
+    numeral = ''
+    for symbol, amount in (('x', 10), ('ix', 9), ('v', 5), ('iv', 4), ('i', 1)):
+        count, value = divmod(value, amount)
+        numeral += symbol * count
+    return numeral
+
+# II à XX ; I, V et X seuls restent des lettres (« Pack V », « Roland X »)
+ROMAN_NUMERALS = {int_to_roman(value): str(value) for value in range(2, 21)
+                  if len(int_to_roman(value)) > 1}
+
+def fold(text: str) -> str:
+    """Retire les accents et replie la casse"""
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+@lru_cache(maxsize=8192)
+def normalize_tokens(text: str) -> Tuple[str, ...]:
+    """Mots normalisés d'un titre ou d'un terme"""
+    tokens = []
+    for token in TOKEN_PATTERN.findall(fold(text)):
+        if token.isdigit():
+            token = token.lstrip('0') or '0'
+        else:
+            token = ROMAN_NUMERALS.get(token, token)
+        tokens.append(token)
+    return tuple(tokens)
+
+def within_edits(a: str, b: str, max_edits: int) -> bool:
+    """Distance d'édition (Levenshtein) bornée, avec arrêt dès que la borne est dépassée"""
+    if abs(len(a) - len(b)) > max_edits:
+        return False
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > max_edits:
+            return False
+        previous = current
+    return previous[-1] <= max_edits
+
+class TitleMatcher:
+    """Termes recherchés et exclus compilés, avec l'index des mots déjà vus sur la page"""
+
+    def __init__(self, search_terms: List[str], exclude_terms: List[str], settings: Optional[Dict[str, Any]] = None):
+        self.settings = {**DEFAULT_MATCHING_SETTINGS, **(settings or {})}
+        self.fuzzy = self.settings['mode'] == 'fuzzy'
+        self.search_terms = [tokens for tokens in map(normalize_tokens, search_terms) if tokens]
+        self.exclude_terms = [tokens for tokens in map(normalize_tokens, exclude_terms) if tokens]
+        self.vocabulary = frozenset(token for tokens in self.search_terms + self.exclude_terms for token in tokens)
+        self.fuzzy_vocabulary = [token for token in self.vocabulary
+                                 if not token.isdigit() and len(token) >= self.settings['min_fuzzy_length']]
+        self.token_index: Dict[str, FrozenSet[str]] = {}
+
+    def token_hits(self, token: str) -> FrozenSet[str]:
+        """Mots des termes auxquels correspond un mot du titre (calculé une fois par mot distinct)"""
+        hits = self.token_index.get(token)
+        if hits is None:
+            hits = {token} if token in self.vocabulary else set()
+            if self.fuzzy and not token.isdigit() and len(token) >= self.settings['min_fuzzy_length']:
+                hits.update(term_token for term_token in self.fuzzy_vocabulary
+                            if within_edits(token, term_token, self.settings['max_edits']))
+            hits = self.token_index[token] = frozenset(hits)
+        return hits
+
+    def cover(self, title: str) -> FrozenSet[str]:
+        """Mots des termes présents dans un titre"""
+        covered = set()
+        for token in normalize_tokens(title):
+            covered.update(self.token_hits(token))
+        return frozenset(covered)
+
+    def matches_any(self, terms: List[Tuple[str, ...]], covered: FrozenSet[str]) -> bool:
+        """Vrai si un terme a assez de mots présents dans le titre"""
+        threshold = self.settings['token_threshold']
+        return any(sum(token in covered for token in tokens) >= threshold * len(tokens) for tokens in terms)
+
+    def found_terms(self, text: str, terms: List[str]) -> List[str]:
+        """Termes (tels que saisis) qui correspondent à un texte quelconque"""
+        covered = self.cover(text)
+        return [term for term in terms
+                if normalize_tokens(term) and self.matches_any([normalize_tokens(term)], covered)]
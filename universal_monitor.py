@@ -8,50 +8,395 @@ Auteur: Assistant IA
 Version: 2.0 - Universal Edition
 """
 
-import requests
-from bs4 import BeautifulSoup
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-import schedule
+from __future__ import annotations
+
 import time
+
+# Début du chargement du module (rapport de démarrage)
+_MODULE_LOAD_START = time.perf_counter()
+
 import logging
-from datetime import datetime
+import gc
+from datetime import datetime, timezone
 import os
 import json
-
-# Import optionnel de Selenium pour le contenu JavaScript
-try:
-    from selenium import webdriver
-    from selenium.webdriver.chrome.options import Options
-    from selenium.webdriver.common.by import By
-    from selenium.webdriver.support.ui import WebDriverWait
-    from selenium.webdriver.support import expected_conditions as EC
-    from selenium.common.exceptions import TimeoutException, WebDriverException
-    SELENIUM_AVAILABLE = True
-except ImportError:
-    SELENIUM_AVAILABLE = False
-from typing import List, Dict, Optional, Any
+import importlib
+import importlib.util
+from typing import List, Dict, Optional, Any, Callable, Tuple, TYPE_CHECKING
 import sys
 import random
 import re
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin, urlparse, urlencode
 import hashlib
+import itertools
+import threading
+from functools import lru_cache
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from monitor_utils import IMPORT_TIMINGS, atomic_write_json, get_rss_mb, lazy_import
+from change_detection import CHANGE_LABELS, compare_snapshot, describe_change
+from network import DnsCache, create_http_adapter, create_resumable_tls_context, network_timings
+from pagination import crawl_paginated, next_page_href
+from parse_cache import ParsedPageCache, get_parse_cache
+from robots_cache import RobotsCache
+from site_health import DEFAULT_ADAPTIVE_SETTINGS, SiteHealthTracker
+
+if TYPE_CHECKING:
+    import requests
+    from bs4 import BeautifulSoup
+    from concurrent.futures import ProcessPoolExecutor
+    from urllib.robotparser import RobotFileParser
+
+# Les sous-systèmes optionnels (Selenium, email, planificateur, XML, flux, export,
+# pool de parsing) et les bibliothèques lourdes (requests, bs4) sont importés à la
+# première utilisation
+SELENIUM_AVAILABLE = importlib.util.find_spec('selenium') is not None
+
+# Blocs JSON-LD embarqués dans le HTML (extraction sans rendu)
+JSON_LD_PATTERN = re.compile(
+    r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
+    re.DOTALL | re.IGNORECASE
+)
+
+# Chemins JSON par défaut (vocabulaire schema.org), surchargeables par site
+DEFAULT_JSON_FIELDS = {
+    'title': ['name', 'title'],
+    'price': ['offers.price', 'offers.lowPrice', 'price'],
+    'currency': ['offers.priceCurrency'],
+    'link': ['url', 'offers.url', 'link'],
+    'description': ['description'],
+    'image': ['image', 'thumbnail']
+}
+
+# Motifs d'URL bloqués par type de ressource dans le navigateur headless
+BLOCKED_RESOURCE_PATTERNS = {
+    'image': ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico', '*.bmp'],
+    'font': ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot'],
+    'media': ['*.mp4', '*.webm', '*.ogg', '*.mp3', '*.wav', '*.m4a', '*.m3u8', '*.mpd'],
+    'stylesheet': ['*.css']
+}
+
+# Attributs des images à chargement différé, par priorité (`src` n'est souvent qu'un espace réservé)
+LAZY_IMAGE_ATTRIBUTES = ('data-src', 'data-lazy-src', 'data-original', 'data-lazy')
+SRCSET_ATTRIBUTES = ('data-srcset', 'data-lazy-srcset', 'srcset')
+# Images de fond explicites, acceptées sur n'importe quelle balise de la fiche
+BACKGROUND_IMAGE_ATTRIBUTES = ('data-bg', 'data-background-image')
+BACKGROUND_STYLE_PATTERN = re.compile(r"background(?:-image)?\s*:[^;]*url\(\s*['\"]?([^'\")]+)", re.I)
+PLACEHOLDER_IMAGE_PATTERN = re.compile(r"^data:|(placeholder|blank|spacer|pixel|loading|lazy)[^/]*\.(gif|png|svg|webp)$", re.I)
+
+# Attributs portant le lien d'une fiche quand il n'y a pas de balise <a href>
+LINK_DATA_ATTRIBUTES = ('data-href', 'data-url', 'data-link')
+
+# Sélecteur composé simple (balise, classes, attributs), testé sans soupsieve
+SIMPLE_SELECTOR_PATTERN = re.compile(r"""^([a-zA-Z][\w-]*)?((?:\.[\w-]+|\[[\w-]+(?:[*^$~|]?=(?:'[^']*'|"[^"]*"|[\w-]+))?\])*)$""")
+SIMPLE_SELECTOR_PART = re.compile(r"""\.([\w-]+)|\[([\w-]+)(?:([*^$~|]?=)('[^']*'|"[^"]*"|[\w-]+))?\]""")
+
+# Champs d'un produit extraits en un seul parcours de l'élément, une fois le titre accepté
+SCANNED_FIELDS = ('price', 'link', 'description')
+
+# Politique de ressources par défaut des pages rendues avec Selenium
+DEFAULT_RESOURCE_POLICY = {
+    'block': ['image', 'font', 'media'],
+    'blocked_domains': [],
+    'page_load_strategy': 'eager',
+    'wait_for_containers': True,
+    'scroll': True,
+    'max_scrolls': 6
+}
+
+def best_srcset_url(srcset: str) -> str:
+    """URL de la plus grande image d'un attribut srcset ("a.jpg 320w, b.jpg 640w")"""
+    best_url, best_size = '', -1.0
+    for candidate in srcset.split(','):
+        parts = candidate.split()
+        if not parts:
+            continue
+        try:
+            size = float(parts[1][:-1]) if len(parts) > 1 else 1.0
+        except ValueError:
+            size = 0.0
+        if size > best_size:
+            best_url, best_size = parts[0], size
+    return best_url
+
+def image_url_from_tag(tag) -> Tuple[str, str]:
+    """Retourne (image réelle, repli) à partir d'une balise de la fiche
+    
+    Seules <img> et <source> (dans <picture>) fournissent une image, ainsi que
+    les images de fond explicites (data-bg, style background-image) : un
+    <script src>, <iframe src> ou <video src> n'est jamais retenu.
+    """
+    attrs = tag.attrs
+    if not attrs:
+        return '', ''
+    if tag.name == 'img' or (tag.name == 'source' and tag.parent is not None and tag.parent.name == 'picture'):
+        return image_url_from_attributes(attrs, allow_src=tag.name == 'img')
+    for attribute in BACKGROUND_IMAGE_ATTRIBUTES:
+        value = attrs.get(attribute)
+        if value and not PLACEHOLDER_IMAGE_PATTERN.search(value):
+            return value, ''
+    style = attrs.get('style')
+    if style:
+        match = BACKGROUND_STYLE_PATTERN.search(style)
+        if match and not PLACEHOLDER_IMAGE_PATTERN.search(match.group(1)):
+            return match.group(1), ''
+    return '', ''
+
+def image_url_from_attributes(attrs: Dict[str, Any], allow_src: bool = True) -> Tuple[str, str]:
+    """Retourne (image réelle, repli) à partir des attributs d'une image
+    
+    Les attributs de chargement différé et srcset passent avant `src` ; un
+    `src` d'espace réservé n'est gardé qu'en repli, une URI data: jamais.
+    """
+    for attribute in LAZY_IMAGE_ATTRIBUTES:
+        value = attrs.get(attribute)
+        if value and not PLACEHOLDER_IMAGE_PATTERN.search(value):
+            return value, ''
+    for attribute in SRCSET_ATTRIBUTES:
+        value = attrs.get(attribute)
+        if value:
+            url = best_srcset_url(value)
+            if url and not PLACEHOLDER_IMAGE_PATTERN.search(url):
+                return url, ''
+    src = attrs.get('src') if allow_src else None
+    if src and not src.startswith('data:'):
+        if PLACEHOLDER_IMAGE_PATTERN.search(src):
+            return '', src
+        return src, ''
+    return '', ''
+
+def has_product_link(element) -> bool:
+    """Vrai si l'élément porte ou contient un lien (<a href> ou attribut data-href, data-url...)"""
+    def linked(tag) -> bool:
+        return bool((tag.name == 'a' and tag.get('href')) or any(tag.get(a) for a in LINK_DATA_ATTRIBUTES))
+    return linked(element) or element.find(linked) is not None
+
+def is_inside(element, ancestor) -> bool:
+    """Vrai si `element` est un descendant de `ancestor`"""
+    return any(parent is ancestor for parent in element.parents)
+
+def iter_reduced_containers(candidates):
+    """Réduit des conteneurs (dans l'ordre du document) aux produits, au fil de l'eau
+    
+    Les correspondances imbriquées suivent directement leur ancêtre dans
+    l'ordre du document : chaque conteneur externe est réduit dès que son
+    sous-arbre est parcouru (ou qu'il est reconnu comme liste).
+    """
+    candidates = iter(candidates)
+    pushed_back = []
+    
+    def next_candidate():
+        return pushed_back.pop() if pushed_back else next(candidates, None)
+    
+    def nested_in(outer):
+        while True:
+            element = next_candidate()
+            if element is None:
+                return
+            if not is_inside(element, outer):
+                pushed_back.append(element)
+                return
+            yield element
+    
+    while True:
+        outer = next_candidate()
+        if outer is None:
+            return
+        yield from reduce_container(outer, nested_in(outer))
+
+def reduce_container(outer, nested):
+    """Produit un conteneur, ou ceux qu'il englobe s'il s'agit d'une liste
+    
+    Le conteneur externe n'est écarté que s'il englobe au moins deux
+    conteneurs avec lien (liste, grille) ; les conteneurs sans lien imbriqués
+    dans un conteneur retenu sont des fragments du même produit.
+    """
+    seen = []
+    subgroup_top = None
+    subgroup_linked = False
+    linked_subgroups = 0
+    for element in nested:
+        seen.append(element)
+        if subgroup_top is None or not is_inside(element, subgroup_top):
+            subgroup_top, subgroup_linked = element, False
+        if not subgroup_linked and has_product_link(element):
+            subgroup_linked = True
+            linked_subgroups += 1
+            if linked_subgroups >= 2:
+                yield from iter_reduced_containers(itertools.chain(seen, nested))
+                return
+    yield outer
+
+def attribute_test(operator: Optional[str], expected: str) -> Callable[[str], bool]:
+    """Test d'une valeur d'attribut CSS ([attr], =, *=, ^=, $=, ~=, |=)"""
+    if operator is None:
+        return lambda value: True
+    if operator == '=':
+        return lambda value: value == expected
+    if operator == '~=':
+        return lambda value: expected in value.split()
+    if operator == '|=':
+        return lambda value: value == expected or value.startswith(f"{expected}-")
+    if not expected:
+        # [attr*=''], [attr^=''] et [attr$=''] ne correspondent à rien
+        return lambda value: False
+    if operator == '*=':
+        return lambda value: expected in value
+    if operator == '^=':
+        return lambda value: value.startswith(expected)
+    return lambda value: value.endswith(expected)
+
+def compile_simple_selector(selector: str) -> Optional[Callable[[Any], bool]]:
+    """Prédicat équivalent d'un sélecteur composé simple (None si le sélecteur est complexe)
+    
+    Lit directement le nom et les attributs de la balise : bien plus rapide
+    que `soupsieve.match` quand on teste chaque descendant d'un élément.
+    """
+    match = SIMPLE_SELECTOR_PATTERN.match(selector.strip())
+    if match is None or not (match.group(1) or match.group(2)):
+        return None
+    name = match.group(1).lower() if match.group(1) else None
+    classes = []
+    attributes = []
+    for class_name, attribute, operator, expected in SIMPLE_SELECTOR_PART.findall(match.group(2)):
+        if class_name:
+            classes.append(class_name)
+        else:
+            expected = expected[1:-1] if expected[:1] in ('"', "'") else expected
+            attributes.append((attribute.lower(), attribute_test(operator or None, expected)))
+    
+    def predicate(tag) -> bool:
+        if name is not None and tag.name != name:
+            return False
+        attrs = tag.attrs
+        if classes:
+            tag_classes = attrs.get('class') or ()
+            if not all(class_name in tag_classes for class_name in classes):
+                return False
+        for attribute, test in attributes:
+            value = attrs.get(attribute)
+            if value is None:
+                return False
+            if not test(' '.join(value) if isinstance(value, list) else value):
+                return False
+        return True
+    return predicate
+
+@lru_cache(maxsize=256)
+def compile_field_selectors(field_selectors: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> Tuple[Tuple[str, tuple], ...]:
+    """Compile (une fois) les sélecteurs des champs parcourus ensemble
+    
+    Les sélecteurs simples deviennent des prédicats directs ; les autres
+    (combinateurs, pseudo-classes) passent par soupsieve.
+    """
+    soupsieve = lazy_import('soupsieve')
+    return tuple((field, tuple(compile_simple_selector(selector) or soupsieve.compile(selector).match
+                               for selector in selectors))
+                 for field, selectors in field_selectors)
+
+class ProductRecord:
+    """Produit en cours d'extraction, converti en dictionnaire (`as_dict`) dès qu'il est retenu"""
+    
+    __slots__ = ('title', 'price', 'link', 'description', 'image')
+    
+    def __init__(self, title: str = '', price: str = '', link: str = '', description: str = '', image: str = ''):
+        self.title = title
+        self.price = price
+        self.link = link
+        self.description = description
+        self.image = image
+        
+    def as_dict(self) -> Dict[str, str]:
+        """Retourne le produit au format dictionnaire utilisé par les alertes"""
+        return {
+            'title': self.title,
+            'price': self.price,
+            'link': self.link,
+            'description': self.description,
+            'image': self.image
+        }
+
+DEFAULT_CONTROL_SETTINGS = {
+    'enabled': False,
+    'host': '127.0.0.1',
+    'port': 8765,
+    'token': '',
+    'paused_file': 'paused_sites.json',
+    'detections_file': 'recent_detections.json',
+    'max_detections': 200
+}
 
 class UniversalWebMonitor:
     def __init__(self, config_file: str = 'config.json'):
         """Initialise le moniteur avec un fichier de configuration"""
+        self.config_file = config_file
         self.config = self.load_config(config_file)
-        self.session = requests.Session()
-        self.detected_products = self.load_detected_products()
+        self.session = lazy_import('requests').Session()
         self.setup_logging()
+        self.detected_products = self.load_detected_products()
+        self.seen_hashes = {}
         self.setup_session()
+        self.site_cursors = self.load_site_cursors()
+        self.pending_cursors = {}
+        self.site_snapshots = self.load_site_snapshots()
+        self.pending_snapshots = {}
+        self.host_semaphores = {}
+        self.host_lock = threading.Lock()
+        self.parse_pool = None
+        self.robots_cache = RobotsCache(self.get_robots_settings().get('cache_file', 'robots_cache.json'))
+        self.host_next_slot = {}
+        self.network_savings = {}
+        self.work_queue = None
+        self.exporter = None
+        self.stop_event = threading.Event()
+        self.active_drivers = set()
+        self.cycle_process = None
+        self.shutdown_timer = None
+        self.abandoned_checks = 0
+        self.check_seconds = {}
+        self.check_errors = {}
+        self.in_flight = {}
+        self.paused_sites = self.load_paused_sites()
+        self.recent_detections = self.load_recent_detections()
+        self.requested_checks = []
+        self.wake_event = threading.Event()
+        self.control_server = None
+        self.cycle_running = False
+        self.site_health = SiteHealthTracker(self.get_adaptive_settings(),
+                                             self.config['monitoring_settings']['check_interval_hours'])
+        self.cycle_count = 0
+        self.first_sample_rss = None
+        self.memory_baseline = None
+        if self.get_memory_settings().get('tracemalloc'):
+            lazy_import('tracemalloc').start(self.get_memory_settings().get('tracemalloc_frames', 1))
+        
+    @classmethod
+    def lightweight(cls, config: Dict[str, Any]) -> 'UniversalWebMonitor':
+        """Crée une instance minimale (configuration + logger) dédiée au parsing
+        
+        Utilisée par les processus du pool de parsing : pas de session HTTP,
+        pas de fichier de log ni d'état des produits détectés.
+        """
+        monitor = cls.__new__(cls)
+        monitor.config = config
+        monitor.logger = logging.getLogger(__name__)
+        monitor.use_selenium = False
+        monitor.host_lock = threading.Lock()
+        monitor.parse_pool = None
+        monitor.stop_event = threading.Event()
+        monitor.detected_products = {}
+        monitor.seen_hashes = {}
+        monitor.cycle_count = 0
+        monitor.first_sample_rss = None
+        monitor.memory_baseline = None
+        return monitor
         
     def load_config(self, config_file: str) -> Dict[str, Any]:
-        """Charge la configuration depuis un fichier JSON"""
+        """Charge la configuration validée (cache compilé si à jour, voir config_generator.py)"""
+        config_generator = lazy_import('config_generator')
         try:
-            with open(config_file, 'r', encoding='utf-8') as f:
-                config = json.load(f)
+            config, self.config_warnings, from_cache = config_generator.load_config_file(config_file)
+            self.config_from_cache = from_cache
             
             # Compléter avec les variables d'environnement si disponibles
             if not config['email_settings']['sender_email']:
@@ -66,7 +411,24 @@ class UniversalWebMonitor:
         except json.JSONDecodeError as e:
             logging.error(f"Erreur de parsing JSON dans {config_file}: {e}")
             sys.exit(1)
+        except config_generator.ConfigValidationError as e:
+            for error in e.errors:
+                logging.error(f"❌ Configuration {config_file}: {error}")
+            sys.exit(1)
             
+    def get_search_terms(self, website: Dict[str, Any]) -> List[str]:
+        """Termes de recherche normalisés (précalculés par la compilation)"""
+        if 'normalized_search_terms' in website:
+            return website['normalized_search_terms']
+        return [term.lower() for term in website['search_terms']]
+        
+    def get_exclude_terms(self) -> List[str]:
+        """Termes d'exclusion normalisés (précalculés par la compilation)"""
+        advanced = self.config['advanced_settings']
+        if 'normalized_exclude_terms' in advanced:
+            return advanced['normalized_exclude_terms']
+        return [term.lower() for term in advanced.get('exclude_terms', [])]
+        
     def setup_logging(self):
         """Configure le système de logging"""
         log_level = getattr(logging, self.config['monitoring_settings']['log_level'])
@@ -81,6 +443,17 @@ class UniversalWebMonitor:
         )
         self.logger = logging.getLogger(__name__)
         
+        if getattr(self, 'config_from_cache', False):
+            self.logger.info("🧾 Configuration chargée depuis le cache compilé")
+        else:
+            self.logger.info("🧾 Configuration validée et compilée")
+        config_warnings = getattr(self, 'config_warnings', [])
+        if config_warnings:
+            self.logger.warning(f"⚠️ Configuration: {len(config_warnings)} avertissement(s), "
+                                f"détail avec: python config_generator.py --validate {self.config_file}")
+            for warning in config_warnings:
+                self.logger.debug(f"⚠️ Configuration: {warning}")
+        
         # Configuration Selenium
         self.use_selenium = (
             SELENIUM_AVAILABLE and 
@@ -111,6 +484,114 @@ class UniversalWebMonitor:
                 'http': self.config['advanced_settings']['proxy_url'],
                 'https': self.config['advanced_settings']['proxy_url']
             }
+        
+        # Réutilisation réseau d'un cycle à l'autre : keep-alive, et sur demande
+        # cache DNS et reprise TLS, limités aux connexions de cette session
+        network = self.config['advanced_settings'].get('network', {})
+        if network.get('dns_cache') or network.get('tls_session_reuse'):
+            pool_size = max(10, self.config['advanced_settings'].get('max_concurrent_sites', 1)
+                            * self.config['advanced_settings'].get('max_parallel_per_host', 2))
+            dns_cache = DnsCache(lazy_import('socket').getaddrinfo, network.get('dns_ttl_seconds', 300)) \
+                if network.get('dns_cache') else None
+            ssl_context = create_resumable_tls_context() if network.get('tls_session_reuse') else None
+            adapter = create_http_adapter(pool_size, dns_cache, ssl_context)
+            self.session.mount('http://', adapter)
+            self.session.mount('https://', adapter)
+            
+    def get_host_semaphore(self, url: str) -> threading.BoundedSemaphore:
+        """Retourne le sémaphore limitant les requêtes simultanées vers un hôte"""
+        host = urlparse(url).netloc
+        with self.host_lock:
+            if host not in self.host_semaphores:
+                limit = self.config['advanced_settings'].get('max_parallel_per_host', 2)
+                self.host_semaphores[host] = threading.BoundedSemaphore(max(1, limit))
+            return self.host_semaphores[host]
+            
+    def get_robots_settings(self) -> Dict[str, Any]:
+        """Paramètres robots.txt (`advanced_settings.robots`)"""
+        return self.config['advanced_settings'].get('robots', {})
+        
+    def get_robots_rules(self, url: str) -> RobotFileParser:
+        """Règles robots.txt de l'origine d'une URL (cache partagé, TTL)"""
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        with self.robots_cache.origin_lock(origin):
+            if self.robots_cache.get_fresh(origin) is None:
+                self.fetch_robots(origin)
+        return self.robots_cache.parser(origin)
+        
+    def fetch_robots(self, origin: str):
+        """Télécharge le robots.txt d'une origine et l'enregistre dans le cache
+        
+        Si le fichier est momentanément inaccessible (5xx, réseau), les règles
+        précédentes sont conservées et un nouvel essai a lieu après `error_ttl_minutes`.
+        """
+        requests = lazy_import('requests')
+        settings = self.get_robots_settings()
+        ttl_seconds = settings.get('ttl_hours', 24) * 3600
+        error_ttl_seconds = settings.get('error_ttl_minutes', 30) * 60
+        
+        try:
+            response = self.session.get(
+                f"{origin}/robots.txt",
+                headers={'User-Agent': settings.get('user_agent', 'BotAlerte')},
+                timeout=self.config['monitoring_settings']['timeout_seconds']
+            )
+            status, text = response.status_code, response.text if response.ok else ''
+        except requests.exceptions.RequestException as e:
+            self.logger.warning(f"⚠️ robots.txt de {origin} inaccessible: {e}")
+            status, text = 0, ''
+        
+        if status == 0 or status >= 500:
+            previous = self.robots_cache.entries.get(origin)
+            if previous is not None and previous['status'] < 500 and previous['status'] != 0:
+                self.logger.info(f"🤖 Règles robots.txt précédentes conservées pour {origin}")
+                status, text = previous['status'], previous['text']
+            ttl_seconds = error_ttl_seconds
+        
+        self.logger.info(f"🤖 robots.txt de {origin} mis en cache (HTTP {status or 'erreur'})")
+        self.robots_cache.store(origin, status, text, ttl_seconds)
+        
+    def is_allowed_by_robots(self, url: str, site_name: str) -> bool:
+        """Vérifie qu'une URL est autorisée par le robots.txt de son hôte"""
+        if not self.config['advanced_settings'].get('respect_robots_txt', False):
+            return True
+        user_agent = self.get_robots_settings().get('user_agent', 'BotAlerte')
+        if self.get_robots_rules(url).can_fetch(user_agent, url):
+            return True
+        self.logger.warning(f"🚫 {url} interdite par robots.txt, page de {site_name} ignorée")
+        return False
+        
+    def get_crawl_delay(self, url: str) -> float:
+        """Délai minimal entre deux requêtes vers l'hôte (Crawl-delay / Request-rate)"""
+        if not self.config['advanced_settings'].get('respect_robots_txt', False):
+            return 0.0
+        settings = self.get_robots_settings()
+        user_agent = settings.get('user_agent', 'BotAlerte')
+        rules = self.get_robots_rules(url)
+        delay = float(rules.crawl_delay(user_agent) or 0)
+        rate = rules.request_rate(user_agent)
+        if rate and rate.requests:
+            delay = max(delay, rate.seconds / rate.requests)
+        return min(delay, settings.get('max_crawl_delay_seconds', 60))
+        
+    def wait_for_host_slot(self, url: str):
+        """Espace les requêtes vers un même hôte selon son crawl-delay
+        
+        Chaque requête réserve le prochain créneau de l'hôte : les sites
+        vérifiés en parallèle sur le même hôte respectent aussi le délai.
+        """
+        delay = self.get_crawl_delay(url)
+        if not delay:
+            return
+        host = urlparse(url).netloc
+        with self.host_lock:
+            now = time.monotonic()
+            slot = max(now, self.host_next_slot.get(host, 0.0))
+            self.host_next_slot[host] = slot + delay
+        if slot > now:
+            self.logger.debug(f"⏱️ Crawl-delay de {host}: attente {slot - now:.1f}s")
+            self.stop_event.wait(slot - now)
             
     def get_random_user_agent(self) -> str:
         """Retourne un User-Agent aléatoire si activé"""
@@ -126,11 +607,96 @@ class UniversalWebMonitor:
         ]
         return random.choice(user_agents)
     
-    def fetch_page_selenium(self, url: str, site_name: str) -> Optional[BeautifulSoup]:
-        """Récupère le contenu avec Selenium (JavaScript activé)"""
+    def get_resource_policy(self, website: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Politique de chargement des ressources du navigateur pour un site
+        
+        Valeurs par défaut, complétées par `advanced_settings.selenium_resource_policy`
+        puis par le `resource_policy` du site.
+        """
+        policy = dict(DEFAULT_RESOURCE_POLICY)
+        policy.update(self.config['advanced_settings'].get('selenium_resource_policy', {}))
+        if website:
+            policy.update(website.get('resource_policy', {}))
+        return policy
+        
+    def build_blocked_url_patterns(self, policy: Dict[str, Any]) -> List[str]:
+        """Motifs d'URL à bloquer (types de ressources et domaines interdits)"""
+        patterns = []
+        for resource_type in policy.get('block', []):
+            for pattern in BLOCKED_RESOURCE_PATTERNS.get(resource_type, []):
+                patterns.extend([pattern, f"{pattern}?*"])
+        for domain in policy.get('blocked_domains', []):
+            patterns.extend([f"*://{domain}/*", f"*://*.{domain}/*"])
+        return patterns
+        
+    def wait_for_page_content(self, driver, container_selector: Optional[str], wait_seconds: float):
+        """Attend que les conteneurs de produits du site (ou à défaut le DOM) soient présents"""
+        By = lazy_import('selenium.webdriver.common.by').By
+        WebDriverWait = lazy_import('selenium.webdriver.support.ui').WebDriverWait
+        selenium_exceptions = lazy_import('selenium.common.exceptions')
+        
+        if container_selector:
+            try:
+                WebDriverWait(driver, wait_seconds, poll_frequency=0.2).until(
+                    lambda d: d.find_elements(By.CSS_SELECTOR, container_selector)
+                )
+                self.logger.debug("✅ Conteneurs de produits présents")
+                return
+            except selenium_exceptions.InvalidSelectorException:
+                # Sélecteur propre à BeautifulSoup, inconnu du navigateur
+                self.logger.debug("Sélecteurs de conteneurs non supportés par le navigateur, attente générique")
+            except selenium_exceptions.TimeoutException:
+                self.logger.warning("⏰ Timeout lors de l'attente des conteneurs de produits")
+                return
+        
+        try:
+            WebDriverWait(driver, wait_seconds).until(
+                lambda d: len(d.find_elements(By.CSS_SELECTOR, 
+                    'div, article, li, section, [class*="product"], [class*="item"]'
+                )) > 5
+            )
+            self.logger.debug("✅ Éléments DOM chargés")
+        except selenium_exceptions.TimeoutException:
+            self.logger.warning("⏰ Timeout lors de l'attente des éléments DOM")
+            
+    def scroll_for_lazy_content(self, driver, container_selector: Optional[str], max_scrolls: int):
+        """Fait défiler la page jusqu'à ce que le nombre d'éléments se stabilise (lazy loading)"""
+        By = lazy_import('selenium.webdriver.common.by').By
+        selenium_exceptions = lazy_import('selenium.common.exceptions')
+        selector = container_selector or 'div, article, li, section'
+        count = -1
+        for _ in range(max_scrolls):
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            time.sleep(0.5)
+            try:
+                new_count = len(driver.find_elements(By.CSS_SELECTOR, selector))
+            except selenium_exceptions.InvalidSelectorException:
+                selector = 'div, article, li, section'
+                continue
+            if new_count == count:
+                break
+            count = new_count
+            
+    def fetch_page_selenium(self, url: str, site_name: str,
+                            website: Optional[Dict[str, Any]] = None) -> Optional[BeautifulSoup]:
+        """Récupère le contenu avec Selenium (JavaScript activé)
+        
+        Les images, polices, médias et domaines interdits par la politique de
+        ressources du site ne sont pas téléchargés, et le DOM est capturé dès
+        que les conteneurs de produits sont présents.
+        """
+        webdriver = lazy_import('selenium.webdriver')
+        Options = lazy_import('selenium.webdriver.chrome.options').Options
+        selenium_exceptions = lazy_import('selenium.common.exceptions')
+        WebDriverException = selenium_exceptions.WebDriverException
+        BeautifulSoup = lazy_import('bs4').BeautifulSoup
+        
         try:
+            policy = self.get_resource_policy(website)
+            
             # Configuration Chrome
             chrome_options = Options()
+            chrome_options.page_load_strategy = policy['page_load_strategy']
             
             if self.config.get('advanced_settings', {}).get('selenium_headless', True):
                 chrome_options.add_argument('--headless')
@@ -142,6 +708,8 @@ class UniversalWebMonitor:
             chrome_options.add_argument('--disable-blink-features=AutomationControlled')
             chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
             chrome_options.add_experimental_option('useAutomationExtension', False)
+            if 'image' in policy['block']:
+                chrome_options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
             
             # User Agent
             if self.config['advanced_settings']['rotate_user_agents']:
@@ -151,42 +719,54 @@ class UniversalWebMonitor:
             chrome_options.add_argument(f'--user-agent={user_agent}')
             
             driver = webdriver.Chrome(options=chrome_options)
+            with self.host_lock:
+                self.active_drivers.add(driver)
             
             try:
+                # Blocage des ressources inutiles à l'extraction (interception CDP)
+                blocked_patterns = self.build_blocked_url_patterns(policy)
+                if blocked_patterns:
+                    try:
+                        driver.execute_cdp_cmd('Network.enable', {})
+                        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': blocked_patterns})
+                    except Exception as e:
+                        self.logger.debug(f"Blocage CDP indisponible: {e}")
+                
                 self.logger.info(f"🌐 Chargement Selenium de {site_name}: {url}")
+                start = time.perf_counter()
                 driver.get(url)
                 
-                # Attendre le chargement initial
-                time.sleep(3)
-                
-                # Attendre que les éléments se chargent
+                # Attendre les conteneurs de produits du site
+                container_selector = None
+                if website and policy['wait_for_containers']:
+                    container_selector = ', '.join(website.get('selectors', {}).get('product_containers', [])) or None
                 wait_seconds = self.config.get('advanced_settings', {}).get('selenium_wait_seconds', 10)
-                try:
-                    WebDriverWait(driver, wait_seconds).until(
-                        lambda d: len(d.find_elements(By.CSS_SELECTOR, 
-                            'div, article, li, section, [class*="product"], [class*="item"]'
-                        )) > 5
-                    )
-                    self.logger.debug("✅ Éléments DOM chargés")
-                except TimeoutException:
-                    self.logger.warning("⏰ Timeout lors de l'attente des éléments DOM")
+                self.wait_for_page_content(driver, container_selector, wait_seconds)
                 
                 # Scroll pour déclencher le lazy loading
-                driver.execute_script("window.scrollTo(0, document.body.scrollHeight/3);")
-                time.sleep(1)
-                driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-                time.sleep(1)
-                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
+                if policy['scroll']:
+                    self.scroll_for_lazy_content(driver, container_selector, policy['max_scrolls'])
                 
                 # Récupérer le HTML final
                 html_content = driver.page_source
+                load_seconds = time.perf_counter() - start
+                transferred = driver.execute_script(
+                    "return performance.getEntriesByType('navigation')"
+                    ".concat(performance.getEntriesByType('resource'))"
+                    ".reduce((total, entry) => total + (entry.transferSize || 0), 0);"
+                ) or 0
                 soup = BeautifulSoup(html_content, 'html.parser')
                 
-                self.logger.info(f"Page {site_name} récupérée avec Selenium ({len(html_content)} bytes)")
+                self.logger.info(
+                    f"Page {site_name} récupérée avec Selenium ({len(html_content)} bytes, "
+                    f"{load_seconds:.1f}s, {transferred / 1024:.0f} Ko transférés, "
+                    f"{len(blocked_patterns)} motif(s) bloqué(s))"
+                )
                 return soup
                 
             finally:
+                with self.host_lock:
+                    self.active_drivers.discard(driver)
                 driver.quit()
                 
         except WebDriverException as e:
@@ -210,29 +790,152 @@ class UniversalWebMonitor:
     def save_detected_products(self):
         """Sauvegarde la liste des produits détectés"""
         try:
-            with open('detected_products.json', 'w', encoding='utf-8') as f:
-                json.dump(self.detected_products, f, ensure_ascii=False, indent=2)
+            atomic_write_json('detected_products.json', self.detected_products)
         except Exception as e:
             self.logger.error(f"Erreur lors de la sauvegarde: {e}")
             
+    def get_memory_settings(self) -> Dict[str, Any]:
+        """Paramètres de maîtrise de la mémoire (`advanced_settings.memory`)"""
+        return self.config['advanced_settings'].get('memory', {})
+        
+    def mark_seen_products(self, site_key: str, products: List[Dict[str, str]]):
+        """Retient les produits vus pendant le cycle (protégés du plafond `max_detected_per_site`)"""
+        if self.get_memory_settings().get('max_detected_per_site'):
+            self.seen_hashes.setdefault(site_key, set()).update(map(self.generate_product_hash, products))
+            
+    def trim_detected_products(self):
+        """Borne le nombre de hashes conservés par site (désactivé par défaut)
+        
+        Les hashes vus pendant le cycle passent en fin de liste : la liste est
+        ordonnée par dernière apparition et les produits disparus depuis le plus
+        longtemps sont oubliés en premier. Un produit vu pendant le cycle n'est
+        jamais oublié, quitte à dépasser le plafond.
+        """
+        max_per_site = self.get_memory_settings().get('max_detected_per_site')
+        if not max_per_site:
+            return
+        for site_key, hashes in self.detected_products.items():
+            seen = self.seen_hashes.get(site_key)
+            if seen:
+                unseen = [h for h in hashes if h not in seen]
+                hashes[:] = unseen + [h for h in hashes if h in seen]
+            else:
+                unseen = hashes
+            excess = min(len(hashes) - max_per_site, len(unseen))
+            if excess > 0:
+                self.logger.debug(f"🧹 {excess} hash(es) de produits disparus oublié(s) pour {site_key}")
+                del hashes[:excess]
+            if len(hashes) > max_per_site:
+                self.logger.warning(f"⚠️ {len(hashes)} produits encore listés pour {site_key}, au-delà de "
+                                    f"memory.max_detected_per_site ({max_per_site}) : plafond dépassé")
+            
+    def load_site_cursors(self) -> Dict[str, Dict[str, Any]]:
+        """Charge les curseurs de découverte incrémentale par site"""
+        try:
+            if os.path.exists('site_cursors.json'):
+                with open('site_cursors.json', 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            self.logger.error(f"Erreur lors du chargement des curseurs: {e}")
+        return {}
+        
+    def commit_site_cursors(self):
+        """Valide et sauvegarde les curseurs mis à jour pendant le cycle"""
+        if not self.pending_cursors:
+            return
+        self.site_cursors.update(self.pending_cursors)
+        self.pending_cursors = {}
+        try:
+            atomic_write_json('site_cursors.json', self.site_cursors)
+        except Exception as e:
+            self.logger.error(f"Erreur lors de la sauvegarde des curseurs: {e}")
+            
+    def load_site_snapshots(self) -> Dict[str, Dict[str, Any]]:
+        """Charge le dernier instantané des produits de chaque site (détection de changements)"""
+        try:
+            if os.path.exists('site_snapshots.json'):
+                with open('site_snapshots.json', 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            self.logger.error(f"Erreur lors du chargement des instantanés: {e}")
+        return {}
+        
+    def commit_site_snapshots(self):
+        """Valide et sauvegarde les instantanés calculés pendant le cycle"""
+        if not self.pending_snapshots:
+            return
+        self.site_snapshots.update(self.pending_snapshots)
+        self.pending_snapshots = {}
+        try:
+            atomic_write_json('site_snapshots.json', self.site_snapshots, indent=None)
+        except Exception as e:
+            self.logger.error(f"Erreur lors de la sauvegarde des instantanés: {e}")
+            
+    def load_checkpoint(self, enabled_websites: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Charge le point de reprise d'un cycle interrompu, s'il est encore valable"""
+        checkpoint_file = self.config['monitoring_settings'].get('checkpoint_file', 'run_checkpoint.json')
+        if not os.path.exists(checkpoint_file):
+            return None
+        try:
+            with open(checkpoint_file, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+            started_at = datetime.fromisoformat(checkpoint['started_at'])
+        except Exception as e:
+            self.logger.warning(f"⚠️ Point de reprise illisible, cycle complet: {e}")
+            return None
+        
+        # Au-delà d'un intervalle, un cycle complet est de toute façon dû
+        age_hours = (datetime.now() - started_at).total_seconds() / 3600
+        if age_hours > self.config['monitoring_settings']['check_interval_hours']:
+            self.logger.info("ℹ️ Point de reprise expiré, cycle complet")
+            return None
+        
+        checkpoint.setdefault('new_hashes', {})
+        enabled_keys = {self.get_site_key(website) for website in enabled_websites}
+        checkpoint['pending'] = [key for key in checkpoint.get('pending', []) if key in enabled_keys]
+        return checkpoint
+        
+    def save_checkpoint(self, checkpoint: Dict[str, Any]):
+        """Sauvegarde atomiquement l'avancement du cycle en cours"""
+        checkpoint_file = self.config['monitoring_settings'].get('checkpoint_file', 'run_checkpoint.json')
+        checkpoint['pending_cursors'] = self.pending_cursors
+        checkpoint['pending_snapshots'] = self.pending_snapshots
+        try:
+            atomic_write_json(checkpoint_file, checkpoint)
+        except Exception as e:
+            self.logger.error(f"Erreur lors de la sauvegarde du point de reprise: {e}")
+            
+    def clear_checkpoint(self):
+        """Supprime le point de reprise en fin de cycle"""
+        checkpoint_file = self.config['monitoring_settings'].get('checkpoint_file', 'run_checkpoint.json')
+        try:
+            if os.path.exists(checkpoint_file):
+                os.remove(checkpoint_file)
+        except OSError as e:
+            self.logger.error(f"Erreur lors de la suppression du point de reprise: {e}")
+            
+    def get_site_key(self, website: Dict[str, Any]) -> str:
+        """Retourne la clé de stockage d'un site"""
+        return f"{website['name']}_{website['url']}"
+        
     def generate_product_hash(self, product: Dict[str, str]) -> str:
         """Génère un hash unique pour un produit"""
         unique_string = f"{product.get('title', '')}{product.get('price', '')}{product.get('link', '')}"
         return hashlib.md5(unique_string.encode()).hexdigest()
         
-    def fetch_page(self, website: Dict[str, Any]) -> Optional[BeautifulSoup]:
-        """Récupère et parse une page web"""
-        url = website['url']
-        site_name = website['name']
+    def fetch_response(self, url: str, website: Dict[str, Any], extra_headers: Optional[Dict[str, str]] = None,
+                       missing_ok: bool = False) -> Optional[requests.Response]:
+        """Effectue une requête GET avec requests (retry inclus)
         
-        # Essayer d'abord avec Selenium si configuré
-        if self.use_selenium:
-            soup = self.fetch_page_selenium(url, site_name)
-            if soup is not None:
-                return soup
-            # Si Selenium échoue, on continue avec requests
+        Avec `missing_ok`, un 404 est une réponse attendue (fin de pagination) :
+        ni nouvelle tentative ni erreur journalisée, None est retourné.
+        """
+        requests = lazy_import('requests')
+        site_name = website['name']
         
         try:
+            if not self.is_allowed_by_robots(url, site_name):
+                return None
             self.logger.info(f"📄 Récupération requests de {site_name}: {url}")
             
             # Headers personnalisés pour ce site
@@ -241,26 +944,40 @@ class UniversalWebMonitor:
                 headers.update(website['custom_headers'])
             if self.config['advanced_settings']['rotate_user_agents']:
                 headers['User-Agent'] = self.get_random_user_agent()
+            if extra_headers:
+                headers.update(extra_headers)
                 
-            # Effectuer la requête avec retry
+            # Effectuer la requête avec retry (nombre de requêtes simultanées borné par hôte)
+            network_timings.begin()
             for attempt in range(self.config['monitoring_settings']['retry_attempts']):
                 try:
-                    response = self.session.get(
-                        url,
-                        headers=headers,
-                        timeout=self.config['monitoring_settings']['timeout_seconds']
-                    )
+                    self.wait_for_host_slot(url)
+                    with self.get_host_semaphore(url):
+                        response = self.session.get(
+                            url,
+                            headers=headers,
+                            timeout=self.config['monitoring_settings']['timeout_seconds']
+                        )
+                    if missing_ok and response.status_code == 404:
+                        network_timings.end(url)
+                        self.logger.info(f"ℹ️ Page absente (404) sur {site_name}: {url}")
+                        return None
                     response.raise_for_status()
                     break
                 except requests.exceptions.RequestException as e:
                     if attempt == self.config['monitoring_settings']['retry_attempts'] - 1:
                         raise e
                     self.logger.warning(f"Tentative {attempt + 1} échouée, retry dans {self.config['monitoring_settings']['retry_delay_seconds']}s")
-                    time.sleep(self.config['monitoring_settings']['retry_delay_seconds'])
+                    if self.stop_event.wait(self.config['monitoring_settings']['retry_delay_seconds']):
+                        # Arrêt demandé : pas de nouvelle tentative
+                        raise e
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            self.logger.info(f"Page {site_name} récupérée avec succès ({len(response.content)} bytes)")
-            return soup
+            timing = network_timings.end(url)
+            with self.host_lock:
+                self.network_savings[site_name] = self.network_savings.get(site_name, 0.0) + timing['saved_ms']
+            self.logger.info(f"Page {site_name} récupérée avec succès ({len(response.content)} bytes, "
+                             f"{network_timings.describe(timing)})")
+            return response
             
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Erreur lors de la récupération de {site_name}: {e}")
@@ -269,186 +986,822 @@ class UniversalWebMonitor:
             self.logger.error(f"Erreur inattendue pour {site_name}: {e}")
             return None
             
-    def search_products(self, soup: BeautifulSoup, website: Dict[str, Any]) -> List[Dict[str, str]]:
-        """Recherche les produits correspondants aux termes de recherche"""
+    def fetch_raw(self, url: str, website: Dict[str, Any], missing_ok: bool = False) -> Optional[bytes]:
+        """Récupère le contenu brut d'une URL (voir fetch_response pour `missing_ok`)"""
+        response = self.fetch_response(url, website, missing_ok=missing_ok)
+        return response.content if response is not None else None
+            
+    def fetch_page(self, website: Dict[str, Any]) -> Optional[BeautifulSoup]:
+        """Récupère et parse une page web"""
+        url = website['url']
+        site_name = website['name']
+        
+        if not self.is_allowed_by_robots(url, site_name):
+            return None
+        
+        # Essayer d'abord avec Selenium si configuré
+        if self.use_selenium:
+            self.wait_for_host_slot(url)
+            soup = self.fetch_page_selenium(url, site_name, website)
+            if soup is not None:
+                return soup
+            # Si Selenium échoue, on continue avec requests
+        
+        content = self.fetch_raw(url, website)
+        if content is None:
+            return None
+        return lazy_import('bs4').BeautifulSoup(content, 'html.parser')
+            
+    def collect_site_products(self, website: Dict[str, Any]) -> Optional[List[Dict[str, str]]]:
+        """Récupère les produits correspondants d'un site selon son mode d'extraction
+        
+        Retourne None si la page n'a pas pu être récupérée.
+        """
+        extraction_mode = website.get('extraction_mode', 'html')
+        if extraction_mode == 'json':
+            return self.extract_json_products(website)
+        if extraction_mode in ('sitemap', 'feed'):
+            return self.extract_feed_products(website)
+        
+        if website.get('pagination'):
+            return crawl_paginated(self, website)
+        return self.fetch_and_search_page(website, website['url'])
+        
+    def get_scan_known_hashes(self, website: Dict[str, Any]) -> Optional[set]:
+        """Hashes déjà détectés, si les budgets de parcours du site en dépendent"""
+        scan_limits = website.get('scan_limits', {})
+        if not self.config['monitoring_settings']['avoid_duplicates']:
+            return None
+        if not (scan_limits.get('stop_after_known') or scan_limits.get('max_matches')):
+            return None
+        return set(self.detected_products.get(self.get_site_key(website), []))
+        
+    def fetch_and_search_page(self, website: Dict[str, Any], url: str) -> Optional[List[Dict[str, str]]]:
+        """Récupère une page de résultats et retourne ses produits correspondants"""
+        result = self.fetch_results_page(website, url)
+        return result[0] if result is not None else None
+        
+    def fetch_results_page(self, website: Dict[str, Any], url: str, next_selector: Optional[str] = None,
+                           missing_ok: bool = False) -> Optional[Tuple[List[Dict[str, str]], Optional[str]]]:
+        """Récupère une page de résultats : produits correspondants et lien `next_selector`
+        
+        Toutes les pages d'un site (première page et pages suivantes) passent
+        par ce chemin : pool de parsing, cache et budgets s'appliquent de la
+        même façon. Retourne None si la page n'a pas pu être récupérée.
+        """
+        page_website = dict(website, url=url)
+        known_hashes = self.get_scan_known_hashes(website)
+        if self.use_selenium:
+            soup = self.fetch_page(page_website)
+            if not soup:
+                return None
+            try:
+                return self.search_products(soup, page_website, known_hashes), next_page_href(soup, next_selector)
+            finally:
+                soup.decompose()
+        
+        content = self.fetch_raw(url, page_website, missing_ok=missing_ok)
+        if content is None:
+            return None
+        return self.parse_page(content, page_website, known_hashes, next_selector)
+        
+    def get_parse_pool(self) -> Optional[ProcessPoolExecutor]:
+        """Retourne le pool de processus de parsing (None si désactivé)"""
+        workers = self.config['advanced_settings'].get('parse_workers', 0)
+        if workers <= 0:
+            return None
+        with self.host_lock:
+            if self.parse_pool is None:
+                self.parse_pool = lazy_import('parse_pool').create_parse_pool(workers, type(self), self.config)
+                self.logger.info(f"⚙️ Pool de parsing démarré ({workers} processus)")
+            return self.parse_pool
+            
+    def shutdown_parse_pool(self):
+        """Arrête le pool de parsing ; il sera recréé à la prochaine page"""
+        with self.host_lock:
+            pool, self.parse_pool = self.parse_pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+            
+    def parse_products(self, content: bytes, website: Dict[str, Any],
+                       known_hashes: Optional[set] = None) -> List[Dict[str, str]]:
+        """Parse le HTML brut et extrait les produits, dans le pool si configuré"""
+        return self.parse_page(content, website, known_hashes)[0]
+        
+    def parse_page(self, content: bytes, website: Dict[str, Any], known_hashes: Optional[set] = None,
+                   next_selector: Optional[str] = None) -> Tuple[List[Dict[str, str]], Optional[str]]:
+        """Parse le HTML brut et extrait les produits et le lien suivant, dans le pool si configuré
+        
+        Le worker reçoit les octets bruts et la configuration du site et ne
+        renvoie que les dictionnaires produits et le lien : aucun soup n'est
+        sérialisé. Le cache est ignoré quand le résultat dépend de l'état
+        (produits déjà connus) ou du temps (budget `max_seconds`).
+        """
+        cache = get_parse_cache(self.config['advanced_settings'].get('parse_cache', {}))
+        if known_hashes is not None or website.get('scan_limits', {}).get('max_seconds'):
+            cache = None
+        cache_key = None
+        if cache is not None:
+            cache_key = ParsedPageCache.make_key(website['url'], content,
+                                                 f"{self.get_site_fingerprint(website)}\n{next_selector or ''}")
+            cached = cache.get(cache_key)
+            if cached is not None:
+                self.logger.info(f"♻️ Page {website['name']} inchangée, {len(cached[0])} produit(s) repris du cache")
+                return cached
+        
+        parse_and_search = lazy_import('parse_pool').parse_and_search
+        pool = self.get_parse_pool()
+        if pool is None:
+            result = parse_and_search(content, website, known_hashes, next_selector, self)
+        else:
+            result = pool.submit(parse_and_search, content, website, known_hashes, next_selector).result()
+        
+        if cache is not None:
+            cache.put(cache_key, *result)
+        return result
+        
+    def get_site_fingerprint(self, website: Dict[str, Any]) -> str:
+        """Empreinte des paramètres qui influencent l'extraction d'une page"""
+        return json.dumps(
+            [website, self.config['advanced_settings'].get('exclude_terms', [])],
+            sort_keys=True, ensure_ascii=False
+        )
+        
+    def get_matching_settings(self) -> Dict[str, Any]:
+        """Paramètres de correspondance des titres (`advanced_settings.matching`)"""
+        return self.config['advanced_settings'].get('matching', {})
+        
+    def get_title_matcher(self, search_terms: List[str], exclude_terms: List[str]):
+        """Matcher normalisé pour une page (None en mode `substring`, le mode par défaut)"""
+        settings = self.get_matching_settings()
+        if settings.get('mode', 'substring') == 'substring':
+            return None
+        return lazy_import('title_matching').TitleMatcher(search_terms, exclude_terms, settings)
+        
+    def title_matches(self, title: str, search_terms: List[str], exclude_terms: List[str], matcher=None) -> bool:
+        """Vérifie qu'un titre contient un terme recherché et aucun terme exclu
+        
+        Sans `matcher`, la recherche porte sur les sous-chaînes du titre en
+        minuscules ; sinon sur ses mots normalisés (voir title_matching.py).
+        """
+        if matcher is not None:
+            covered = matcher.cover(title)
+            found = matcher.matches_any(matcher.search_terms, covered)
+            excluded = found and matcher.matches_any(matcher.exclude_terms, covered)
+        else:
+            title_lower = title.lower()
+            found = any(term in title_lower for term in search_terms)
+            excluded = found and any(exclude_term in title_lower for exclude_term in exclude_terms)
+        
+        # Vérifier si le titre contient un terme recherché
+        if not found:
+            self.logger.debug(f"Produit exclu: '{title[:50]}...' ne contient aucun terme recherché dans le titre")
+            return False
+            
+        # Vérifier si le titre contient un terme exclu
+        if excluded:
+            self.logger.debug(f"Produit exclu car le titre contient un terme banni: '{title[:50]}...'")
+            return False
+        
+        return True
+        
+    def search_products(self, soup: BeautifulSoup, website: Dict[str, Any],
+                        known_hashes: Optional[set] = None) -> List[Dict[str, str]]:
+        """Recherche les produits correspondants aux termes de recherche
+        
+        Les budgets `scan_limits` du site (éléments examinés, correspondances,
+        durée) arrêtent le parcours de la page dès qu'ils sont atteints. Avec
+        `known_hashes`, `max_matches` ne compte que les nouveaux produits et
+        `stop_after_known` arrête le parcours après une série de produits déjà vus.
+        """
         found_products = []
-        search_terms = [term.lower() for term in website['search_terms']]
-        exclude_terms = [term.lower() for term in self.config['advanced_settings']['exclude_terms']]
+        search_terms = self.get_search_terms(website)
+        exclude_terms = self.get_exclude_terms()
+        matcher = self.get_title_matcher(search_terms, exclude_terms)
         selectors = website['selectors']
         
+        scan_limits = website.get('scan_limits', {})
+        max_elements = scan_limits.get('max_elements')
+        max_matches = scan_limits.get('max_matches')
+        stop_after_known = scan_limits.get('stop_after_known') if known_hashes is not None else None
+        deadline = time.monotonic() + scan_limits['max_seconds'] if scan_limits.get('max_seconds') else None
+        examined = 0
+        counted_matches = 0
+        known_run = 0
+        
         try:
-            # Recherche des conteneurs de produits
-            product_elements = []
-            for selector in selectors['product_containers']:
-                elements = soup.select(selector)
-                if elements:
-                    product_elements.extend(elements)
-                    self.logger.debug(f"Trouvé {len(elements)} éléments avec '{selector}'")
+            # Conteneurs parcourus à la demande (arrêt anticipé possible)
+            product_elements = self.iter_product_elements(soup, selectors, search_terms, matcher)
             
-            # Si aucun conteneur spécifique trouvé, recherche globale dans le DOM
-            if not product_elements:
-                self.logger.info("Aucun conteneur spécifique trouvé, recherche globale dans le DOM")
-                text_content = soup.get_text().lower()
-                
-                # Vérifier si au moins un terme de recherche est présent
-                found_terms = []
-                for search_term in search_terms:
-                    if search_term in text_content:
-                        found_terms.append(search_term)
-                        self.logger.info(f"Terme '{search_term}' trouvé dans le contenu global")
-                
-                if found_terms:
-                    # Méthode 1: Recherche dans les liens avec texte contenant le terme
-                    links = soup.find_all('a', href=True)
-                    for link in links:
-                        link_text = link.get_text().lower()
-                        if any(term in link_text for term in search_terms):
-                            # Prendre l'élément parent le plus approprié (div, li, article, etc.)
-                            parent = link.parent
-                            while parent and parent.name in ['span', 'strong', 'em', 'b', 'i']:
-                                parent = parent.parent
-                            product_elements.append(parent if parent else link)
-                    
-                    # Méthode 2: Recherche dans tous les éléments texte contenant le terme
-                    if not product_elements:
-                        all_elements = soup.find_all(text=True)
-                        for text_node in all_elements:
-                            if any(term in text_node.lower() for term in search_terms):
-                                element = text_node.parent
-                                # Remonter jusqu'à un élément conteneur significatif
-                                while element and element.name in ['span', 'strong', 'em', 'b', 'i', 'small']:
-                                    element = element.parent
-                                if element and element not in product_elements:
-                                    product_elements.append(element)
-                    
-                    # Méthode 3: Recherche par attributs (title, alt, data-*, etc.)
-                    if not product_elements:
-                        for search_term in found_terms:
-                            # Recherche dans les attributs title, alt, data-*
-                            elements_with_attrs = soup.find_all(attrs=lambda x: x and any(
-                                search_term in str(v).lower() for v in x.values() if v
-                            ))
-                            for elem in elements_with_attrs:
-                                if elem not in product_elements:
-                                    product_elements.append(elem)
-                    
-                    self.logger.info(f"Recherche globale: {len(product_elements)} éléments trouvés avec les termes {found_terms}")
-                
-                # Si toujours rien trouvé, créer un produit générique pour signaler la présence
-                if found_terms and not product_elements:
-                    self.logger.info("Création d'un produit générique pour signaler la présence du terme")
-                    # Créer un élément fictif pour signaler qu'on a trouvé le terme quelque part
-                    generic_product = soup.new_tag('div')
-                    generic_product.string = f"Produit trouvé contenant: {', '.join(found_terms)}"
-                    product_elements.append(generic_product)
+            # Filtrage STRICT : le terme recherché doit être dans le TITRE uniquement.
+            # Le titre est filtré avant d'extraire les autres champs du produit.
+            def accept_title(title: str) -> bool:
+                return self.title_matches(title, search_terms, exclude_terms, matcher)
             
             # Analyser chaque élément trouvé
             for element in product_elements:
+                if max_elements and examined >= max_elements:
+                    self.logger.info(f"⏹️ Budget de {max_elements} élément(s) atteint sur {website['name']}")
+                    break
+                if deadline is not None and time.monotonic() > deadline:
+                    self.logger.info(f"⏹️ Budget de {scan_limits['max_seconds']}s atteint sur {website['name']}")
+                    break
+                examined += 1
+                
                 try:
-                    element_text = element.get_text().lower()
-                    
-                    # Extraire d'abord les informations du produit
-                    product_info = self.extract_product_info(element, selectors, website['url'])
-                    if not product_info or not product_info['title']:
+                    record = self.extract_product_record(element, selectors, website['url'], accept_title)
+                    if record is None:
                         continue
                     
-                    # Filtrage STRICT : vérifier que le terme recherché est dans le TITRE uniquement
-                    title_lower = product_info['title'].lower()
+                    product = record.as_dict()
+                    found_products.append(product)
                     
-                    # Vérifier si le titre contient un terme recherché
-                    if not any(term in title_lower for term in search_terms):
-                        self.logger.debug(f"Produit exclu: '{product_info['title'][:50]}...' ne contient aucun terme recherché dans le titre")
-                        continue
-                        
-                    # Vérifier si le titre contient un terme exclu
-                    if any(exclude_term in title_lower for exclude_term in exclude_terms):
-                        self.logger.debug(f"Produit exclu car le titre contient un terme banni: '{product_info['title'][:50]}...'")
-                        continue
+                    if known_hashes is not None:
+                        if self.generate_product_hash(product) in known_hashes:
+                            known_run += 1
+                            if stop_after_known and known_run >= stop_after_known:
+                                self.logger.info(f"⏹️ {known_run} produits déjà connus d'affilée sur {website['name']}, fin du parcours")
+                                break
+                            continue
+                        known_run = 0
                     
-                    found_products.append(product_info)
+                    counted_matches += 1
+                    if max_matches and counted_matches >= max_matches:
+                        self.logger.info(f"⏹️ {max_matches} correspondance(s) atteinte(s) sur {website['name']}")
+                        break
                         
                 except Exception as e:
                     self.logger.debug(f"Erreur lors de l'analyse d'un élément: {e}")
                     continue
             
-            self.logger.info(f"Trouvé {len(found_products)} produits correspondants")
+            self.logger.info(f"Trouvé {len(found_products)} produits correspondants ({examined} élément(s) examiné(s))")
             return found_products
             
         except Exception as e:
             self.logger.error(f"Erreur lors de la recherche de produits: {e}")
             return []
             
-    def extract_product_info(self, element, selectors: Dict[str, List[str]], base_url: str) -> Optional[Dict[str, str]]:
-        """Extrait les informations d'un produit depuis un élément HTML"""
+    def iter_product_elements(self, soup: BeautifulSoup, selectors: Dict[str, List[str]], search_terms: List[str],
+                              matcher=None):
+        """Produit les éléments candidats à l'extraction, dans l'ordre de la page
+        
+        Les conteneurs sont sélectionnés au fil du document : un appelant qui
+        s'arrête tôt (budgets de parcours) n'évalue pas la suite de la page. La
+        recherche globale de repli applique le même `matcher` que les titres.
+        """
+        # Recherche des conteneurs de produits (une seule passe, sans doublons)
+        found_containers = False
+        for element in self.select_product_containers(soup, selectors['product_containers']):
+            found_containers = True
+            yield element
+        if found_containers:
+            return
+        product_elements = []
+        
+        def terms_in(text: str, terms: List[str]) -> List[str]:
+            """Termes présents dans un texte (sous-chaîne ou mots normalisés)"""
+            if matcher is not None:
+                return matcher.found_terms(text, terms)
+            text = text.lower()
+            return [term for term in terms if term in text]
+        
+        # Si aucun conteneur spécifique trouvé, recherche globale dans le DOM
+        if not product_elements:
+            self.logger.info("Aucun conteneur spécifique trouvé, recherche globale dans le DOM")
+            
+            # Vérifier si au moins un terme de recherche est présent
+            found_terms = terms_in(soup.get_text(), search_terms)
+            for search_term in found_terms:
+                self.logger.info(f"Terme '{search_term}' trouvé dans le contenu global")
+            
+            if found_terms:
+                # Méthode 1: Recherche dans les liens avec texte contenant le terme
+                links = soup.find_all('a', href=True)
+                for link in links:
+                    if terms_in(link.get_text(), search_terms):
+                        # Prendre l'élément parent le plus approprié (div, li, article, etc.)
+                        parent = link.parent
+                        while parent and parent.name in ['span', 'strong', 'em', 'b', 'i']:
+                            parent = parent.parent
+                        product_elements.append(parent if parent else link)
+                
+                # Méthode 2: Recherche dans tous les éléments texte contenant le terme
+                if not product_elements:
+                    all_elements = soup.find_all(text=True)
+                    for text_node in all_elements:
+                        if terms_in(text_node, search_terms):
+                            element = text_node.parent
+                            # Remonter jusqu'à un élément conteneur significatif
+                            while element and element.name in ['span', 'strong', 'em', 'b', 'i', 'small']:
+                                element = element.parent
+                            if element and element not in product_elements:
+                                product_elements.append(element)
+                
+                # Méthode 3: Recherche par attributs (title, alt, data-*, etc.)
+                if not product_elements:
+                    product_elements = soup.find_all(attrs=lambda x: x and any(
+                        terms_in(str(v), found_terms) for v in x.values() if v
+                    ))
+                
+                self.logger.info(f"Recherche globale: {len(product_elements)} éléments trouvés avec les termes {found_terms}")
+            
+            # Si toujours rien trouvé, créer un produit générique pour signaler la présence
+            if found_terms and not product_elements:
+                self.logger.info("Création d'un produit générique pour signaler la présence du terme")
+                # Créer un élément fictif pour signaler qu'on a trouvé le terme quelque part
+                generic_product = soup.new_tag('div')
+                generic_product.string = f"Produit trouvé contenant: {', '.join(found_terms)}"
+                product_elements.append(generic_product)
+        
+        yield from product_elements
+        
+    def select_product_containers(self, soup: BeautifulSoup, container_selectors: List[str]):
+        """Produit les conteneurs de produits au fil du document, sans doublons
+        
+        Les sélecteurs sont évalués ensemble et paresseusement (chaque nœud
+        n'est retenu qu'une fois, dans l'ordre du document), puis les
+        correspondances imbriquées sont réduites : un conteneur englobant
+        plusieurs conteneurs avec lien (liste) est remplacé par ceux-ci, sinon
+        seul le conteneur le plus externe est gardé. Un appelant qui s'arrête
+        tôt n'évalue pas la suite de la page.
+        """
+        if not container_selectors:
+            return
+        soupsieve = lazy_import('soupsieve')
         try:
-            product_info = {
-                'title': '',
-                'price': '',
-                'link': '',
-                'description': '',
-                'image': ''
-            }
+            candidates = soupsieve.compile(', '.join(container_selectors)).iselect(soup)
+        except Exception:
+            # Un sélecteur invalide fait échouer la passe combinée : seuls les valides sont gardés
+            matchers = []
+            for selector in container_selectors:
+                try:
+                    matchers.append(soupsieve.compile(selector).match)
+                except Exception as e:
+                    self.logger.warning(f"Sélecteur invalide ignoré '{selector}': {e}")
+            candidates = (element for element in soup.descendants
+                          if getattr(element, 'attrs', None) is not None and any(match(element) for match in matchers))
+        
+        yield from iter_reduced_containers(candidates)
+        
+    def extract_product_record(self, element, selectors: Dict[str, List[str]], base_url: str,
+                               accept_title: Optional[Callable[[str], bool]] = None) -> Optional[ProductRecord]:
+        """Extrait un produit depuis un élément HTML sous forme compacte
+        
+        Le texte complet de l'élément n'est calculé qu'une fois, et seulement
+        si un champ en a besoin. Si `accept_title` refuse le titre, les autres
+        champs ne sont pas extraits.
+        """
+        try:
+            record = ProductRecord()
+            full_text = None
             
             # Extraction du titre
             for selector in selectors['title']:
                 title_elem = element.select_one(selector)
                 if title_elem:
-                    product_info['title'] = title_elem.get_text().strip()
+                    record.title = title_elem.get_text().strip()
                     break
             
             # Si pas de titre spécifique, utiliser le texte de l'élément (tronqué)
-            if not product_info['title']:
+            if not record.title:
                 full_text = element.get_text().strip()
-                # Pour la recherche globale, essayer d'extraire une phrase pertinente
                 if len(full_text) > 100:
-                    # Chercher la première phrase contenant un terme de recherche
-                    sentences = full_text.split('.')
-                    for sentence in sentences:
-                        if any(term in sentence.lower() for term in [t.lower() for t in element.get('data-search-terms', [])]):
-                            product_info['title'] = sentence.strip()[:100]
-                            break
-                    if not product_info['title']:
-                        product_info['title'] = full_text[:100] + "..." if len(full_text) > 100 else full_text
+                    # Pour la recherche globale, chercher la première phrase contenant un terme
+                    attr_terms = [t.lower() for t in element.get('data-search-terms', [])]
+                    if attr_terms:
+                        for sentence in full_text.split('.'):
+                            sentence_lower = sentence.lower()
+                            if any(term in sentence_lower for term in attr_terms):
+                                record.title = sentence.strip()[:100]
+                                break
+                    if not record.title:
+                        record.title = full_text[:100] + "..."
                 else:
-                    product_info['title'] = full_text
+                    record.title = full_text
             
-            # Extraction du prix
-            for selector in selectors['price']:
-                price_elem = element.select_one(selector)
-                if price_elem:
-                    product_info['price'] = price_elem.get_text().strip()
-                    break
+            if not record.title or (accept_title is not None and not accept_title(record.title)):
+                return None
             
-            # Extraction du lien
-            for selector in selectors['link']:
-                link_elem = element.select_one(selector)
-                if link_elem and link_elem.get('href'):
-                    href = link_elem['href']
-                    product_info['link'] = urljoin(base_url, href)
-                    break
-            
-            # Extraction de la description
-            for selector in selectors.get('description', []):
-                desc_elem = element.select_one(selector)
-                if desc_elem:
-                    product_info['description'] = desc_elem.get_text().strip()[:200]
-                    break
+            # Prix, lien, description et image en un seul parcours de l'élément
+            fields, image, data_link = self.scan_product_fields(element, selectors)
+            if fields['price'] is not None:
+                record.price = fields['price'].get_text().strip()
+            if fields['link'] is not None:
+                record.link = urljoin(base_url, fields['link']['href'])
+            elif data_link:
+                record.link = urljoin(base_url, data_link)
+            if fields['description'] is not None:
+                record.description = fields['description'].get_text().strip()[:200]
+            if image:
+                record.image = urljoin(base_url, image)
             
             # Si pas de description spécifique, utiliser le texte de l'élément
-            if not product_info['description']:
-                product_info['description'] = element.get_text().strip()[:200]
-            
-            # Extraction de l'image (optionnel)
-            img_elem = element.select_one('img')
-            if img_elem and img_elem.get('src'):
-                product_info['image'] = urljoin(base_url, img_elem['src'])
+            if not record.description:
+                if full_text is None:
+                    full_text = element.get_text().strip()
+                record.description = full_text[:200]
             
-            return product_info if product_info['title'] else None
+            return record
             
         except Exception as e:
             self.logger.debug(f"Erreur lors de l'extraction des infos produit: {e}")
             return None
             
+    def scan_product_fields(self, element, selectors: Dict[str, List[str]]) -> Tuple[Dict[str, Any], str, str]:
+        """Parcourt une seule fois les descendants d'un élément pour les champs d'un produit
+        
+        Pour chaque champ, le premier élément (ordre du document) du sélecteur
+        le plus prioritaire est retenu, comme avec `select_one` essayé sélecteur
+        par sélecteur ; un lien doit porter un href. L'image vient de la première
+        <img> ou <picture> (data-src, srcset... avant `src`) ou d'une image de fond explicite.
+        Retourne (éléments par champ, URL de l'image, lien data-href de repli).
+        """
+        matchers = compile_field_selectors(tuple((field, tuple(selectors.get(field, []))) for field in SCANNED_FIELDS))
+        # Indice du meilleur sélecteur trouvé par champ (seuls les plus prioritaires restent à tester)
+        best_index = {field: len(field_matchers) for field, field_matchers in matchers}
+        found = dict.fromkeys(SCANNED_FIELDS)
+        dead_links = set()
+        image, image_fallback = image_url_from_tag(element)
+        
+        for tag in element.descendants:
+            if tag.name is None:
+                continue
+            for field, field_matchers in matchers:
+                for index in range(best_index[field]):
+                    if field == 'link' and index in dead_links:
+                        continue
+                    if field_matchers[index](tag):
+                        if field == 'link' and not tag.get('href'):
+                            # select_one aurait retenu cet élément sans href : sélecteur écarté
+                            dead_links.add(index)
+                            continue
+                        best_index[field] = index
+                        found[field] = tag
+                        break
+            if not image:
+                image, fallback = image_url_from_tag(tag)
+                image_fallback = image_fallback or fallback
+            if image and not any(best_index.values()):
+                break
+        
+        # Fiche sans <a href> (carte cliquable) : lien porté par l'élément ou un attribut data-*
+        data_link = ''
+        if found['link'] is None:
+            holder = element if element.get('href') or any(element.get(a) for a in LINK_DATA_ATTRIBUTES) else \
+                element.find(lambda tag: any(tag.get(a) for a in LINK_DATA_ATTRIBUTES))
+            if holder is not None:
+                data_link = holder.get('href') or next(holder[a] for a in LINK_DATA_ATTRIBUTES if holder.get(a))
+        return found, image or image_fallback, data_link
+        
+    def extract_product_info(self, element, selectors: Dict[str, List[str]], base_url: str) -> Optional[Dict[str, str]]:
+        """Extrait les informations d'un produit depuis un élément HTML"""
+        record = self.extract_product_record(element, selectors, base_url)
+        return record.as_dict() if record is not None else None
+            
+    def resolve_json_path(self, data: Any, path: str) -> Any:
+        """Résout un chemin pointé (ex: 'offers.0.price') dans une structure JSON"""
+        current = data
+        for part in path.split('.') if path else []:
+            if isinstance(current, list):
+                if part.isdigit() and int(part) < len(current):
+                    current = current[int(part)]
+                elif current and isinstance(current[0], dict):
+                    # Liste d'objets sans index explicite : prendre le premier
+                    current = current[0].get(part)
+                else:
+                    return None
+            elif isinstance(current, dict):
+                current = current.get(part)
+            else:
+                return None
+            if current is None:
+                return None
+        return current
+        
+    def json_field_value(self, item: Dict[str, Any], paths: Any) -> str:
+        """Retourne la première valeur non vide parmi un ou plusieurs chemins JSON"""
+        for path in ([paths] if isinstance(paths, str) else paths):
+            value = self.resolve_json_path(item, path)
+            # Les listes (ex: plusieurs images) et objets (ex: ImageObject) sont réduits
+            while isinstance(value, list):
+                value = value[0] if value else None
+            if isinstance(value, dict):
+                value = value.get('url') or value.get('name') or value.get('@id')
+            if value not in (None, ''):
+                return str(value).strip()
+        return ''
+        
+    def find_json_ld_products(self, data: Any) -> List[Dict[str, Any]]:
+        """Parcourt un bloc JSON-LD et retourne les objets de type Product"""
+        products = []
+        stack = [data]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, list):
+                stack.extend(reversed(node))
+            elif isinstance(node, dict):
+                node_type = node.get('@type', '')
+                types = node_type if isinstance(node_type, list) else [node_type]
+                if 'Product' in types or 'ProductGroup' in types:
+                    products.append(node)
+                    continue
+                # Conteneurs usuels: @graph, ItemList/ListItem
+                for key in ('@graph', 'itemListElement', 'item', 'mainEntity'):
+                    if key in node:
+                        stack.append(node[key])
+        return products
+        
+    def load_json_sources(self, website: Dict[str, Any], url: Optional[str] = None) -> Optional[List[Any]]:
+        """Récupère les blocs JSON d'un site (JSON-LD, état inline ou API)"""
+        json_settings = website.get('json_extraction', {})
+        source = json_settings.get('source', 'ld+json')
+        if url is None:
+            url = json_settings.get('url', website['url']) if source == 'url' else website['url']
+        
+        content = self.fetch_raw(url, website)
+        if content is None:
+            return None
+        text = content.decode('utf-8', errors='replace')
+        
+        if source == 'url':
+            raw_blocks = [text]
+        elif source == 'script':
+            if json_settings.get('script_pattern'):
+                # Ex: window.__INITIAL_STATE__ = {...};
+                raw_blocks = [m.group(1) for m in re.finditer(json_settings['script_pattern'], text, re.DOTALL)]
+            else:
+                script_id = re.escape(json_settings.get('script_id', '__NEXT_DATA__'))
+                raw_blocks = re.findall(
+                    rf'<script[^>]*\bid=["\']{script_id}["\'][^>]*>(.*?)</script>', text, re.DOTALL | re.IGNORECASE
+                )
+        else:
+            raw_blocks = JSON_LD_PATTERN.findall(text)
+        
+        blocks = []
+        for raw in raw_blocks:
+            try:
+                blocks.append(json.loads(raw.strip()))
+            except ValueError as e:
+                self.logger.debug(f"Bloc JSON ignoré sur {website['name']}: {e}")
+        
+        self.logger.debug(f"{len(blocks)} bloc(s) JSON trouvé(s) sur {website['name']} (source: {source})")
+        return blocks
+        
+    def collect_json_items(self, blocks: List[Any], json_settings: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Extrait les objets produits des blocs JSON"""
+        items = []
+        for block in blocks:
+            if json_settings.get('items_path'):
+                found = self.resolve_json_path(block, json_settings['items_path'])
+                if isinstance(found, dict):
+                    found = list(found.values()) if json_settings.get('items_are_mapping') else [found]
+                items.extend(item for item in (found or []) if isinstance(item, dict))
+            elif json_settings.get('source', 'ld+json') == 'ld+json':
+                items.extend(self.find_json_ld_products(block))
+            elif isinstance(block, list):
+                items.extend(item for item in block if isinstance(item, dict))
+            else:
+                # Objet sans chemin vers la liste de produits : rien à extraire
+                content = ', '.join(list(block)[:5]) if isinstance(block, dict) else type(block).__name__
+                self.logger.warning(f"⚠️ Bloc JSON ignoré ({content}) : json_extraction.items_path requis "
+                                    f"pour la source '{json_settings.get('source')}'")
+        return items
+        
+    def cursor_is_newer(self, value: Any, cursor: Any) -> bool:
+        """Compare une valeur de curseur (nombre ou date ISO) au curseur stocké"""
+        if cursor in (None, ''):
+            return True
+        if value is None:
+            return False
+        try:
+            return float(value) > float(cursor)
+        except (TypeError, ValueError):
+            return str(value) > str(cursor)
+        
+    def extract_json_products(self, website: Dict[str, Any]) -> Optional[List[Dict[str, str]]]:
+        """Extrait les produits depuis des données JSON sans rendu HTML
+        
+        Les produits retournés ont la même forme que ceux de extract_product_info.
+        Avec `cursor_field`, seuls les objets plus récents que le dernier curseur
+        sont retenus, et un endpoint paginé (`page_param`) est parcouru jusqu'à
+        la première page sans nouveauté. Retourne None si la source n'a pas pu
+        être récupérée.
+        """
+        json_settings = website.get('json_extraction', {})
+        cursor_field = json_settings.get('cursor_field')
+        page_param = json_settings.get('page_param') if json_settings.get('source') == 'url' else None
+        site_key = self.get_site_key(website)
+        cursor = self.site_cursors.get(site_key, {}).get('cursor')
+        
+        search_terms = self.get_search_terms(website)
+        exclude_terms = self.get_exclude_terms()
+        matcher = self.get_title_matcher(search_terms, exclude_terms)
+        fields = dict(DEFAULT_JSON_FIELDS)
+        fields.update(json_settings.get('fields', {}))
+        
+        # Collecte des objets produits (page par page si l'endpoint est paginé)
+        items = []
+        highest = cursor
+        page = json_settings.get('first_page', 1)
+        for _ in range(json_settings.get('max_pages', 10) if page_param else 1):
+            url = None
+            if page_param:
+                base_url = json_settings.get('url', website['url'])
+                separator = '&' if '?' in base_url else '?'
+                url = f"{base_url}{separator}{urlencode({page_param: page})}"
+            blocks = self.load_json_sources(website, url)
+            if blocks is None:
+                if not items:
+                    return None
+                break
+            page_items = self.collect_json_items(blocks, json_settings)
+            if cursor_field:
+                page_items = [
+                    item for item in page_items
+                    if self.cursor_is_newer(self.resolve_json_path(item, cursor_field), cursor)
+                ]
+                for item in page_items:
+                    value = self.resolve_json_path(item, cursor_field)
+                    if value is not None and self.cursor_is_newer(value, highest):
+                        highest = value
+            if not page_items:
+                break
+            items.extend(page_items)
+            page += 1
+        
+        if cursor_field and highest != cursor:
+            self.pending_cursors[site_key] = {'cursor': highest}
+        
+        found_products = []
+        for item in items:
+            product_info = {
+                'title': self.json_field_value(item, fields['title']),
+                'price': self.json_field_value(item, fields['price']),
+                'link': self.json_field_value(item, fields['link']),
+                'description': self.json_field_value(item, fields['description'])[:200],
+                'image': self.json_field_value(item, fields['image'])
+            }
+            if not product_info['title']:
+                continue
+            if not self.title_matches(product_info['title'], search_terms, exclude_terms, matcher):
+                continue
+            
+            if product_info['link']:
+                product_info['link'] = urljoin(website['url'], product_info['link'])
+            if product_info['image']:
+                product_info['image'] = urljoin(website['url'], product_info['image'])
+            currency = self.json_field_value(item, fields.get('currency', []))
+            if product_info['price'] and currency:
+                product_info['price'] = f"{product_info['price']} {currency}"
+            found_products.append(product_info)
+        
+        self.logger.info(f"Trouvé {len(found_products)} produits correspondants ({len(items)} objets JSON analysés)")
+        return found_products
+        
+    def fetch_feed_entries(self, url: str, website: Dict[str, Any], cursor: Dict[str, Any],
+                           new_cursor: Dict[str, Any], depth: int = 0) -> Optional[List[Dict[str, str]]]:
+        """Récupère les entrées d'un flux ou sitemap (index de sitemaps inclus)"""
+        feed_settings = website.get('feed_settings', {})
+        extra_headers = {}
+        if depth == 0:
+            # GET conditionnel : un 304 signifie qu'aucune entrée n'a changé
+            if cursor.get('etag'):
+                extra_headers['If-None-Match'] = cursor['etag']
+            if cursor.get('http_last_modified'):
+                extra_headers['If-Modified-Since'] = cursor['http_last_modified']
+        
+        response = self.fetch_response(url, website, extra_headers)
+        if response is None:
+            return None
+        if response.status_code == 304:
+            self.logger.info(f"ℹ️ Flux inchangé depuis le dernier passage: {url}")
+            return []
+        if depth == 0:
+            new_cursor['etag'] = response.headers.get('ETag', '')
+            new_cursor['http_last_modified'] = response.headers.get('Last-Modified', '')
+        
+        ET = lazy_import('xml.etree.ElementTree')
+        feeds = lazy_import('feeds')
+        try:
+            root = ET.fromstring(response.content)
+        except ET.ParseError as e:
+            self.logger.error(f"Flux XML invalide pour {website['name']}: {e}")
+            return None
+        
+        if feeds.local_name(root.tag) != 'sitemapindex':
+            return feeds.parse_feed_entries(root)
+        
+        # Index de sitemaps : ne suivre que les sitemaps modifiés depuis le curseur
+        entries = []
+        last_modified = cursor.get('last_modified', '')
+        max_children = feed_settings.get('max_child_sitemaps', 20)
+        for loc, lastmod in feeds.sitemap_index_children(root):
+            if max_children <= 0 or depth >= 2:
+                break
+            if lastmod and last_modified and lastmod <= last_modified:
+                continue
+            max_children -= 1
+            child_entries = self.fetch_feed_entries(loc, website, cursor, new_cursor, depth + 1)
+            if child_entries:
+                entries.extend(child_entries)
+        return entries
+        
+    def extract_feed_products(self, website: Dict[str, Any]) -> Optional[List[Dict[str, str]]]:
+        """Découverte incrémentale via sitemap XML ou flux RSS/Atom
+        
+        Seules les entrées postérieures au curseur du site (date de dernière
+        modification ou identifiants déjà vus) passent le filtrage par termes.
+        Le nouveau curseur est validé en fin de cycle par commit_site_cursors.
+        """
+        feed_settings = website.get('feed_settings', {})
+        site_key = self.get_site_key(website)
+        cursor = self.site_cursors.get(site_key, {})
+        new_cursor = {}
+        
+        entries = self.fetch_feed_entries(feed_settings.get('url', website['url']), website, cursor, new_cursor)
+        if entries is None:
+            return None
+        
+        new_entries = lazy_import('feeds').advance_cursor(entries, cursor, new_cursor,
+                                                          feed_settings.get('max_seen_ids', 2000))
+        if entries or new_cursor.get('etag') or new_cursor.get('http_last_modified'):
+            self.pending_cursors[site_key] = new_cursor
+        
+        search_terms = self.get_search_terms(website)
+        exclude_terms = self.get_exclude_terms()
+        matcher = self.get_title_matcher(search_terms, exclude_terms)
+        found_products = []
+        for entry in new_entries:
+            if not entry['title'] or not self.title_matches(entry['title'], search_terms, exclude_terms, matcher):
+                continue
+            found_products.append({
+                'title': entry['title'],
+                'price': '',
+                'link': urljoin(website['url'], entry['link']),
+                'description': entry['description'],
+                'image': entry['image']
+            })
+        
+        self.logger.info(f"Trouvé {len(found_products)} produits correspondants "
+                         f"({len(new_entries)} nouvelle(s) entrée(s) sur {len(entries)})")
+        return found_products
+        
+    def site_uses_cursor(self, website: Dict[str, Any]) -> bool:
+        """Vrai si le site n'est lu qu'au-delà d'un curseur (sitemap, flux, JSON avec `cursor_field`)"""
+        if website.get('extraction_mode') in ('sitemap', 'feed'):
+            return True
+        return website.get('extraction_mode') == 'json' and bool(website.get('json_extraction', {}).get('cursor_field'))
+        
+    def get_max_products_per_alert(self, website: Dict[str, Any]) -> Optional[int]:
+        """Limite de produits signalés par alerte pour un site (None : pas de report)
+        
+        Les entrées d'un site à curseur ne sont lues qu'une fois : un produit
+        reporté ne reviendrait jamais, la limite ne s'y applique donc pas.
+        """
+        if self.site_uses_cursor(website):
+            return None
+        return self.config['monitoring_settings'].get('max_products_per_alert')
+        
+    def get_change_settings(self, website: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Paramètres de détection de changements d'un site (None si désactivée)
+        
+        `monitoring_settings.change_detection` est complété par le
+        `change_detection` du site. Les modes sitemap/flux ne renvoient que les
+        nouvelles entrées : la comparaison de listes n'y a pas de sens.
+        """
+        settings = dict(self.config['monitoring_settings'].get('change_detection', {}))
+        settings.update(website.get('change_detection', {}))
+        if not settings.get('enabled'):
+            return None
+        if website.get('extraction_mode') in ('sitemap', 'feed'):
+            self.logger.debug(f"Détection de changements ignorée pour {website['name']} (mode incrémental)")
+            return None
+        return settings
+        
+    def process_site_changes(self, website: Dict[str, Any], found_products: List[Dict[str, str]],
+                             max_alerts: Optional[int] = None) -> Optional[Tuple[List[Dict[str, str]], int]]:
+        """Compare les produits extraits avec l'instantané précédent du site
+        
+        Retourne None si la liste est inchangée (ni déduplication ni alerte
+        nécessaires), sinon les produits à signaler et le nombre de changements
+        reportés au-delà de `max_alerts` (voir change_detection.compare_snapshot).
+        Le nouvel instantané est validé en fin de cycle par commit_site_snapshots.
+        """
+        settings = self.get_change_settings(website)
+        site_key = self.get_site_key(website)
+        previous = self.pending_snapshots.get(site_key) or self.site_snapshots.get(site_key, {})
+        # Premier instantané : les produits déjà signalés par hash ne sont pas "nouveaux"
+        baseline_hashes = set(self.detected_products.get(site_key, [])) if not previous else set()
+        result = compare_snapshot(previous, found_products, settings, baseline_hashes,
+                                  self.generate_product_hash, max_alerts)
+        if result is None:
+            return None
+        
+        self.pending_snapshots[site_key], alerts, deferred, counts = result
+        summary = ', '.join(f"{CHANGE_LABELS[kind].lower()}: {count}" for kind, count in counts.items()) or "aucun changement signalable"
+        self.logger.info(f"📸 Changements sur {website['name']}: {summary}")
+        return alerts, deferred
+        
     def send_email_alert(self, products_by_site: Dict[str, List[Dict[str, str]]]):
         """Envoie une alerte email pour tous les produits trouvés"""
         email_settings = self.config['email_settings']
@@ -460,6 +1813,10 @@ class UniversalWebMonitor:
         try:
             total_products = sum(len(products) for products in products_by_site.values())
             
+            smtplib = lazy_import('smtplib')
+            MIMEText = lazy_import('email.mime.text').MIMEText
+            MIMEMultipart = lazy_import('email.mime.multipart').MIMEMultipart
+            
             # Création du message
             msg = MIMEMultipart()
             msg['From'] = email_settings['sender_email']
@@ -520,7 +1877,7 @@ Excellente nouvelle ! Le bot de surveillance a détecté {total_products} produi
                 body += f"""
 PRODUIT {i}:
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-📦 Titre: {product['title']}
+📦 Titre: {product['title']}{describe_change(product)}
 💰 Prix: {product.get('price', 'Non spécifié')}
 🔗 Lien: {product.get('link', 'Non disponible')}
 📄 Description: {product.get('description', 'Aucune description')[:150]}...
@@ -556,49 +1913,266 @@ Configuration: {self.config.get('monitor_name', 'Configuration personnalisée')}
         
         return body
         
-    def check_all_websites(self):
-        """Fonction principale de vérification de tous les sites"""
+    def check_site(self, website: Dict[str, Any]) -> Optional[List[Dict[str, str]]]:
+        """Récupère les produits d'un site en journalisant les erreurs"""
+        self.logger.info(f"🔍 Vérification de {website['name']}...")
+        site_key = self.get_site_key(website)
+        self.in_flight[site_key] = time.time()
+        start = time.perf_counter()
+        try:
+            return self.collect_site_products(website)
+        except Exception as e:
+            self.logger.error(f"❌ Erreur lors de la vérification de {website['name']}: {e}")
+            self.check_errors[site_key] = str(e)
+            return None
+        finally:
+            self.check_seconds[site_key] = time.perf_counter() - start
+            self.in_flight.pop(site_key, None)
+            
+    def iter_site_results(self, websites: List[Dict[str, Any]]):
+        """Vérifie les sites et produit les couples (site, produits)
+        
+        Avec `max_concurrent_sites` > 1, les sites sont vérifiés en parallèle
+        (la politesse est alors assurée par la limite par hôte) et les résultats
+        sont produits dans leur ordre d'arrivée.
+        """
+        queue_settings = self.config['advanced_settings'].get('work_queue', {})
+        if queue_settings.get('enabled'):
+            yield from self.iter_queued_results(websites)
+            return
+        
+        max_concurrent = self.config['advanced_settings'].get('max_concurrent_sites', 1)
+        
+        if max_concurrent <= 1 or len(websites) <= 1:
+            for index, website in enumerate(websites):
+                if self.stop_event.is_set():
+                    return
+                yield website, self.check_site(website)
+                
+                # Délai entre les sites
+                if len(websites) > 1 and index < len(websites) - 1:
+                    delay = self.config['advanced_settings']['min_delay_between_sites']
+                    if delay > 0:
+                        self.logger.debug(f"⏱️ Attente {delay}s avant le site suivant")
+                        self.stop_event.wait(delay)
+            return
+        
+        # Arrêt demandé : les sites non commencés sont annulés, ceux en cours
+        # ont jusqu'à `shutdown.drain_seconds` pour se terminer
+        executor = ThreadPoolExecutor(max_workers=max_concurrent)
+        futures = {executor.submit(self.check_site, website): website for website in websites}
+        pending = set(futures)
+        deadline = None
+        try:
+            while pending:
+                done, pending = wait(pending, timeout=1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield futures[future], future.result()
+                if not self.stop_event.is_set() or not pending:
+                    continue
+                if deadline is None:
+                    for future in pending:
+                        future.cancel()
+                    pending = {future for future in pending if not future.cancelled()}
+                    deadline = time.monotonic() + self.get_shutdown_settings().get('drain_seconds', 30)
+                    self.logger.info(f"⏳ Arrêt: attente de {len(pending)} vérification(s) en cours")
+                elif time.monotonic() > deadline:
+                    self.logger.warning(f"⚠️ Arrêt: {len(pending)} vérification(s) abandonnée(s) après le délai de drainage")
+                    self.abandoned_checks += len(pending)
+                    break
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            
+    def iter_queued_results(self, websites: List[Dict[str, Any]]):
+        """Dépose un travail par site dans la file partagée et produit les résultats des workers
+        
+        Les workers (work_queue.py) ne font que récupérer et extraire : la
+        déduplication, les curseurs et l'alerte restent ici. Un site dont
+        toutes les tentatives ont échoué est produit avec None.
+        """
+        work_queue = lazy_import('work_queue')
+        settings = work_queue.get_queue_settings(self.config)
+        if self.work_queue is None:
+            self.work_queue = work_queue.WorkQueue.from_settings(settings)
+        
+        cycle = datetime.now().strftime('%Y%m%d%H%M%S%f')
+        websites_by_key = {self.get_site_key(website): website for website in websites}
+        # Les hashes connus voyagent avec le travail : l'arrêt anticipé du
+        # parcours se décide sur l'état du coordinateur, pas sur celui du worker
+        self.work_queue.enqueue_cycle(cycle, [
+            {'website': website, 'cursor': self.site_cursors.get(site_key),
+             'known_hashes': self.get_job_known_hashes(website)}
+            for site_key, website in websites_by_key.items()
+        ])
+        self.logger.info(f"📤 {len(websites_by_key)} travail(aux) déposé(s) dans {settings['path']}")
+        
+        remaining = set(websites_by_key)
+        started = time.time()
+        last_report = time.monotonic()
+        while remaining and not self.stop_event.is_set():
+            results = self.work_queue.take_results(cycle)
+            for payload, result, error in results:
+                site_key = self.get_site_key(payload['website'])
+                remaining.discard(site_key)
+                website = websites_by_key.get(site_key, payload['website'])
+                if result is None:
+                    self.logger.error(f"❌ {website['name']} abandonné par les workers: {error}")
+                    self.check_errors[site_key] = error
+                    yield website, None
+                    continue
+                if result.get('cursor') is not None:
+                    self.pending_cursors[site_key] = result['cursor']
+                if result.get('seconds') is not None:
+                    self.check_seconds[site_key] = result['seconds']
+                yield website, result['products']
+            
+            if remaining and not results:
+                reason = self.queue_wait_expired(settings, started)
+                if reason:
+                    self.logger.error(f"❌ {reason}: {len(remaining)} site(s) abandonné(s) "
+                                      f"(lancer: python work_queue.py worker <config>)")
+                    self.work_queue.abandon_cycle(cycle)
+                    for site_key, website in websites_by_key.items():
+                        if site_key in remaining:
+                            self.check_errors[site_key] = reason
+                            yield website, None
+                    return
+                if time.monotonic() - last_report >= 60:
+                    counts = self.work_queue.counts(cycle)
+                    self.logger.info(f"⏳ En attente des workers: {counts.get('pending', 0)} en attente, "
+                                     f"{counts.get('leased', 0)} en cours")
+                    last_report = time.monotonic()
+                self.stop_event.wait(settings['poll_seconds'])
+            
+    def get_job_known_hashes(self, website: Dict[str, Any]) -> Optional[List[str]]:
+        """Hashes détectés à transmettre au worker, si son parcours en dépend"""
+        pagination = website.get('pagination')
+        stops_when_known = (pagination and pagination.get('stop_when_all_known', True)
+                            and self.config['monitoring_settings']['avoid_duplicates'])
+        if stops_when_known or self.get_scan_known_hashes(website) is not None:
+            return self.detected_products.get(self.get_site_key(website), [])
+        return None
+        
+    def queue_wait_expired(self, settings: Dict[str, Any], started: float) -> Optional[str]:
+        """Raison d'abandonner l'attente des workers, None s'il faut continuer"""
+        now = time.time()
+        result_timeout = settings.get('result_timeout_seconds')
+        if result_timeout and now - started >= result_timeout:
+            return f"Résultats des workers non reçus après {result_timeout}s"
+        worker_timeout = settings.get('worker_timeout_seconds')
+        if worker_timeout and now - started >= worker_timeout:
+            last_seen = self.work_queue.last_heartbeat()
+            if last_seen is None or now - last_seen >= worker_timeout:
+                return f"Aucun worker actif depuis {worker_timeout}s"
+        return None
+        
+    def check_all_websites(self, websites: Optional[List[Dict[str, Any]]] = None):
+        """Fonction principale de vérification de tous les sites
+        
+        Avec `websites`, seuls ces sites sont vérifiés (vérification à la
+        demande) : ni filtre des échéances, ni point de reprise, pour ne pas
+        écraser celui d'un cycle complet interrompu.
+        """
+        full_cycle = websites is None
         self.logger.info("=" * 80)
         self.logger.info(f"🚀 DÉBUT DE LA SURVEILLANCE UNIVERSELLE - {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
         self.logger.info(f"📋 Configuration: {self.config.get('monitor_name', 'Sans nom')}")
         
         new_products_by_site = {}
+        if websites is None:
+            self.seen_hashes = {}
         
         try:
-            enabled_websites = [site for site in self.config['websites'] if site['enabled']]
+            enabled_websites = [site for site in self.config['websites']
+                                if site['enabled'] and self.get_site_key(site) not in self.paused_sites]
+            if websites is not None:
+                enabled_websites = websites
+                self.logger.info(f"🎯 Vérification à la demande: {', '.join(site['name'] for site in websites)}")
+            
+            # Reprise d'un cycle interrompu : seuls les sites restants sont vérifiés
+            checkpoint = self.load_checkpoint(enabled_websites) if full_cycle else None
+            if checkpoint is not None:
+                pending_keys = set(checkpoint['pending'])
+                enabled_websites = [site for site in enabled_websites if self.get_site_key(site) in pending_keys]
+                new_products_by_site = checkpoint.get('new_products_by_site', {})
+                for site_key, hashes in checkpoint.get('new_hashes', {}).items():
+                    known = self.detected_products.setdefault(site_key, [])
+                    known.extend(h for h in hashes if h not in known)
+                self.pending_cursors.update(checkpoint.get('pending_cursors', {}))
+                self.pending_snapshots.update(checkpoint.get('pending_snapshots', {}))
+                self.logger.info(f"🔁 Reprise du cycle interrompu du {checkpoint['started_at']}: {len(enabled_websites)} site(s) restant(s)")
+            else:
+                if websites is None:
+                    enabled_websites = self.get_due_websites(enabled_websites)
+                checkpoint = {
+                    'started_at': datetime.now().isoformat(timespec='seconds'),
+                    'pending': [self.get_site_key(site) for site in enabled_websites],
+                    'new_hashes': {}
+                }
+            checkpoint['new_products_by_site'] = new_products_by_site
+            if full_cycle:
+                self.save_checkpoint(checkpoint)
+            
             self.logger.info(f"🌐 Surveillance de {len(enabled_websites)} site(s)")
             
-            for website in enabled_websites:
+            for website, found_products in self.iter_site_results(enabled_websites):
                 site_name = website['name']
-                self.logger.info(f"🔍 Vérification de {site_name}...")
+                site_key = self.get_site_key(website)
+                site_new_hashes = []
                 
                 try:
-                    # Récupération de la page
-                    soup = self.fetch_page(website)
-                    if not soup:
+                    if found_products is None:
                         self.logger.warning(f"⚠️ Impossible de récupérer {site_name}")
                         continue
+                    self.export_products(website, found_products)
+                    self.mark_seen_products(site_key, found_products)
                     
-                    # Recherche des produits
-                    found_products = self.search_products(soup, website)
+                    max_per_alert = self.get_max_products_per_alert(website)
+                    if self.get_change_settings(website) is not None:
+                        # Détection de changements : le diff avec l'instantané remplace la déduplication
+                        changes = self.process_site_changes(website, found_products, max_per_alert)
+                        if changes is None:
+                            self.logger.info(f"📸 Liste inchangée sur {site_name}, déduplication et alerte ignorées")
+                            continue
+                        
+                        change_alerts, deferred = changes
+                        known = self.detected_products.setdefault(site_key, [])
+                        for product in found_products:
+                            product_hash = self.generate_product_hash(product)
+                            if product_hash not in known:
+                                known.append(product_hash)
+                                site_new_hashes.append(product_hash)
+                        if deferred:
+                            self.logger.info(f"⏭️ {deferred} changement(s) reporté(s) au prochain cycle (max_products_per_alert={max_per_alert})")
+                        if change_alerts:
+                            new_products_by_site[site_name] = change_alerts
+                            self.logger.info(f"🎯 {len(change_alerts)} changement(s) à signaler sur {site_name}")
+                        continue
                     
                     if found_products:
                         # Vérifier les nouveaux produits
-                        site_key = f"{site_name}_{website['url']}"
                         if site_key not in self.detected_products:
                             self.detected_products[site_key] = []
                         
                         new_products = []
+                        deferred = 0
                         for product in found_products:
                             product_hash = self.generate_product_hash(product)
                             
                             if (not self.config['monitoring_settings']['avoid_duplicates'] or 
                                 product_hash not in self.detected_products[site_key]):
                                 
+                                # Au-delà de la limite, le produit reste inconnu et sera signalé au cycle suivant
+                                if max_per_alert and len(new_products) >= max_per_alert:
+                                    deferred += 1
+                                    continue
                                 new_products.append(product)
                                 self.detected_products[site_key].append(product_hash)
+                                site_new_hashes.append(product_hash)
                                 self.logger.info(f"✨ Nouveau produit: {product['title'][:50]}...")
                         
+                        if deferred:
+                            self.logger.info(f"⏭️ {deferred} nouveau(x) produit(s) reporté(s) au prochain cycle (max_products_per_alert={max_per_alert})")
                         if new_products:
                             new_products_by_site[site_name] = new_products
                             self.logger.info(f"🎯 {len(new_products)} nouveau(x) produit(s) sur {site_name}")
@@ -610,32 +2184,571 @@ Configuration: {self.config.get('monitor_name', 'Configuration personnalisée')}
                 except Exception as e:
                     self.logger.error(f"❌ Erreur lors de la vérification de {site_name}: {e}")
                 
-                # Délai entre les sites
-                if len(enabled_websites) > 1:
-                    delay = self.config['advanced_settings']['min_delay_between_sites']
-                    if delay > 0:
-                        self.logger.debug(f"⏱️ Attente {delay}s avant le site suivant")
-                        time.sleep(delay)
+                finally:
+                    # Point de reprise après chaque site (un échec dû à l'arrêt reste à vérifier)
+                    interrupted = found_products is None and self.stop_event.is_set()
+                    if site_key in checkpoint['pending'] and not interrupted:
+                        checkpoint['pending'].remove(site_key)
+                    if not interrupted:
+                        self.record_site_health(website, found_products is not None, len(site_new_hashes))
+                    if site_new_hashes:
+                        checkpoint['new_hashes'].setdefault(site_key, []).extend(site_new_hashes)
+                    if full_cycle:
+                        self.save_checkpoint(checkpoint)
+            
+            self.save_site_health()
+            interrupted_cycle = self.stop_event.is_set()
+            if interrupted_cycle and not full_cycle:
+                self.logger.info("⏸️ Vérification à la demande interrompue, aucune alerte envoyée")
+            elif interrupted_cycle:
+                # Le point de reprise conserve les sites restants et les produits déjà trouvés :
+                # l'alerte partira à la fin du cycle repris au redémarrage
+                self.logger.info(f"⏸️ Cycle interrompu, {len(checkpoint['pending'])} site(s) repris au prochain démarrage")
             
             # Envoi des alertes si nouveaux produits
-            if new_products_by_site:
+            elif new_products_by_site:
                 total_new = sum(len(products) for products in new_products_by_site.values())
                 self.logger.info(f"🚨 ALERTE: {total_new} nouveau(x) produit(s) détecté(s) !")
                 
                 if self.send_email_alert(new_products_by_site):
+                    self.remember_detections(new_products_by_site)
+                    self.trim_detected_products()
                     self.save_detected_products()
+                    self.commit_site_cursors()
+                    self.commit_site_snapshots()
                     self.logger.info("✅ Alerte envoyée et produits sauvegardés")
                 else:
+                    # Les curseurs et instantanés ne sont pas avancés : le delta sera retraité
+                    self.pending_cursors = {}
+                    self.pending_snapshots = {}
                     self.logger.error("❌ Échec de l'envoi d'alerte")
             else:
+                self.commit_site_cursors()
+                self.commit_site_snapshots()
+                if self.get_memory_settings().get('max_detected_per_site'):
+                    # L'ordre de dernière apparition doit survivre à un redémarrage
+                    self.trim_detected_products()
+                    self.save_detected_products()
                 self.logger.info("😴 Aucun nouveau produit détecté")
+            
+            if full_cycle and not interrupted_cycle:
+                self.clear_checkpoint()
                 
         except Exception as e:
             self.logger.error(f"❌ Erreur critique lors de la surveillance: {e}")
         
+        if self.network_savings:
+            details = ', '.join(f"{name}: ~{saved:.0f} ms" for name, saved in self.network_savings.items())
+            self.logger.info(f"🔌 Temps de connexion économisé (DNS, TLS, keep-alive): {details}")
+            self.network_savings = {}
+        
         self.logger.info(f"🏁 FIN DE LA SURVEILLANCE - {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}")
         self.logger.info("=" * 80)
         
+    def run_cycle(self):
+        """Exécute un cycle de surveillance puis la maintenance mémoire
+        
+        Avec `memory.isolate_cycles`, le cycle tourne dans un processus dédié :
+        toute la mémoire qu'il a allouée est rendue au système à sa fin, et
+        l'état persistant (produits détectés, curseurs) est relu ensuite.
+        """
+        if self.stop_event.is_set():
+            return
+        if self.get_adaptive_settings()['enabled'] and not self.has_due_websites():
+            self.logger.debug("⏭️ Aucun site à échéance")
+            return
+        self.cycle_running = True
+        try:
+            self.run_cycle_body()
+        finally:
+            self.cycle_running = False
+        self.run_cycle_maintenance()
+        
+    def run_cycle_body(self):
+        """Vérifie les sites, dans un processus dédié avec `memory.isolate_cycles`"""
+        if self.get_memory_settings().get('isolate_cycles'):
+            process = lazy_import('multiprocessing').Process(
+                target=_run_isolated_cycle, args=(self.config_file,), name='botalerte-cycle'
+            )
+            self.cycle_process = process
+            process.start()
+            process.join()
+            self.cycle_process = None
+            if process.exitcode != 0:
+                self.logger.error(f"❌ Le processus du cycle s'est terminé avec le code {process.exitcode}")
+            self.detected_products = self.load_detected_products()
+            self.site_cursors = self.load_site_cursors()
+            self.site_health.stats = self.site_health.load()
+            self.recent_detections = self.load_recent_detections()
+        else:
+            self.check_all_websites()
+        
+    def get_adaptive_settings(self) -> Dict[str, Any]:
+        """Paramètres de la planification adaptative (`advanced_settings.adaptive_schedule`)"""
+        return {**DEFAULT_ADAPTIVE_SETTINGS, **self.config['advanced_settings'].get('adaptive_schedule', {})}
+        
+    def get_due_websites(self, websites: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Filtre les sites dont la prochaine vérification est due (planification adaptative)"""
+        if not self.get_adaptive_settings()['enabled']:
+            return websites
+        now = time.time()
+        due = [website for website in websites if self.site_health.is_due(self.get_site_key(website), now)]
+        if len(due) < len(websites):
+            self.logger.info(f"⏭️ {len(websites) - len(due)} site(s) pas encore à échéance")
+        return due
+        
+    def has_due_websites(self) -> bool:
+        """Vrai si un site est à échéance ou si un cycle interrompu reste à reprendre"""
+        checkpoint_file = self.config['monitoring_settings'].get('checkpoint_file', 'run_checkpoint.json')
+        if os.path.exists(checkpoint_file):
+            return True
+        now = time.time()
+        return any(self.site_health.is_due(self.get_site_key(website), now)
+                   for website in self.config['websites']
+                   if website['enabled'] and self.get_site_key(website) not in self.paused_sites)
+        
+    def record_site_health(self, website: Dict[str, Any], success: bool, new_products: int):
+        """Met à jour les statistiques d'un site après sa vérification (planification adaptative seulement)"""
+        site_key = self.get_site_key(website)
+        seconds = self.check_seconds.pop(site_key, None)
+        error = self.check_errors.pop(site_key, None)
+        if not self.get_adaptive_settings()['enabled']:
+            return
+        entry = self.site_health.record(site_key, success, seconds, new_products, error)
+        if entry['consecutive_failures'] >= 2:
+            self.logger.warning(f"🩺 {website['name']}: {entry['consecutive_failures']} échec(s) consécutif(s), "
+                                f"prochaine tentative dans {entry['interval_hours']:.1f}h")
+        else:
+            self.logger.debug(f"🩺 {website['name']}: {self.site_health.describe(entry)}")
+            
+    def save_site_health(self):
+        """Sauvegarde les statistiques de santé des sites (planification adaptative seulement)"""
+        if not self.get_adaptive_settings()['enabled']:
+            return
+        try:
+            self.site_health.save()
+        except Exception as e:
+            self.logger.error(f"Erreur lors de la sauvegarde des statistiques des sites: {e}")
+            
+    def log_site_health(self):
+        """Affiche la santé de chaque site surveillé"""
+        if not self.get_adaptive_settings()['enabled']:
+            self.logger.info("🩺 Statistiques des sites enregistrées uniquement avec advanced_settings.adaptive_schedule.enabled")
+        now = time.time()
+        for website in self.config['websites']:
+            if not website['enabled']:
+                continue
+            entry = self.site_health.stats.get(self.get_site_key(website))
+            if entry is None:
+                self.logger.info(f"🩺 {website['name']}: jamais vérifié")
+            else:
+                self.logger.info(f"🩺 {website['name']}: {self.site_health.describe(entry, now)}")
+        
+    def get_control_settings(self) -> Dict[str, Any]:
+        """Paramètres de l'API de contrôle (`advanced_settings.control_api`)"""
+        return {**DEFAULT_CONTROL_SETTINGS, **self.config['advanced_settings'].get('control_api', {})}
+        
+    def start_control_server(self):
+        """Démarre l'API de contrôle locale si elle est activée"""
+        settings = self.get_control_settings()
+        if not settings['enabled']:
+            return
+        if not settings['token']:
+            # Sans jeton, n'importe quelle page web ouverte localement pourrait piloter le bot
+            self.logger.error("❌ API de contrôle non démarrée : advanced_settings.control_api.token est obligatoire")
+            return
+        try:
+            self.control_server = lazy_import('control_api').ControlServer(self, settings)
+        except OSError as e:
+            self.logger.error(f"❌ API de contrôle indisponible sur {settings['host']}:{settings['port']}: {e}")
+            return
+        self.control_server.start()
+        self.logger.info(f"🎛️ API de contrôle sur http://{settings['host']}:{self.control_server.server_port}")
+        
+    def find_website(self, name: str) -> Optional[Dict[str, Any]]:
+        """Retrouve un site de la configuration par son nom"""
+        return next((website for website in self.config['websites'] if website['name'] == name), None)
+        
+    def load_paused_sites(self) -> set:
+        """Charge les sites suspendus via l'API de contrôle"""
+        try:
+            path = self.get_control_settings()['paused_file']
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    return set(json.load(f))
+        except Exception as e:
+            self.logger.error(f"Erreur lors du chargement des sites suspendus: {e}")
+        return set()
+        
+    def set_site_paused(self, website: Dict[str, Any], paused: bool) -> Dict[str, Any]:
+        """Suspend ou réactive un site (pris en compte dès le prochain cycle)"""
+        site_key = self.get_site_key(website)
+        paused_sites = set(self.paused_sites)
+        if paused:
+            paused_sites.add(site_key)
+        else:
+            paused_sites.discard(site_key)
+        self.paused_sites = paused_sites
+        try:
+            atomic_write_json(self.get_control_settings()['paused_file'], sorted(paused_sites))
+        except Exception as e:
+            self.logger.error(f"Erreur lors de la sauvegarde des sites suspendus: {e}")
+        self.logger.info(f"{'⏸️' if paused else '▶️'} {website['name']} {'suspendu' if paused else 'réactivé'}")
+        return {'site': website['name'], 'paused': paused}
+        
+    def request_site_check(self, website: Dict[str, Any]) -> Dict[str, Any]:
+        """Demande la vérification immédiate d'un site (exécutée par la boucle principale)"""
+        with self.host_lock:
+            if website not in self.requested_checks:
+                self.requested_checks.append(website)
+            queued = len(self.requested_checks)
+        self.wake_event.set()
+        return {'site': website['name'], 'queued': queued, 'after_current_cycle': self.cycle_running}
+        
+    def run_requested_checks(self):
+        """Vérifie les sites demandés via l'API de contrôle"""
+        with self.host_lock:
+            websites, self.requested_checks = self.requested_checks, []
+        if websites and not self.stop_event.is_set():
+            self.check_all_websites(websites)
+            
+    def load_recent_detections(self) -> List[Dict[str, Any]]:
+        """Charge les dernières détections signalées"""
+        try:
+            path = self.get_control_settings()['detections_file']
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            self.logger.error(f"Erreur lors du chargement des dernières détections: {e}")
+        return []
+        
+    def remember_detections(self, products_by_site: Dict[str, List[Dict[str, str]]]):
+        """Conserve les produits signalés (les plus récents en premier, nombre borné)"""
+        settings = self.get_control_settings()
+        detected_at = datetime.now().isoformat(timespec='seconds')
+        detections = [
+            {'detected_at': detected_at, 'site': site_name,
+             **{field: product[field] for field in ('title', 'price', 'link', 'change') if product.get(field)}}
+            for site_name, products in products_by_site.items() for product in products
+        ]
+        self.recent_detections = (detections + self.recent_detections)[:settings['max_detections']]
+        try:
+            atomic_write_json(settings['detections_file'], self.recent_detections, indent=None)
+        except Exception as e:
+            self.logger.error(f"Erreur lors de la sauvegarde des dernières détections: {e}")
+            
+    def get_recent_detections(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Dernières détections signalées, les plus récentes en premier"""
+        return self.recent_detections[:max(0, limit)]
+        
+    def get_control_status(self) -> Dict[str, Any]:
+        """État du bot et de chaque site (API de contrôle)"""
+        def timestamp(value: Optional[float]) -> Optional[str]:
+            return datetime.fromtimestamp(value).isoformat(timespec='seconds') if value else None
+        
+        now = time.time()
+        adaptive = self.get_adaptive_settings()['enabled']
+        next_cycle = lazy_import('schedule').next_run()
+        in_flight = dict(self.in_flight)
+        with self.host_lock:
+            requested = [website['name'] for website in self.requested_checks]
+        sites = []
+        for website in self.config['websites']:
+            site_key = self.get_site_key(website)
+            entry = self.site_health.snapshot(site_key) or {}
+            if adaptive and entry:
+                next_due = timestamp(entry.get('next_due'))
+            else:
+                next_due = next_cycle.isoformat(timespec='seconds') if next_cycle else None
+            sites.append({
+                'name': website['name'],
+                'url': website['url'],
+                'enabled': website['enabled'],
+                'paused': site_key in self.paused_sites,
+                'in_flight_seconds': round(now - in_flight[site_key], 1) if site_key in in_flight else None,
+                'next_due': next_due,
+                'last_check': timestamp(entry.get('last_check')),
+                'last_latency_ms': entry.get('last_latency_ms'),
+                'average_latency_ms': entry.get('latency_ms'),
+                'success_rate': round(entry['successes'] / entry['checks'], 3) if entry.get('checks') else None,
+                'consecutive_failures': entry.get('consecutive_failures', 0),
+                'last_error': entry.get('last_error'),
+                'last_error_at': timestamp(entry.get('last_error_at')),
+                'last_new_product': timestamp(entry.get('last_new_product'))
+            })
+        return {
+            'monitor_name': self.config.get('monitor_name', 'Moniteur Universel'),
+            'pid': os.getpid(),
+            'cycle_running': self.cycle_running,
+            'cycles_completed': self.cycle_count,
+            'stopping': self.stop_event.is_set(),
+            'requested_checks': requested,
+            'sites': sites
+        }
+        
+    def run_cycle_maintenance(self):
+        """Borne l'état en mémoire, recycle le pool de parsing et échantillonne la mémoire"""
+        self.cycle_count += 1
+        settings = self.get_memory_settings()
+        if not settings.get('isolate_cycles'):
+            # Un cycle isolé a déjà borné et sauvegardé la liste dans son processus
+            self.trim_detected_products()
+        
+        recycle_every = settings.get('recycle_parse_pool_every', 0)
+        if recycle_every and self.parse_pool is not None and self.cycle_count % recycle_every == 0:
+            self.shutdown_parse_pool()
+            self.logger.info(f"♻️ Pool de parsing recyclé après {recycle_every} cycle(s)")
+        
+        gc.collect()
+        sample_every = settings.get('sample_every', 1)
+        if sample_every and self.cycle_count % sample_every == 0:
+            self.sample_memory()
+            
+    def sample_memory(self) -> Dict[str, Any]:
+        """Mesure la mémoire du processus et la taille de l'état conservé
+        
+        L'échantillon est journalisé et, si `memory.samples_file` est défini,
+        ajouté à ce fichier JSONL pour suivre la dérive sur des milliers de cycles.
+        """
+        settings = self.get_memory_settings()
+        rss = get_rss_mb()
+        if self.first_sample_rss is None:
+            self.first_sample_rss = rss
+        sample = {
+            'cycle': self.cycle_count,
+            'time': datetime.now().isoformat(timespec='seconds'),
+            'rss_mb': round(rss, 1),
+            'rss_drift_mb': round(rss - self.first_sample_rss, 1),
+            'detected_hashes': sum(len(hashes) for hashes in self.detected_products.values()),
+            'gc_objects': len(gc.get_objects())
+        }
+        cache = get_parse_cache(self.config['advanced_settings'].get('parse_cache', {}))
+        if cache is not None:
+            sample['parse_cache_entries'] = len(cache.entries)
+        
+        tracemalloc = sys.modules.get('tracemalloc')
+        if tracemalloc is not None and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            sample['traced_mb'] = round(current / 1024 / 1024, 2)
+            sample['traced_peak_mb'] = round(peak / 1024 / 1024, 2)
+            snapshot = tracemalloc.take_snapshot().filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),))
+            if self.memory_baseline is None:
+                self.memory_baseline = snapshot
+            else:
+                for stat in snapshot.compare_to(self.memory_baseline, 'lineno')[:settings.get('tracemalloc_top', 3)]:
+                    self.logger.info(f"  📈 {stat}")
+        
+        self.logger.info(
+            f"🧠 Mémoire (cycle {sample['cycle']}): {sample['rss_mb']} Mo RSS "
+            f"({sample['rss_drift_mb']:+} Mo depuis le 1er échantillon), "
+            f"{sample['detected_hashes']} hash(es) détecté(s), {sample['gc_objects']} objets Python"
+        )
+        if settings.get('samples_file'):
+            try:
+                with open(settings['samples_file'], 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(sample) + '\n')
+            except OSError as e:
+                self.logger.error(f"Erreur lors de l'écriture de l'échantillon mémoire: {e}")
+        return sample
+        
+    def export_products(self, website: Dict[str, Any], products: List[Dict[str, str]]):
+        """Transmet les produits extraits d'un site à l'export (`advanced_settings.export`)"""
+        settings = self.config['advanced_settings'].get('export', {})
+        if not products or not settings.get('enabled'):
+            return
+        if self.exporter is None:
+            self.exporter = lazy_import('product_export').ProductExporter(settings, self.logger)
+        self.exporter.submit(website['name'], products)
+        
+    def shutdown_exporter(self):
+        """Vide la file d'export et ferme les fichiers"""
+        if self.exporter is not None:
+            self.exporter.close()
+            self.logger.info(f"📤 Export: {self.exporter.summary()}")
+            self.exporter = None
+        
+    def get_batch_profile(self, profile_name: Optional[str] = None) -> Dict[str, Any]:
+        """Site de la configuration dont le traitement par lots reprend sélecteurs et termes"""
+        websites = self.config['websites']
+        if profile_name:
+            for website in websites:
+                if website['name'] == profile_name:
+                    return website
+            raise ValueError(f"Profil '{profile_name}' absent de la configuration")
+        return next((website for website in websites if website['enabled']), websites[0])
+        
+    def run_batch(self, urls: List[str], output_path: str, profile_name: Optional[str] = None,
+                  concurrency: int = 16, seed: bool = False) -> Dict[str, Any]:
+        """Traite une liste d'URLs en un passage et écrit les résultats en JSON Lines
+        
+        Chaque URL passe par la récupération et l'extraction du site profil.
+        La concurrence globale est bornée par `concurrency`, la politesse par
+        hôte par `max_parallel_per_host` et robots.txt. Aucune alerte n'est
+        envoyée ; avec `seed`, les produits trouvés sont ajoutés aux produits
+        détectés du profil pour que le premier cycle normal ne les signale pas.
+        """
+        profile = self.get_batch_profile(profile_name)
+        site_key = self.get_site_key(profile)
+        stats = {'urls': 0, 'ok': 0, 'failed': 0, 'products': 0, 'latencies': []}
+        seeded = []
+        
+        def process(url: str) -> Tuple[Optional[List[Dict[str, str]]], float, str]:
+            start = time.perf_counter()
+            try:
+                products = self.collect_site_products(dict(profile, url=url))
+                error = '' if products is not None else 'page inaccessible'
+            except Exception as e:
+                products, error = None, str(e)
+            return products, time.perf_counter() - start, error
+        
+        self.logger.info(f"📦 Traitement par lots: {len(urls)} URL(s), profil {profile['name']}, "
+                         f"concurrence {concurrency}, sortie {output_path}")
+        started = time.perf_counter()
+        url_iter = iter(urls)
+        with open(output_path, 'a', encoding='utf-8') as output, \
+                ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='botalerte-batch') as executor:
+            # Fenêtre bornée de requêtes en vol : la liste peut être très longue
+            in_flight = {}
+            while True:
+                while len(in_flight) < concurrency * 2 and not self.stop_event.is_set():
+                    url = next(url_iter, None)
+                    if url is None:
+                        break
+                    in_flight[executor.submit(process, url)] = url
+                if not in_flight:
+                    break
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url = in_flight.pop(future)
+                    products, seconds, error = future.result()
+                    stats['urls'] += 1
+                    stats['latencies'].append(seconds)
+                    record = {
+                        'url': url,
+                        'site': profile['name'],
+                        'fetched_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                        'seconds': round(seconds, 3)
+                    }
+                    if products is None:
+                        stats['failed'] += 1
+                        record.update(status='error', error=error)
+                    else:
+                        stats['ok'] += 1
+                        stats['products'] += len(products)
+                        record.update(status='ok', count=len(products), products=products)
+                        self.export_products(profile, products)
+                        if seed:
+                            seeded.extend(self.generate_product_hash(product) for product in products)
+                    output.write(json.dumps(record, ensure_ascii=False) + '\n')
+                    output.flush()
+        
+        stats['elapsed'] = time.perf_counter() - started
+        if self.stop_event.is_set() and stats['urls'] < len(urls):
+            self.logger.info(f"⏸️ Lot interrompu, {len(urls) - stats['urls']} URL(s) non traitée(s)")
+        if seed:
+            known = self.detected_products.setdefault(site_key, [])
+            known_set = set(known)
+            added = [h for h in dict.fromkeys(seeded) if h not in known_set]
+            known.extend(added)
+            stats['seeded'] = len(added)
+            if self.get_memory_settings().get('max_detected_per_site'):
+                # Les produits du lot sont les derniers vus : seuls des hashes plus anciens sont oubliés
+                self.seen_hashes.setdefault(site_key, set()).update(seeded)
+            self.trim_detected_products()
+            self.save_detected_products()
+        self.log_batch_stats(stats)
+        return stats
+        
+    def log_batch_stats(self, stats: Dict[str, Any]):
+        """Journalise le débit d'un traitement par lots"""
+        latencies = sorted(stats['latencies'])
+        elapsed = max(stats['elapsed'], 1e-9)
+        self.logger.info("📊 BILAN DU TRAITEMENT PAR LOTS")
+        self.logger.info(f"  • URLs: {stats['urls']} ({stats['ok']} réussie(s), {stats['failed']} en échec)")
+        self.logger.info(f"  • Produits extraits: {stats['products']}")
+        self.logger.info(f"  • Durée: {elapsed:.1f}s, débit: {stats['urls'] / elapsed:.1f} URL/s, "
+                         f"{stats['products'] / elapsed:.1f} produit(s)/s")
+        if latencies:
+            p50 = latencies[len(latencies) // 2]
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            self.logger.info(f"  • Latence par URL: médiane {p50 * 1000:.0f} ms, p95 {p95 * 1000:.0f} ms, "
+                             f"max {latencies[-1] * 1000:.0f} ms")
+        if 'seeded' in stats:
+            self.logger.info(f"  • Produits ajoutés aux produits détectés: {stats['seeded']}")
+        
+    def get_shutdown_settings(self) -> Dict[str, Any]:
+        """Paramètres de l'arrêt coopératif (`advanced_settings.shutdown`)"""
+        return self.config['advanced_settings'].get('shutdown', {})
+        
+    def install_signal_handlers(self, force_on_repeat: bool = True):
+        """Arrêt coopératif sur SIGTERM, SIGHUP et SIGINT (depuis le thread principal)
+        
+        Avec `force_on_repeat`, un second signal arrête immédiatement le
+        processus ; le processus d'un cycle isolé ignore SIGINT et les
+        signaux répétés (son parent le surveille).
+        """
+        lazy_import('stop_signals').StopSignalHandler(self, force_on_repeat).install()
+        
+    def request_shutdown(self, reason: str):
+        """Demande l'arrêt : plus de nouvelle vérification, les vérifications en cours se terminent
+        
+        Au-delà de `shutdown.drain_seconds` (+5 s de marge), l'arrêt est forcé.
+        """
+        if self.stop_event.is_set():
+            return
+        drain_seconds = self.get_shutdown_settings().get('drain_seconds', 30)
+        self.logger.info(f"🛑 Arrêt demandé ({reason}), fin des vérifications en cours (max {drain_seconds}s)")
+        self.stop_event.set()
+        self.wake_event.set()
+        process = self.cycle_process
+        if process is not None and process.is_alive():
+            # Le cycle isolé s'arrête aussi proprement (SIGTERM)
+            process.terminate()
+        self.shutdown_timer = threading.Timer(drain_seconds + 5, self.force_shutdown)
+        self.shutdown_timer.daemon = True
+        self.shutdown_timer.start()
+        
+    def force_shutdown(self):
+        """Arrêt immédiat : navigateurs fermés, point de reprise laissé tel quel"""
+        self.logger.warning("⚠️ Drainage trop long, arrêt forcé")
+        self.teardown_browsers()
+        process = self.cycle_process
+        if process is not None and process.is_alive():
+            process.kill()
+        logging.shutdown()
+        os._exit(1)
+        
+    def teardown_browsers(self):
+        """Ferme les navigateurs Selenium encore ouverts (pas de Chrome orphelin)"""
+        with self.host_lock:
+            drivers = list(self.active_drivers)
+            self.active_drivers.clear()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                self.logger.debug(f"Fermeture du navigateur: {e}")
+        if drivers:
+            self.logger.info(f"🧹 {len(drivers)} navigateur(s) fermé(s)")
+            
+    def shutdown(self):
+        """Libère les ressources avant la sortie : navigateurs, pool de parsing, export, file"""
+        self.teardown_browsers()
+        self.shutdown_parse_pool()
+        self.shutdown_exporter()
+        if self.control_server is not None:
+            self.control_server.close()
+            self.control_server = None
+        if self.work_queue is not None:
+            self.work_queue.close()
+            self.work_queue = None
+        if self.shutdown_timer is not None:
+            self.shutdown_timer.cancel()
+        if self.stop_event.is_set():
+            self.logger.info("👋 Arrêt propre terminé")
+        
     def run_scheduler(self):
         """Lance le planificateur de surveillance"""
         monitor_name = self.config.get('monitor_name', 'Moniteur Universel')
@@ -652,27 +2765,85 @@ Configuration: {self.config.get('monitor_name', 'Configuration personnalisée')}
                 terms = ', '.join(website['search_terms'])
                 self.logger.info(f"  • {website['name']}: [{terms}]")
         
-        # Planifier la surveillance
-        schedule.every(interval).hours.do(self.check_all_websites)
+        # Planifier la surveillance (en mode adaptatif, les échéances par site sont examinées à chaque tick)
+        self.install_signal_handlers()
+        schedule = lazy_import('schedule')
+        adaptive = self.get_adaptive_settings()
+        if adaptive['enabled']:
+            self.logger.info(f"📈 Intervalles adaptatifs entre {adaptive['min_interval_hours']}h et "
+                             f"{adaptive['max_interval_hours']}h (échéances examinées toutes les {adaptive['tick_minutes']} min)")
+            schedule.every(adaptive['tick_minutes']).minutes.do(self.run_cycle)
+        else:
+            schedule.every(interval).hours.do(self.run_cycle)
+        
+        self.start_control_server()
         
         # Première vérification immédiate
         self.logger.info("🔍 Lancement de la première vérification...")
-        self.check_all_websites()
+        self.run_cycle()
         
         # Boucle principale
         self.logger.info("🔄 Bot en cours d'exécution... (Ctrl+C pour arrêter)")
         try:
-            while True:
+            # Attente interruptible jusqu'au prochain cycle : un signal ou l'API de contrôle réveille la boucle
+            while not self.stop_event.is_set():
                 schedule.run_pending()
-                time.sleep(60)
+                self.run_requested_checks()
+                idle_seconds = schedule.idle_seconds()
+                self.wake_event.wait(60 if idle_seconds is None else min(60, max(1, idle_seconds)))
+                self.wake_event.clear()
         except KeyboardInterrupt:
             self.logger.info("🛑 Arrêt du bot demandé par l'utilisateur")
         except Exception as e:
             self.logger.error(f"❌ Erreur dans la boucle principale: {e}")
+        finally:
+            self.shutdown()
+
+def _run_isolated_cycle(config_file: str):
+    """Exécute un cycle complet dans un processus dédié (memory.isolate_cycles)"""
+    monitor = UniversalWebMonitor(config_file)
+    monitor.install_signal_handlers(force_on_repeat=False)
+    monitor.check_all_websites()
+    monitor.shutdown()
+
+def log_startup_report(logger: logging.Logger, init_seconds: float):
+    """Journalise le coût du démarrage : chargement du module, imports différés, mémoire"""
+    logger.info("⏱️ RAPPORT DE DÉMARRAGE")
+    logger.info(f"  • Chargement du module: {MODULE_LOAD_SECONDS * 1000:.1f} ms")
+    logger.info(f"  • Initialisation du moniteur: {init_seconds * 1000:.1f} ms")
+    for module_name, seconds in sorted(IMPORT_TIMINGS.items(), key=lambda item: -item[1]):
+        logger.info(f"  • Import différé {module_name}: {seconds * 1000:.1f} ms")
+    logger.info(f"  • Mémoire résidente: {get_rss_mb():.1f} Mo")
+
+def load_url_list(path: str) -> List[str]:
+    """Lit une liste d'URLs (une par ligne, lignes vides et # ignorées ; '-' = entrée standard)"""
+    handle = sys.stdin if path == '-' else open(path, 'r', encoding='utf-8')
+    try:
+        return [line.strip() for line in handle if line.strip() and not line.lstrip().startswith('#')]
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
 
 def main():
     """Fonction principale"""
-    config_file = sys.argv[1] if len(sys.argv) > 1 else 'config.json'
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Bot de surveillance web universel")
+    parser.add_argument('config_file', nargs='?', default='config.json', help="Fichier de configuration JSON")
+    parser.add_argument('--startup-report', action='store_true',
+                        default=bool(os.getenv('BOTALERTE_STARTUP_REPORT')),
+                        help="Affiche le coût du démarrage (imports, initialisation, mémoire)")
+    parser.add_argument('--once', action='store_true', help="Exécute un seul cycle de surveillance puis s'arrête")
+    parser.add_argument('--batch', metavar='URLS', help="Traite une liste d'URLs (fichier ou '-') sans alerte")
+    parser.add_argument('--output', default='batch_results.jsonl', help="Fichier JSON Lines des résultats (--batch)")
+    parser.add_argument('--profile', help="Site de la configuration fournissant sélecteurs et termes (--batch)")
+    parser.add_argument('--concurrency', type=int, default=16, help="Requêtes simultanées (--batch)")
+    parser.add_argument('--seed', action='store_true',
+                        help="Ajoute les produits trouvés aux produits détectés du profil (--batch)")
+    parser.add_argument('--health', action='store_true',
+                        help="Affiche les statistiques de santé des sites (succès, latence, nouveautés) puis s'arrête")
+    args = parser.parse_args()
+    config_file = args.config_file
     
     if not os.path.exists(config_file):
         print(f"❌ Fichier de configuration {config_file} non trouvé")
@@ -681,11 +2852,34 @@ def main():
         return
     
     try:
+        init_start = time.perf_counter()
         monitor = UniversalWebMonitor(config_file)
-        monitor.run_scheduler()
+        if args.startup_report:
+            log_startup_report(monitor.logger, time.perf_counter() - init_start)
+        if args.health:
+            monitor.log_site_health()
+        elif args.batch:
+            monitor.install_signal_handlers()
+            monitor.run_batch(load_url_list(args.batch), args.output, args.profile, max(1, args.concurrency), args.seed)
+            monitor.shutdown()
+        elif args.once:
+            monitor.install_signal_handlers()
+            if monitor.get_adaptive_settings()['enabled'] and not monitor.has_due_websites():
+                monitor.logger.info("⏭️ Aucun site à échéance (planification adaptative)")
+            monitor.run_cycle()
+            monitor.shutdown()
+        else:
+            monitor.run_scheduler()
+        if monitor.abandoned_checks:
+            # Le point de reprise est à jour : inutile d'attendre les requêtes abandonnées
+            logging.shutdown()
+            os._exit(0)
     except Exception as e:
         print(f"❌ Erreur critique: {e}")
         logging.error(f"Erreur critique: {e}")
 
+# Durée totale du chargement du module (rapport de démarrage)
+MODULE_LOAD_SECONDS = time.perf_counter() - _MODULE_LOAD_START
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
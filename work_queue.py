@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+File de travaux partagée pour répartir les vérifications sur plusieurs workers
+
+Le moniteur (coordinateur) dépose un travail par site dans une base SQLite
+partagée ; des workers (processus locaux ou autres machines voyant le même
+fichier) louent les travaux, vérifient le site et renvoient les produits
+extraits. Le coordinateur agrège les résultats : déduplication, détection de
+changements et alerte email restent centralisées.
+
+Un bail expiré (worker arrêté ou bloqué) remet le travail à disposition des
+autres workers, dans la limite de `max_attempts` tentatives. Chaque worker
+signale sa présence (table `workers`) : sans signe de vie depuis
+`worker_timeout_seconds`, ou au-delà de `result_timeout_seconds`, le
+coordinateur abandonne les sites restants au lieu d'attendre indéfiniment.
+
+Usage:
+    python work_queue.py worker config.json [--processes 4] [--exit-when-idle]
+    python work_queue.py status config.json
+"""
+
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_QUEUE_SETTINGS = {
+    'enabled': False,
+    'path': 'work_queue.sqlite',
+    'lease_seconds': 300,
+    'max_attempts': 3,
+    'poll_seconds': 1.0,
+    'worker_timeout_seconds': 120,
+    'result_timeout_seconds': 3600
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    cycle TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    collected INTEGER NOT NULL DEFAULT 0,
+    updated REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, lease_expires);
+CREATE INDEX IF NOT EXISTS jobs_cycle ON jobs (cycle, collected);
+CREATE TABLE IF NOT EXISTS workers (
+    worker TEXT PRIMARY KEY,
+    seen REAL NOT NULL
+);
+"""
+
+def get_queue_settings(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Paramètres de la file (`advanced_settings.work_queue`) complétés par les défauts"""
+    return {**DEFAULT_QUEUE_SETTINGS, **config.get('advanced_settings', {}).get('work_queue', {})}
+
+class Job:
+    """Travail loué par un worker (le couple worker/tentative sert de jeton de bail)"""
+
+    def __init__(self, job_id: int, payload: Dict[str, Any], worker: str, attempt: int):
+        self.id = job_id
+        self.payload = payload
+        self.worker = worker
+        self.attempt = attempt
+
+class WorkQueue:
+    """File de travaux SQLite avec baux à durée limitée
+
+    Chaque processus ouvre sa propre connexion ; les opérations qui
+    choisissent ou collectent des travaux prennent un verrou d'écriture
+    (BEGIN IMMEDIATE) pour rester atomiques entre processus.
+    """
+
+    def __init__(self, path: str, lease_seconds: float = 300, max_attempts: int = 3):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.executescript(SCHEMA)
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> 'WorkQueue':
+        return cls(settings['path'], settings['lease_seconds'], settings['max_attempts'])
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+    def transaction(self, statements):
+        """Exécute une fonction dans une transaction d'écriture et retourne son résultat"""
+        with self.lock:
+            self.db.execute('BEGIN IMMEDIATE')
+            try:
+                result = statements(self.db)
+                self.db.execute('COMMIT')
+                return result
+            except BaseException:
+                self.db.execute('ROLLBACK')
+                raise
+
+    def enqueue_cycle(self, cycle: str, payloads: List[Dict[str, Any]]):
+        """Dépose les travaux d'un cycle et supprime ceux des cycles précédents"""
+        now = time.time()
+
+        def statements(db):
+            db.execute('DELETE FROM jobs WHERE cycle != ?', (cycle,))
+            db.executemany(
+                'INSERT INTO jobs (cycle, payload, updated) VALUES (?, ?, ?)',
+                [(cycle, json.dumps(payload, ensure_ascii=False), now) for payload in payloads]
+            )
+        self.transaction(statements)
+
+    def abandon_cycle(self, cycle: str):
+        """Supprime les travaux non collectés d'un cycle abandonné par le coordinateur"""
+        self.transaction(lambda db: db.execute('DELETE FROM jobs WHERE cycle = ? AND collected = 0', (cycle,)))
+
+    def heartbeat(self, worker: str):
+        """Signale qu'un worker est actif"""
+        with self.lock:
+            self.db.execute('INSERT OR REPLACE INTO workers (worker, seen) VALUES (?, ?)', (worker, time.time()))
+
+    def last_heartbeat(self) -> Optional[float]:
+        """Dernier signe de vie d'un worker (horodatage), None si aucun"""
+        with self.lock:
+            return self.db.execute('SELECT MAX(seen) FROM workers').fetchone()[0]
+
+    def lease(self, worker: str) -> Optional[Job]:
+        """Loue le plus ancien travail disponible (en attente ou au bail expiré)"""
+        def statements(db):
+            now = time.time()
+            db.execute('INSERT OR REPLACE INTO workers (worker, seen) VALUES (?, ?)', (worker, now))
+            while True:
+                row = db.execute(
+                    "SELECT id, payload, attempts FROM jobs WHERE status = 'pending' "
+                    "OR (status = 'leased' AND lease_expires < ?) ORDER BY id LIMIT 1", (now,)
+                ).fetchone()
+                if row is None:
+                    return None
+                job_id, payload, attempts = row
+                if attempts >= self.max_attempts:
+                    # Bail expiré à la dernière tentative : abandon du travail
+                    db.execute(
+                        "UPDATE jobs SET status = 'failed', error = ?, worker = NULL, updated = ? WHERE id = ?",
+                        (f"bail expiré après {attempts} tentative(s)", now, job_id)
+                    )
+                    continue
+                db.execute(
+                    "UPDATE jobs SET status = 'leased', worker = ?, attempts = ?, lease_expires = ?, updated = ? "
+                    "WHERE id = ?", (worker, attempts + 1, now + self.lease_seconds, now, job_id)
+                )
+                return Job(job_id, json.loads(payload), worker, attempts + 1)
+        return self.transaction(statements)
+
+    def owned_update(self, job: Job, assignments: str, values: Tuple) -> bool:
+        """Met à jour un travail seulement si le bail appartient encore au worker"""
+        with self.lock:
+            cursor = self.db.execute(
+                f"UPDATE jobs SET {assignments}, updated = ? "
+                "WHERE id = ? AND status = 'leased' AND worker = ? AND attempts = ?",
+                values + (time.time(), job.id, job.worker, job.attempt)
+            )
+            return cursor.rowcount == 1
+
+    def extend_lease(self, job: Job) -> bool:
+        """Prolonge le bail d'un travail en cours"""
+        self.heartbeat(job.worker)
+        return self.owned_update(job, 'lease_expires = ?', (time.time() + self.lease_seconds,))
+
+    def complete(self, job: Job, result: Dict[str, Any]) -> bool:
+        """Enregistre le résultat ; False si le bail a expiré et le travail a été repris"""
+        return self.owned_update(
+            job, "status = 'done', result = ?, lease_expires = NULL", (json.dumps(result, ensure_ascii=False),)
+        )
+
+    def fail(self, job: Job, error: str) -> bool:
+        """Remet le travail en attente, ou l'abandonne après `max_attempts` tentatives"""
+        status = 'failed' if job.attempt >= self.max_attempts else 'pending'
+        return self.owned_update(
+            job, 'status = ?, error = ?, worker = NULL, lease_expires = NULL', (status, error[:500])
+        )
+
+    def take_results(self, cycle: str) -> List[Tuple[Dict[str, Any], Optional[Dict[str, Any]], Optional[str]]]:
+        """Retourne (payload, résultat, erreur) des travaux terminés non encore collectés"""
+        def statements(db):
+            rows = db.execute(
+                "SELECT id, payload, status, result, error FROM jobs "
+                "WHERE cycle = ? AND collected = 0 AND status IN ('done', 'failed') ORDER BY id", (cycle,)
+            ).fetchall()
+            db.executemany('UPDATE jobs SET collected = 1 WHERE id = ?', [(row[0],) for row in rows])
+            return rows
+        return [
+            (json.loads(payload), json.loads(result) if status == 'done' else None, error)
+            for _, payload, status, result, error in self.transaction(statements)
+        ]
+
+    def counts(self, cycle: Optional[str] = None) -> Dict[str, int]:
+        """Nombre de travaux par état (d'un cycle ou de toute la file)"""
+        query = 'SELECT status, COUNT(*) FROM jobs'
+        params = ()
+        if cycle is not None:
+            query += ' WHERE cycle = ?'
+            params = (cycle,)
+        with self.lock:
+            return dict(self.db.execute(query + ' GROUP BY status', params).fetchall())
+
+class QueueWorker:
+    """Worker : loue les travaux, vérifie les sites et renvoie les produits"""
+
+    def __init__(self, config_file: str, worker_id: Optional[str] = None):
+        from universal_monitor import UniversalWebMonitor
+
+        self.monitor = UniversalWebMonitor(config_file)
+        self.logger = self.monitor.logger
+        self.settings = get_queue_settings(self.monitor.config)
+        self.queue = WorkQueue.from_settings(self.settings)
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.jobs_done = 0
+
+    def process(self, job: Job) -> Dict[str, Any]:
+        """Vérifie le site d'un travail et construit son résultat"""
+        website = job.payload['website']
+        site_key = self.monitor.get_site_key(website)
+        # Le curseur et les hashes connus viennent du coordinateur : le worker ne
+        # consulte ni site_cursors.json ni sa propre copie de detected_products.json
+        if job.payload.get('cursor') is not None:
+            self.monitor.site_cursors[site_key] = job.payload['cursor']
+        self.monitor.detected_products[site_key] = job.payload.get('known_hashes') or []
+        self.monitor.pending_cursors.pop(site_key, None)
+        products = self.monitor.check_site(website)
+        return {'products': products, 'cursor': self.monitor.pending_cursors.pop(site_key, None),
+                'seconds': self.monitor.check_seconds.pop(site_key, None)}
+
+    def run_job(self, job: Job):
+        """Traite un travail en prolongeant son bail jusqu'à la fin"""
+        stop = threading.Event()
+        # Assez fréquent pour prolonger le bail et rester visible du coordinateur
+        interval = min(self.queue.lease_seconds, self.settings['worker_timeout_seconds'] or self.queue.lease_seconds) / 3
+
+        def heartbeat():
+            while not stop.wait(interval):
+                if not self.queue.extend_lease(job):
+                    return
+
+        thread = threading.Thread(target=heartbeat, name='botalerte-lease', daemon=True)
+        thread.start()
+        try:
+            result = self.process(job)
+        except Exception as e:
+            stop.set()
+            self.logger.error(f"❌ Travail {job.id} en échec (tentative {job.attempt}): {e}")
+            self.queue.fail(job, str(e))
+            return
+        finally:
+            stop.set()
+            thread.join()
+        if self.queue.complete(job, result):
+            self.jobs_done += 1
+        else:
+            self.logger.warning(f"⚠️ Bail du travail {job.id} perdu, résultat ignoré")
+
+    def run(self, exit_when_idle: bool = False):
+        """Boucle du worker"""
+        self.logger.info(f"👷 Worker {self.worker_id} à l'écoute de {self.settings['path']}")
+        self.monitor.install_signal_handlers()
+        stop_event = self.monitor.stop_event
+        try:
+            # Un signal laisse le travail en cours se terminer avant l'arrêt
+            while not stop_event.is_set():
+                job = self.queue.lease(self.worker_id)
+                if job is None:
+                    if exit_when_idle:
+                        break
+                    stop_event.wait(self.settings['poll_seconds'])
+                    continue
+                self.run_job(job)
+        except KeyboardInterrupt:
+            self.logger.info(f"🛑 Arrêt du worker {self.worker_id}")
+        finally:
+            self.monitor.shutdown()
+            self.queue.close()
+        self.logger.info(f"👷 Worker {self.worker_id}: {self.jobs_done} travail(aux) traité(s)")
+
+def run_worker(config_file: str, exit_when_idle: bool = False):
+    """Point d'entrée d'un processus worker"""
+    QueueWorker(config_file).run(exit_when_idle)
+
+def main():
+    parser = argparse.ArgumentParser(description="Workers de la file de travaux partagée")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    worker_parser = subparsers.add_parser('worker', help="Lance un ou plusieurs workers")
+    worker_parser.add_argument('config_file', help="Fichier de configuration JSON")
+    worker_parser.add_argument('--processes', type=int, default=1, help="Nombre de processus workers")
+    worker_parser.add_argument('--exit-when-idle', action='store_true', help="S'arrête quand la file est vide")
+
+    status_parser = subparsers.add_parser('status', help="Affiche l'état de la file")
+    status_parser.add_argument('config_file', help="Fichier de configuration JSON")
+    args = parser.parse_args()
+
+    if args.command == 'status':
+        from config_generator import load_config_file
+        config, _, _ = load_config_file(args.config_file)
+        settings = get_queue_settings(config)
+        counts = WorkQueue.from_settings(settings).counts()
+        print(f"📋 {settings['path']}: " + (', '.join(f"{status}: {count}" for status, count in sorted(counts.items())) or "vide"))
+        return
+
+    if args.processes <= 1:
+        run_worker(args.config_file, args.exit_when_idle)
+        return
+
+    import multiprocessing
+    processes = [
+        multiprocessing.Process(target=run_worker, args=(args.config_file, args.exit_when_idle), name=f'botalerte-worker-{index}')
+        for index in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    # SIGTERM reçu par le parent : transmis aux workers, qui terminent leur travail en cours
+    import signal
+    signal.signal(signal.SIGTERM, lambda signum, frame: [process.terminate() for process in processes])
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.join()
+
+if __name__ == "__main__":
+    main()